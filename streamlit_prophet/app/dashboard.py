@@ -16,6 +16,7 @@ from streamlit_prophet.lib.dataprep.clean import clean_df
 from streamlit_prophet.lib.dataprep.format import (
     add_cap_and_floor_cols,
     check_dataset_size,
+    check_future_regressors_df,
     filter_and_aggregate_df,
     format_date_and_target,
     format_datetime,
@@ -26,11 +27,17 @@ from streamlit_prophet.lib.dataprep.format import (
 )
 from streamlit_prophet.lib.dataprep.split import get_train_set, get_train_val_sets
 from streamlit_prophet.lib.exposition.export import display_save_experiment_button
+from streamlit_prophet.lib.exposition.panels import display_panel
+from streamlit_prophet.lib.exposition.progress import display_job_progress
 from streamlit_prophet.lib.exposition.visualize import (
+    display_preview_accuracy,
+    display_tuning_leaderboard,
     plot_components,
     plot_future,
     plot_overview,
     plot_performance,
+    plot_preview,
+    plot_scenarios,
 )
 from streamlit_prophet.lib.inputs.dataprep import input_cleaning, input_dimensions, input_resampling
 from streamlit_prophet.lib.inputs.dataset import (
@@ -50,10 +57,17 @@ from streamlit_prophet.lib.inputs.params import (
     input_other_params,
     input_prior_scale_params,
     input_regressors,
+    input_scenarios,
     input_seasonality_params,
 )
-from streamlit_prophet.lib.models.prophet import forecast_workflow
+from streamlit_prophet.lib.models.preview import get_preview_forecast
+from streamlit_prophet.lib.models.prophet import submit_forecast_workflow
+from streamlit_prophet.lib.models.tuning import TUNING_CACHE, get_tuning_key, tune_params
+from streamlit_prophet.lib.utils.executors import start_executor
+from streamlit_prophet.lib.utils.jobs import cancel_job
 from streamlit_prophet.lib.utils.load import load_config
+from streamlit_prophet.lib.utils.logging import capture_fit_logs
+from streamlit_prophet.lib.utils.scheduler import admit_fit, get_queue_message, get_session_id
 
 # Page config
 st.set_page_config(page_title="Prophet", layout="wide")
@@ -63,6 +77,9 @@ config, instructions, readme = load_config(
     "config_streamlit.toml", "config_instructions.toml", "config_readme.toml"
 )
 
+# Start cross-validation workers in the background, while the user sets up the forecast
+start_executor(config)
+
 # Initialization
 dates: Dict[Any, Any] = dict()
 report: List[Dict[str, Any]] = []
@@ -149,6 +166,9 @@ if evaluate:
         if use_cv:
             dates = input_cv(dates, resampling, config, readme)
             datasets = get_train_set(df, dates, datasets)
+            tune = st.checkbox(
+                "Tune hyperparameters", value=False, help=readme["tooltips"]["tuning"]
+            )
         else:
             dates = input_val_dates(df, dates, config)
             datasets = get_train_val_sets(df, dates, config, datasets)
@@ -164,12 +184,16 @@ if evaluate:
 else:
     use_cv = False
 
+if not use_cv:
+    tune = False
+
 st.sidebar.title("4. Forecast")
 
 # Choose whether or not to do future forecasts
 make_future_forecast = st.sidebar.checkbox(
     "Make forecast on future dates", value=False, help=readme["tooltips"]["choice_forecast"]
 )
+scenarios: Dict[str, List[Dict[str, Any]]] = dict()
 if make_future_forecast:
     with st.sidebar.expander("Horizon", expanded=False):
         dates = input_forecast_dates(df, dates, resampling, config, readme)
@@ -177,8 +201,16 @@ if make_future_forecast:
         datasets = input_future_regressors(
             datasets, dates, params, dimensions, load_options, date_col
         )
+    if len(params["regressors"]) > 0:
+        with st.sidebar.expander("Scenarios", expanded=False):
+            scenarios = input_scenarios(params, readme)
 
 # Launch training & forecast
+show_preview = st.checkbox(
+    "Show a fast preview while training",
+    value=False,
+    help=readme["tooltips"]["preview"],
+)
 if st.checkbox(
     "Launch forecast",
     value=False,
@@ -190,7 +222,30 @@ if st.checkbox(
 
     track_experiments = True
 
-    datasets, models, forecasts = forecast_workflow(
+    if tune:
+        # Searches are cached, so that reruns while the forecast job runs do not search again
+        tuning_key = get_tuning_key(params, dates, datasets, resampling, config)
+        tuning_result = TUNING_CACHE.get(tuning_key)
+        if tuning_result is None:
+            queue_placeholder = st.empty()
+
+            def display_queue_position(position: int) -> None:
+                queue_placeholder.info(get_queue_message(position))
+
+            with admit_fit(config, get_session_id(), True, on_wait=display_queue_position):
+                queue_placeholder.empty()
+                with st.spinner("Searching the best hyperparameters on cross-validation folds..."):
+                    with capture_fit_logs("tuning"):
+                        tuning_result = tune_params(params, dates, datasets, resampling, config)
+            TUNING_CACHE.put(tuning_key, tuning_result)
+        params, leaderboard = tuning_result
+
+    if make_future_forecast:
+        # Future regressors are checked here, where errors can be displayed and stop the app
+        check_future_regressors_df(datasets, dates, params, resampling, date_col, dimensions)
+
+    # Models are fitted in a background job, which keeps running if the page is closed
+    job = submit_forecast_workflow(
         config,
         use_cv,
         make_future_forecast,
@@ -205,52 +260,145 @@ if st.checkbox(
         target_col,
         dimensions,
         load_options,
+        get_session_id(),
     )
+    previous_job_id = st.session_state.get("forecast_job_id")
+    if previous_job_id is not None and previous_job_id != job.id:
+        cancel_job(previous_job_id)
+    st.session_state["forecast_job_id"] = job.id
+    job_done = job.done()
+
+    if show_preview:
+        preview_model, preview_forecast = get_preview_forecast(
+            params,
+            dates,
+            datasets,
+            df,
+            evaluate,
+            cleaning,
+            config,
+            resampling,
+            date_col,
+            target_col,
+            dimensions,
+            load_options,
+        )
+        if not job_done:
+            plot_preview(preview_model, preview_forecast, target_col, cleaning, config)
+
+    # Progress is polled until new results are available, the app is then rerun to display them
+    if not job_done:
+        display_job_progress(job, config)
+    results = job.get_latest_result()
+    if results is None:
+        st.stop()
+    datasets, models, forecasts = results
+
+    if show_preview and job_done:
+        report = display_preview_accuracy(preview_forecast, datasets, forecasts, report)
+
+    if tune:
+        report = display_tuning_leaderboard(leaderboard, report)
 
     # Visualizations
+    # Each result panel is a fragment: its widgets only rerun this panel, with the results above
+    # Evaluation panels are displayed as soon as evaluation is done, others with the future model
+    panels: Dict[str, List[Dict[str, Any]]] = dict()
+    main_model = "future" if make_future_forecast else "eval"
 
-    if evaluate | make_future_forecast:
+    if (evaluate | make_future_forecast) and main_model in models:
         st.write("# 1. Overview")
-        report = plot_overview(
-            make_future_forecast, use_cv, models, forecasts, target_col, cleaning, readme, report
+        display_panel(
+            panels,
+            "overview",
+            plot_overview,
+            make_future_forecast=make_future_forecast,
+            use_cv=use_cv,
+            models=models,
+            forecasts=forecasts,
+            target_col=target_col,
+            cleaning=cleaning,
+            config=config,
+            readme=readme,
         )
 
-    if evaluate:
+    if evaluate and "eval" in models:
         st.write(
             f'# 2. Evaluation on {"CV" if use_cv else ""} {eval["set"].lower()} set{"s" if use_cv else ""}'
         )
-        report = plot_performance(
-            use_cv, target_col, datasets, forecasts, dates, eval, resampling, config, readme, report
+        display_panel(
+            panels,
+            "performance",
+            plot_performance,
+            use_cv=use_cv,
+            target_col=target_col,
+            datasets=datasets,
+            forecasts=forecasts,
+            dates=dates,
+            eval=eval,
+            resampling=resampling,
+            config=config,
+            readme=readme,
         )
 
-    if evaluate | make_future_forecast:
+    if (evaluate | make_future_forecast) and main_model in models:
         st.write(
             "# 3. Impact of components and regressors"
             if evaluate
             else "# 2. Impact of components and regressors"
         )
-        report = plot_components(
-            use_cv,
-            make_future_forecast,
-            target_col,
-            models,
-            forecasts,
-            cleaning,
-            resampling,
-            config,
-            readme,
-            df,
-            report,
+        display_panel(
+            panels,
+            "components",
+            plot_components,
+            use_cv=use_cv,
+            make_future_forecast=make_future_forecast,
+            target_col=target_col,
+            models=models,
+            forecasts=forecasts,
+            cleaning=cleaning,
+            resampling=resampling,
+            config=config,
+            readme=readme,
+            df=df,
         )
 
-    if make_future_forecast:
+    if make_future_forecast and "future" in models:
         st.write("# 4. Future forecast" if evaluate else "# 3. Future forecast")
-        report = plot_future(models, forecasts, dates, target_col, cleaning, readme, report, df)
+        display_panel(
+            panels,
+            "future",
+            plot_future,
+            models=models,
+            forecasts=forecasts,
+            dates=dates,
+            target_col=target_col,
+            cleaning=cleaning,
+            config=config,
+            readme=readme,
+            df=df,
+        )
+        if len(scenarios) > 0:
+            st.write("# 5. What-if scenarios" if evaluate else "# 4. What-if scenarios")
+            display_panel(
+                panels,
+                "scenarios",
+                plot_scenarios,
+                models=models,
+                datasets=datasets,
+                scenarios=scenarios,
+                dates=dates,
+                target_col=target_col,
+                cleaning=cleaning,
+                config=config,
+                readme=readme,
+            )
 
     # Save experiment
-    if track_experiments:
+    if track_experiments and job_done:
         display_save_experiment_button(
             report,
+            panels,
             config,
             use_cv,
             make_future_forecast,
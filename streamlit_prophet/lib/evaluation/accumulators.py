@@ -0,0 +1,290 @@
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import math
+
+import numpy as np
+import pandas as pd
+from streamlit_prophet.lib.evaluation.metrics import MAE, MAPE, MSE, RMSE, SMAPE
+from streamlit_prophet.lib.evaluation.preparation import add_time_groupers
+
+# Order of the sufficient statistics stored for each (series, group) partition
+STATS = [
+    "sum_ape",  # Sum of absolute percentage errors
+    "n_ape",  # Number of values used for MAPE
+    "sum_sape",  # Sum of symmetric absolute percentage errors
+    "n_sape",  # Number of values used for SMAPE
+    "sum_se",  # Sum of squared errors
+    "sum_ae",  # Sum of absolute errors
+    "n_err",  # Number of values used for MSE, RMSE and MAE
+    "sum_truth",  # Sum of ground truth values
+    "sum_forecast",  # Sum of forecasts
+]
+DEFAULT_SERIES = "__all__"
+
+
+class MetricsAccumulator:
+    """Mergeable online accumulator of evaluation metrics, partitioned by series and granularity.
+
+    All metrics decompose into sums and counts, so evaluation dataframes can be fed chunk by chunk
+    with update() and accumulators built in different processes can be combined with merge().
+    Sums are kept exactly, as lists of non-overlapping floats, and are correctly rounded at the
+    end, so that final metrics are exactly the same whatever the chunks and the order in which
+    they are merged. They match the ones returned by _compute_metrics on the concatenated
+    evaluation dataframe up to floating point rounding.
+
+    Parameters
+    ----------
+    eval : Dict
+        Evaluation specifications (metrics, granularity, get_perf_on_agg_forecast).
+    """
+
+    def __init__(self, eval: Dict[Any, Any]):
+        self.eval = eval
+        self.partials: Dict[Tuple[Hashable, Any], List[List[float]]] = dict()
+
+    def update(self, df: pd.DataFrame, series: Hashable = DEFAULT_SERIES) -> "MetricsAccumulator":
+        """Adds a chunk of an evaluation dataframe to the accumulator.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Chunk of evaluation dataframe, with columns ds, truth and forecast.
+        series : Hashable
+            Identifier of the series the chunk belongs to.
+
+        Returns
+        -------
+        MetricsAccumulator
+            The updated accumulator.
+        """
+        granularity = self.eval["granularity"]
+        if granularity not in df.columns:
+            df = add_time_groupers(df)
+        if len(df) == 0:
+            return self
+        codes, groups = pd.factorize(df[granularity], sort=False)
+        order = np.argsort(codes, kind="stable")
+        stats = _compute_sufficient_stats(
+            df["truth"].to_numpy(dtype=float)[order], df["forecast"].to_numpy(dtype=float)[order]
+        )
+        starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) != 0])
+        for group, group_stats in zip(groups[codes[order][starts]], np.split(stats, starts[1:])):
+            self._add((series, group), [_get_partials(column) for column in group_stats.T.tolist()])
+        return self
+
+    def merge(self, other: "MetricsAccumulator") -> "MetricsAccumulator":
+        """Merges another accumulator, built on other chunks or in another process, into this one.
+
+        Parameters
+        ----------
+        other : MetricsAccumulator
+            Accumulator to merge.
+
+        Returns
+        -------
+        MetricsAccumulator
+            The merged accumulator.
+        """
+        if other.eval["granularity"] != self.eval["granularity"]:
+            raise ValueError("Accumulators with different granularities cannot be merged.")
+        for key, partials in other.partials.items():
+            self._add(key, partials)
+        return self
+
+    def get_series(self) -> List[Hashable]:
+        """Returns the list of series seen by the accumulator.
+
+        Returns
+        -------
+        list
+            Series identifiers.
+        """
+        return sorted({series for series, _ in self.partials.keys()}, key=str)
+
+    def get_metrics_df(self, series: Optional[Hashable] = None) -> pd.DataFrame:
+        """Computes all metrics for one series, at the same format as _compute_metrics.
+
+        Parameters
+        ----------
+        series : Hashable, optional
+            Identifier of the series, by default the only series seen by the accumulator.
+
+        Returns
+        -------
+        pd.DataFrame
+            Dataframe with all metrics at the desired granularity.
+        """
+        if series is None:
+            all_series = self.get_series()
+            series = all_series[0] if len(all_series) == 1 else DEFAULT_SERIES
+        granularity = self.eval["granularity"]
+        groups = sorted(group for s, group in self.partials.keys() if s == series)
+        totals = [[_sum_partials(p) for p in self.partials[(series, g)]] for g in groups]
+        stats = pd.DataFrame(np.array(totals).reshape(-1, len(STATS)), columns=STATS)
+        if self.eval["get_perf_on_agg_forecast"]:
+            metrics_df = pd.DataFrame(
+                {
+                    granularity: groups,
+                    "truth": stats["sum_truth"],
+                    "forecast": stats["sum_forecast"],
+                }
+            )
+            metrics = {"MAPE": MAPE, "SMAPE": SMAPE, "MSE": MSE, "RMSE": RMSE, "MAE": MAE}
+            for m in self.eval["metrics"]:
+                metrics_df[m] = metrics_df[["truth", "forecast"]].apply(
+                    lambda x: metrics[m](x.truth, x.forecast), axis=1
+                )
+        else:
+            metrics_df = pd.DataFrame({granularity: groups})
+            for m in self.eval["metrics"]:
+                metrics_df[m] = _metric_from_stats(m, stats)
+        return metrics_df
+
+    def get_all_metrics_df(self) -> pd.DataFrame:
+        """Computes all metrics for all series seen by the accumulator.
+
+        Returns
+        -------
+        pd.DataFrame
+            Dataframe with all metrics at the desired granularity, with an additional series column.
+        """
+        metrics_dfs = [
+            self.get_metrics_df(series).assign(series=series) for series in self.get_series()
+        ]
+        if len(metrics_dfs) == 0:
+            return pd.DataFrame(columns=["series", self.eval["granularity"]] + self.eval["metrics"])
+        metrics_df = pd.concat(metrics_dfs, ignore_index=True)
+        return metrics_df[["series"] + [col for col in metrics_df.columns if col != "series"]]
+
+    def _add(self, key: Tuple[Hashable, Any], partials: List[List[float]]) -> None:
+        """Adds exact sums of statistics to a partition.
+
+        Parameters
+        ----------
+        key : Tuple
+            (series, group) partition.
+        partials : List[List[float]]
+            Exact sum of each statistic, as non-overlapping floats.
+        """
+        if key not in self.partials:
+            self.partials[key] = [list(p) for p in partials]
+            return
+        self.partials[key] = [
+            _get_partials(current + added) for current, added in zip(self.partials[key], partials)
+        ]
+
+
+def _get_partials(values: List[float]) -> List[float]:
+    """Represents the exact sum of floats by a few non-overlapping floats, from the largest to the
+    smallest, so that partial sums can be added without any rounding error.
+
+    Parameters
+    ----------
+    values : List[float]
+        Values to sum.
+
+    Returns
+    -------
+    list
+        Floats whose exact sum is the exact sum of values, [nan] if infinite values cancel out.
+    """
+    partials: List[float] = []
+    while True:
+        try:
+            # Correctly rounded sum of what is not represented by partials yet
+            residual = math.fsum(values + [-p for p in partials])
+        except ValueError:
+            return [np.nan]
+        if residual == 0:
+            return partials
+        partials.append(residual)
+        if not math.isfinite(residual):
+            return partials
+
+
+def _sum_partials(partials: List[float]) -> float:
+    """Rounds an exact sum represented by partials, as math.fsum would round the summed values.
+
+    Parameters
+    ----------
+    partials : List[float]
+        Exact sum, as non-overlapping floats.
+
+    Returns
+    -------
+    float
+        Correctly rounded sum.
+    """
+    try:
+        return math.fsum(partials)
+    except ValueError:
+        return np.nan
+
+
+def _compute_sufficient_stats(y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+    """Computes, for each row, the terms of the sums and counts from which all metrics are derived.
+
+    Parameters
+    ----------
+    y_true : np.ndarray
+        Ground truth values.
+    y_pred : np.ndarray
+        Predictions.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n, len(STATS)), columns being in the order defined by STATS.
+    """
+    not_nan = (~np.isnan(y_true)) & (~np.isnan(y_pred))
+    mask_ape = not_nan & (y_true != 0)
+    denominator = np.abs(y_true) + np.abs(y_pred)
+    mask_sape = not_nan & (denominator != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ape = np.abs((y_true - y_pred) / y_true)
+        sape = 2.0 * np.abs(y_true - y_pred) / denominator
+    errors = np.where(not_nan, y_true - y_pred, 0)
+    return np.column_stack(
+        [
+            np.where(mask_ape, ape, 0),
+            mask_ape,
+            np.where(mask_sape, sape, 0),
+            mask_sape,
+            errors**2,
+            np.abs(errors),
+            not_nan,
+            np.nan_to_num(y_true, nan=0.0),
+            np.nan_to_num(y_pred, nan=0.0),
+        ]
+    ).astype(float)
+
+
+def _metric_from_stats(metric: str, stats: pd.DataFrame) -> List[float]:
+    """Derives a metric from accumulated statistics, 0 for groups without any valid value.
+
+    Parameters
+    ----------
+    metric : str
+        Name of the metric (MAPE, SMAPE, MSE, RMSE or MAE).
+    stats : pd.DataFrame
+        Accumulated statistics of each group, with columns defined by STATS.
+
+    Returns
+    -------
+    list
+        Metric value for each group.
+    """
+    mapping = {
+        "MAPE": ("sum_ape", "n_ape"),
+        "SMAPE": ("sum_sape", "n_sape"),
+        "MSE": ("sum_se", "n_err"),
+        "RMSE": ("sum_se", "n_err"),
+        "MAE": ("sum_ae", "n_err"),
+    }
+    total, count = stats[mapping[metric][0]].to_numpy(), stats[mapping[metric][1]].to_numpy()
+    values = np.divide(total, count, out=np.zeros(len(count)), where=count > 0)
+    # Metrics functions return 0 instead of NaN
+    values = np.where(np.isnan(values), 0, values)
+    if metric == "RMSE":
+        values = np.sqrt(values)
+    return [float(x) for x in values]
@@ -226,6 +226,241 @@ def _compute_metrics(df: pd.DataFrame, eval: Dict[Any, Any]) -> pd.DataFrame:
     return metrics_df
 
 
+def get_bootstrap_intervals(
+    evaluation_df: pd.DataFrame,
+    eval: Dict[Any, Any],
+    use_cv: bool,
+    config: Dict[Any, Any],
+) -> pd.DataFrame:
+    """Computes block bootstrap confidence intervals for all metrics at the desired granularity.
+
+    Parameters
+    ----------
+    evaluation_df : pd.DataFrame
+        Evaluation dataframe.
+    eval : Dict
+        Evaluation specifications.
+    use_cv : bool
+        Whether or note cross-validation is used.
+    config : Dict
+        Lib configuration dictionary containing bootstrap specifications and random seed.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataframe with lower and upper bounds of each metric at the desired granularity.
+    """
+    df = _preprocess_eval_df(evaluation_df, use_cv)
+    eval_bootstrap = {**eval, "granularity": "Fold"} if use_cv else eval
+    intervals_df = _compute_bootstrap_intervals(df, eval_bootstrap, config)
+    intervals_df = __format_metrics_values(
+        intervals_df.set_index(eval_bootstrap["granularity"]), eval_bootstrap, config
+    )
+    return intervals_df
+
+
+def _compute_bootstrap_intervals(
+    df: pd.DataFrame, eval: Dict[Any, Any], config: Dict[Any, Any]
+) -> pd.DataFrame:
+    """Computes bootstrap confidence intervals of all metrics and gather them in a dataframe.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Evaluation dataframe.
+    eval : Dict
+        Evaluation specifications.
+    config : Dict
+        Lib configuration dictionary containing bootstrap specifications and random seed.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataframe with lower and upper bounds of each metric at the desired granularity.
+    """
+    bootstrap = config["metrics"]["bootstrap"]
+    alpha = 1 - bootstrap["confidence_level"]
+    rng = np.random.default_rng(config["global"]["seed"])
+    rows = []
+    for group, group_df in df.groupby(eval["granularity"], sort=True):
+        y_true = group_df["truth"].to_numpy(dtype=float)
+        y_pred = group_df["forecast"].to_numpy(dtype=float)
+        idx = _draw_block_bootstrap_indices(
+            len(y_true), bootstrap["n_replicates"], bootstrap["block_size"], rng
+        )
+        y_true_boot, y_pred_boot = y_true[idx], y_pred[idx]
+        if eval["get_perf_on_agg_forecast"]:
+            y_true_boot = np.nansum(y_true_boot, axis=1, keepdims=True)
+            y_pred_boot = np.nansum(y_pred_boot, axis=1, keepdims=True)
+        row = {eval["granularity"]: group}
+        for m in eval["metrics"]:
+            values = BOOTSTRAP_METRICS[m](y_true_boot, y_pred_boot)
+            row[f"{m} lower"], row[f"{m} upper"] = np.quantile(values, [alpha / 2, 1 - alpha / 2])
+        rows.append(row)
+    bounds = [f"{m} {b}" for m in eval["metrics"] for b in ["lower", "upper"]]
+    columns = [eval["granularity"]] + bounds
+    return pd.DataFrame(rows, columns=columns)
+
+
+def _draw_block_bootstrap_indices(
+    n: int, n_replicates: int, block_size: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Draws moving block bootstrap indices for all replicates at once.
+
+    Parameters
+    ----------
+    n : int
+        Number of observations in the series to resample.
+    n_replicates : int
+        Number of bootstrap replicates.
+    block_size : int
+        Length of each resampled block, 0 to use n ** (1/3).
+    rng : np.random.Generator
+        Random generator used to draw blocks.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n_replicates, n) with resampled indices.
+    """
+    if n == 0:
+        return np.zeros((n_replicates, 0), dtype=int)
+    block_size = block_size if block_size > 0 else int(np.ceil(n ** (1 / 3)))
+    block_size = min(block_size, n)
+    n_blocks = int(np.ceil(n / block_size))
+    starts = rng.integers(0, n - block_size + 1, size=(n_replicates, n_blocks))
+    idx = starts[:, :, None] + np.arange(block_size)
+    return idx.reshape(n_replicates, -1)[:, :n]
+
+
+def _masked_mean(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Computes the mean of each row of a 2-D array over masked values, 0 if no value is selected.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Array of shape (n_replicates, n).
+    mask : np.ndarray
+        Boolean array of shape (n_replicates, n) selecting values to average.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (n_replicates,) with row means.
+    """
+    count = mask.sum(axis=1)
+    total = np.where(mask, values, 0).sum(axis=1)
+    means: np.ndarray = np.divide(total, count, out=np.zeros(len(count)), where=count > 0)
+    return means
+
+
+def _MAPE_replicates(y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+    """Computes Mean Absolute Percentage Error (MAPE) on each bootstrap replicate.
+
+    Parameters
+    ----------
+    y_true : np.ndarray
+        Ground truth values of shape (n_replicates, n).
+    y_pred : np.ndarray
+        Predictions of shape (n_replicates, n).
+
+    Returns
+    -------
+    np.ndarray
+        Mean Absolute Percentage Error (MAPE) of each replicate.
+    """
+    mask = (y_true != 0) & (~np.isnan(y_true)) & (~np.isnan(y_pred))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _masked_mean(np.abs((y_true - y_pred) / y_true), mask)
+
+
+def _SMAPE_replicates(y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+    """Computes Symmetric Mean Absolute Percentage Error (SMAPE) on each bootstrap replicate.
+
+    Parameters
+    ----------
+    y_true : np.ndarray
+        Ground truth values of shape (n_replicates, n).
+    y_pred : np.ndarray
+        Predictions of shape (n_replicates, n).
+
+    Returns
+    -------
+    np.ndarray
+        Symmetric Mean Absolute Percentage Error (SMAPE) of each replicate.
+    """
+    denominator = np.abs(y_true) + np.abs(y_pred)
+    mask = (denominator != 0) & (~np.isnan(y_true)) & (~np.isnan(y_pred))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _masked_mean(2.0 * np.abs(y_true - y_pred) / denominator, mask)
+
+
+def _MSE_replicates(y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+    """Computes Mean Squared Error (MSE) on each bootstrap replicate.
+
+    Parameters
+    ----------
+    y_true : np.ndarray
+        Ground truth values of shape (n_replicates, n).
+    y_pred : np.ndarray
+        Predictions of shape (n_replicates, n).
+
+    Returns
+    -------
+    np.ndarray
+        Mean Squared Error (MSE) of each replicate.
+    """
+    mask = (~np.isnan(y_true)) & (~np.isnan(y_pred))
+    return _masked_mean((y_true - y_pred) ** 2, mask)
+
+
+def _RMSE_replicates(y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+    """Computes Root Mean Squared Error (RMSE) on each bootstrap replicate.
+
+    Parameters
+    ----------
+    y_true : np.ndarray
+        Ground truth values of shape (n_replicates, n).
+    y_pred : np.ndarray
+        Predictions of shape (n_replicates, n).
+
+    Returns
+    -------
+    np.ndarray
+        Root Mean Squared Error (RMSE) of each replicate.
+    """
+    rmse: np.ndarray = np.sqrt(_MSE_replicates(y_true, y_pred))
+    return rmse
+
+
+def _MAE_replicates(y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+    """Computes Mean Absolute Error (MAE) on each bootstrap replicate.
+
+    Parameters
+    ----------
+    y_true : np.ndarray
+        Ground truth values of shape (n_replicates, n).
+    y_pred : np.ndarray
+        Predictions of shape (n_replicates, n).
+
+    Returns
+    -------
+    np.ndarray
+        Mean Absolute Error (MAE) of each replicate.
+    """
+    mask = (~np.isnan(y_true)) & (~np.isnan(y_pred))
+    return _masked_mean(np.abs(y_true - y_pred), mask)
+
+
+BOOTSTRAP_METRICS = {
+    "MAPE": _MAPE_replicates,
+    "SMAPE": _SMAPE_replicates,
+    "MSE": _MSE_replicates,
+    "RMSE": _RMSE_replicates,
+    "MAE": _MAE_replicates,
+}
+
+
 def _format_eval_results(
     metrics_df: pd.DataFrame,
     dates: Dict[Any, Any],
@@ -292,10 +527,12 @@ def __format_metrics_values(
     """
     mapping_format = {k: "{:,." + str(v) + "f}" for k, v in config["metrics"]["digits"].items()}
     mapping_round = config["metrics"]["digits"].copy()
-    for col in eval["metrics"]:
-        metrics_df[col] = metrics_df[col].map(
-            lambda x: mapping_format[col].format(round(x, mapping_round[col]))
-        )
+    for col in metrics_df.columns:
+        metric = col.split(" ")[0]
+        if metric in eval["metrics"]:
+            metrics_df[col] = metrics_df[col].map(
+                lambda x: mapping_format[metric].format(round(x, mapping_round[metric]))
+            )
     return metrics_df
 
 
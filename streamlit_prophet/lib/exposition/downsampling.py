@@ -0,0 +1,279 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Trace attributes holding one value per point, sliced along with x and y
+POINT_ATTRIBUTES = ["x", "y", "customdata", "text", "hovertext", "ids"]
+MARKER_POINT_ATTRIBUTES = ["color", "size", "symbol", "opacity"]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Selects points of a series with the Largest-Triangle-Three-Buckets algorithm,
+    which keeps the visual shape of the series, peaks included.
+
+    The first and last points are always kept. Other points are split into n_out - 2 buckets,
+    and the point of each bucket forming the largest triangle with the point kept in the
+    previous bucket and the average of the next bucket is kept.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Sorted abscissas, as floats.
+    y : np.ndarray
+        Ordinates, missing values being never selected unless a bucket only has missing values.
+    n_out : int
+        Number of points to keep.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted positions of kept points.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    y_filled = np.where(np.isnan(y), np.nanmean(y) if np.isfinite(y).any() else 0.0, y)
+    bucket_x = np.add.reduceat(x[1:-1], edges[:-1] - 1) / np.diff(edges)
+    bucket_y = np.add.reduceat(y_filled[1:-1], edges[:-1] - 1) / np.diff(edges)
+    # The last bucket is followed by the last point
+    next_x = np.append(bucket_x[1:], x[-1])
+    next_y = np.append(bucket_y[1:], y_filled[-1])
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        areas = np.abs(
+            (x[previous] - next_x[i]) * (y[start:end] - y_filled[previous])
+            - (x[previous] - x[start:end]) * (next_y[i] - y_filled[previous])
+        )
+        areas = np.where(np.isnan(areas), -1.0, areas)
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+def downsample_figure(
+    fig: go.Figure,
+    max_points: int,
+    webgl_threshold: int,
+    x_range: Optional[Tuple[Any, Any]] = None,
+) -> go.Figure:
+    """Returns a copy of a figure whose long traces are downsampled for display.
+
+    Parameters
+    ----------
+    fig : go.Figure
+        Plotly go figure, left unchanged.
+    max_points : int
+        Maximum number of points kept per trace, 0 to keep all points.
+    webgl_threshold : int
+        Line and marker traces are drawn with WebGL if one of them keeps more points than this.
+    x_range : Tuple, optional
+        Dates to zoom on. Traces with dates are cropped to this range before being downsampled,
+        so that short ranges are displayed at full resolution.
+
+    Returns
+    -------
+    go.Figure
+        Figure to display.
+    """
+    traces = []
+    zoomed_axes = set()
+    for trace in fig.data:
+        trace_dict = trace.to_plotly_json()
+        if trace_dict.get("type") in ["scatter", "scattergl"]:
+            stamps = _get_date_stamps(trace_dict.get("x"))
+            positions = np.arange(len(trace_dict.get("x", [])))
+            if stamps is not None and x_range is not None:
+                start, end = (pd.Timestamp(date).value for date in x_range)
+                positions = positions[(stamps >= start) & (stamps <= end)]
+                zoomed_axes.add(trace_dict.get("xaxis", "x"))
+            if max_points > 0 and len(positions) > max_points:
+                abscissas = _get_abscissas(trace_dict.get("x"), stamps)
+                if abscissas is not None:
+                    ordinates = np.asarray(trace_dict["y"], dtype=float)[positions]
+                    positions = positions[lttb_indices(abscissas[positions], ordinates, max_points)]
+            if len(positions) < len(trace_dict.get("x", [])):
+                trace_dict = _select_points(trace_dict, positions)
+        traces.append(trace_dict)
+    n_points = [len(t.get("x", [])) for t in traces if t.get("type") in ["scatter", "scattergl"]]
+    if max(n_points, default=0) > webgl_threshold:
+        traces = _to_webgl(traces)
+    display_fig = go.Figure(data=traces, layout=fig.layout)
+    for axis in zoomed_axes:
+        display_fig.layout[axis.replace("x", "xaxis", 1)].update(range=list(x_range or []))
+    return display_fig
+
+
+def get_date_bounds(fig: go.Figure) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Returns the first and last dates of line and marker traces with dates.
+
+    Parameters
+    ----------
+    fig : go.Figure
+        Plotly go figure.
+
+    Returns
+    -------
+    Tuple[pd.Timestamp, pd.Timestamp], optional
+        First and last dates, None if no trace has dates.
+    """
+    bounds: List[int] = []
+    for trace in fig.data:
+        if trace.type in ["scatter", "scattergl"]:
+            stamps = _get_date_stamps(trace.x)
+            if stamps is not None and len(stamps) > 0:
+                bounds += [stamps.min(), stamps.max()]
+    if len(bounds) == 0:
+        return None
+    return pd.Timestamp(min(bounds)), pd.Timestamp(max(bounds))
+
+
+def get_max_trace_length(fig: go.Figure) -> int:
+    """Returns the number of points of the longest line or marker trace of a figure.
+
+    Parameters
+    ----------
+    fig : go.Figure
+        Plotly go figure.
+
+    Returns
+    -------
+    int
+        Number of points.
+    """
+    lengths = [
+        len(trace.x)
+        for trace in fig.data
+        if trace.type in ["scatter", "scattergl"] and trace.x is not None
+    ]
+    return max(lengths, default=0)
+
+
+def _get_date_stamps(x: Any) -> Optional[np.ndarray]:
+    """Converts abscissas to nanoseconds since epoch if they are dates.
+
+    Parameters
+    ----------
+    x : Any
+        Abscissas of a trace.
+
+    Returns
+    -------
+    np.ndarray, optional
+        Nanoseconds since epoch, None if abscissas are not dates.
+    """
+    if x is None or len(x) == 0:
+        return None
+    values = np.asarray(x)
+    if values.dtype.kind != "M" and not isinstance(values[0], (datetime.date, np.datetime64)):
+        return None
+    stamps: np.ndarray = pd.DatetimeIndex(values).as_unit("ns").asi8
+    return stamps
+
+
+def _get_abscissas(x: Any, stamps: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """Returns sorted abscissas as floats, for dates or numbers.
+
+    Parameters
+    ----------
+    x : Any
+        Abscissas of a trace.
+    stamps : np.ndarray, optional
+        Abscissas as nanoseconds since epoch, if they are dates.
+
+    Returns
+    -------
+    np.ndarray, optional
+        Abscissas as floats, None if they are not numbers or dates, or are not sorted.
+    """
+    if stamps is not None:
+        abscissas = stamps.astype(float)
+    else:
+        values = np.asarray(x)
+        if values.dtype.kind not in "iuf":
+            return None
+        abscissas = values.astype(float)
+    if not np.all(np.diff(abscissas) >= 0):
+        return None
+    return abscissas
+
+
+def _select_points(trace: Dict[str, Any], positions: np.ndarray) -> Dict[str, Any]:
+    """Keeps only some points of a trace, in all its attributes holding one value per point.
+
+    Parameters
+    ----------
+    trace : Dict
+        Trace, as a dictionary.
+    positions : np.ndarray
+        Positions of kept points.
+
+    Returns
+    -------
+    dict
+        Trace with kept points only.
+    """
+    n = len(trace["x"])
+    trace = dict(trace)
+    for attribute in POINT_ATTRIBUTES:
+        if _is_point_array(trace.get(attribute), n):
+            trace[attribute] = np.asarray(trace[attribute])[positions]
+    if isinstance(trace.get("marker"), dict):
+        trace["marker"] = dict(trace["marker"])
+        for attribute in MARKER_POINT_ATTRIBUTES:
+            if _is_point_array(trace["marker"].get(attribute), n):
+                trace["marker"][attribute] = np.asarray(trace["marker"][attribute])[positions]
+    return trace
+
+
+def _is_point_array(value: Any, n: int) -> bool:
+    """Tells whether an attribute holds one value per point.
+
+    Parameters
+    ----------
+    value : Any
+        Attribute of a trace.
+    n : int
+        Number of points of the trace.
+
+    Returns
+    -------
+    bool
+        True if the attribute is an array with one value per point.
+    """
+    return isinstance(value, (list, tuple, np.ndarray)) and len(value) == n
+
+
+def _to_webgl(traces: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Draws line and marker traces with WebGL, if all of them support it.
+
+    Traces filling the area to the next trace must share their type, so either
+    all traces are converted or none of them is.
+
+    Parameters
+    ----------
+    traces : List[Dict]
+        Traces, as dictionaries.
+
+    Returns
+    -------
+    list
+        Traces drawn with WebGL, or unchanged traces.
+    """
+    webgl_traces = []
+    for trace in traces:
+        if trace.get("type") != "scatter":
+            webgl_traces.append(trace)
+            continue
+        try:
+            webgl_traces.append(go.Scattergl({k: v for k, v in trace.items() if k != "type"}))
+        except ValueError:
+            return traces
+    return webgl_traces
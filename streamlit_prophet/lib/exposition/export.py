@@ -1,117 +1,141 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence
 
-import base64
+import functools
+import hashlib
 import io
-import re
-import uuid
-from base64 import b64encode
 from datetime import datetime
-from pathlib import Path
-from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED, ZipFile
 
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 import toml
-from streamlit_prophet.lib.utils.load import get_project_root
-
-
-def get_dataframe_download_link(df: pd.DataFrame, filename: str, linkname: str) -> str:
-    """Creates a link to download a dataframe as a csv file.
+from streamlit_prophet.lib.exposition.figures import get_derived_figure_data
+from streamlit_prophet.lib.exposition.panels import get_panels_report
+from streamlit_prophet.lib.exposition.serialization import (
+    PLOTLY_JS_FILENAME,
+    CompactFigure,
+    get_compact_figure,
+    get_figures_html,
+    get_plotly_js,
+)
+from streamlit_prophet.lib.utils.cache import LRUCache, hash_dataframe
+
+# Zip files of recently built reports, shared by all sessions
+REPORTS_CACHE = LRUCache(maxsize=4)
+
+# Download formats of dataframes: file extension and mime type
+DATAFRAME_FORMATS = {
+    "csv": ("csv", "text/csv"),
+    "compressed csv": ("csv.gz", "application/gzip"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def get_dataframe_download_data(df: pd.DataFrame, file_format: str = "csv") -> bytes:
+    """Converts a dataframe into the content of a file to download.
 
     Parameters
     ----------
     df : pd.DataFrame
         Dataframe to export.
-    filename : str
-        Name of the exported file.
-    linkname : str
-        Text displayed in the streamlit app.
+    file_format : str
+        Format of the file, among "csv", "compressed csv" and "parquet".
 
     Returns
     -------
-    str
-        Download link.
+    bytes
+        Content of the file.
     """
-    csv = df.to_csv()
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}.csv">{linkname}</a>'
-    return href
+    if file_format not in DATAFRAME_FORMATS:
+        raise ValueError(
+            f"Unknown file format '{file_format}', it should be one of {list(DATAFRAME_FORMATS)}."
+        )
+    buffer = io.BytesIO()
+    if file_format == "parquet":
+        df.to_parquet(buffer)
+    elif file_format == "compressed csv":
+        df.to_csv(buffer, compression={"method": "gzip", "mtime": 0})
+    else:
+        buffer.write(df.to_csv().encode())
+    return buffer.getvalue()
 
 
-def get_config_download_link(config: Dict[Any, Any], filename: str, linkname: str) -> str:
-    """Creates a link to download the config as a toml file. Removes keys that should not be customized.
+def get_config_download_data(config: Dict[Any, Any]) -> bytes:
+    """Converts the config into the content of a toml file. Removes keys that should not be customized.
 
     Parameters
     ----------
     config : Dict
         Config file to export as toml.
-    filename : str
-        Name of the exported file.
-    linkname : str
-        Text displayed in the streamlit app.
 
     Returns
     -------
-    str
-        Download link.
+    bytes
+        Content of the toml file.
     """
     config_template = config.copy()
     if "datasets" in config_template.keys():
         del config_template["datasets"]
-    toml_string = toml.dumps(config)
-    b64 = base64.b64encode(toml_string.encode()).decode()
-    href = f'<a href="data:file/toml;base64,{b64}" download="{filename}">{linkname}</a>'
-    return href
+    config_toml: str = toml.dumps(config_template)
+    return config_toml.encode()
 
 
-def get_plotly_download_link(fig: go.Figure, filename: str, linkname: str) -> str:
-    """Creates a link to download a dataframe as a html file.
+def get_plotly_download_data(fig: go.Figure) -> bytes:
+    """Converts a plotly figure into the content of a self-contained html file.
 
     Parameters
     ----------
     fig : go.Figure
         Plotly go figure to export.
-    filename : str
-        Name of the exported file.
-    linkname : str
-        Text displayed in the streamlit app.
 
     Returns
     -------
-    str
-        Download link.
+    bytes
+        Content of the html file.
     """
-    buffer = io.StringIO()
-    fig.write_html(buffer)
-    html_bytes = buffer.getvalue().encode()
-    encoded = b64encode(html_bytes).decode()
-    href = f'<a href="data:text/html;base64,{encoded}" download="{filename}.html">{linkname}</a>'
-    return href
+    return get_figures_html([get_compact_figure("", fig)]).encode()
 
 
-def display_dataframe_download_link(
-    df: pd.DataFrame, filename: str, linkname: str, add_blank: bool = False
+def display_dataframe_download_button(
+    df: pd.DataFrame,
+    filename: str,
+    linkname: str,
+    add_blank: bool = False,
+    file_formats: Sequence[str] = ("csv",),
 ) -> None:
-    """Displays a link to download a dataframe as a csv file.
+    """Displays a button to download a dataframe, the file being generated only when it is clicked.
 
     Parameters
     ----------
     df : pd.DataFrame
         Dataframe to export.
     filename : str
-        Name of the exported file.
+        Name of the exported file, without extension.
     linkname : str
         Text displayed in the streamlit app.
     add_blank : str
-        Whether or not to add a blank before the link in streamlit app.
+        Whether or not to add a blank before the button in streamlit app.
+    file_formats : Sequence[str]
+        Formats the user can choose from, among "csv", "compressed csv" and "parquet".
     """
     if add_blank:
         st.write("")
-    st.markdown(get_dataframe_download_link(df, filename, linkname), unsafe_allow_html=True)
+    if len(file_formats) > 1:
+        file_format = st.selectbox("File format", file_formats, key=f"{filename}_file_format")
+    else:
+        file_format = file_formats[0]
+    extension, mime = DATAFRAME_FORMATS[file_format]
+    st.download_button(
+        linkname,
+        data=functools.partial(get_dataframe_download_data, df, file_format),
+        file_name=f"{filename}.{extension}",
+        mime=mime,
+        on_click="ignore",
+    )
 
 
-def display_2_dataframe_download_links(
+def display_2_dataframe_download_buttons(
     df1: pd.DataFrame,
     filename1: str,
     linkname1: str,
@@ -120,7 +144,7 @@ def display_2_dataframe_download_links(
     linkname2: str,
     add_blank: bool = False,
 ) -> None:
-    """Displays a link to download a dataframe as a csv file.
+    """Displays two buttons to download dataframes as csv files.
 
     Parameters
     ----------
@@ -129,30 +153,26 @@ def display_2_dataframe_download_links(
     filename1 : str
         Name of the first exported file.
     linkname1 : str
-        Text displayed in the streamlit app for the first link.
+        Text displayed in the streamlit app for the first button.
     df2 : pd.DataFrame
         Second dataframe to export.
     filename2 : str
         Name of the second exported file.
     linkname2 : str
-        Text displayed in the streamlit app for the second link.
+        Text displayed in the streamlit app for the second button.
     add_blank : str
-        Whether or not to add a blank before the link in streamlit app.
+        Whether or not to add a blank before the buttons in streamlit app.
     """
     if add_blank:
         st.write("")
     col1, col2 = st.columns(2)
-    col1.markdown(
-        f"<p style='text-align: center;;'> {get_dataframe_download_link(df1, filename1, linkname1)}</p>",
-        unsafe_allow_html=True,
-    )
-    col2.markdown(
-        f"<p style='text-align: center;;'> {get_dataframe_download_link(df2, filename2, linkname2)}</p>",
-        unsafe_allow_html=True,
-    )
+    with col1:
+        display_dataframe_download_button(df1, filename1, linkname1)
+    with col2:
+        display_dataframe_download_button(df2, filename2, linkname2)
 
 
-def display_config_download_links(
+def display_config_download_buttons(
     config1: Dict[Any, Any],
     filename1: str,
     linkname1: str,
@@ -160,7 +180,7 @@ def display_config_download_links(
     filename2: str,
     linkname2: str,
 ) -> None:
-    """Displays a link to download a dataframe as a csv file.
+    """Displays two buttons to download config files as toml files.
 
     Parameters
     ----------
@@ -169,44 +189,54 @@ def display_config_download_links(
     filename1 : str
         Name of the first exported file.
     linkname1 : str
-        Text displayed in the streamlit app for the first link.
+        Text displayed in the streamlit app for the first button.
     config2 : Dict
         Second config file to export as toml.
     filename2 : str
         Name of the second exported file.
     linkname2 : str
-        Text displayed in the streamlit app for the second link.
+        Text displayed in the streamlit app for the second button.
     """
     col1, col2 = st.columns(2)
-    col1.markdown(
-        f"<p style='text-align: center;;'> {get_config_download_link(config1, filename1, linkname1)}</p>",
-        unsafe_allow_html=True,
-    )
-    col2.markdown(
-        f"<p style='text-align: center;;'> {get_config_download_link(config2, filename2, linkname2)}</p>",
-        unsafe_allow_html=True,
-    )
+    for col, config, filename, linkname in [
+        (col1, config1, filename1, linkname1),
+        (col2, config2, filename2, linkname2),
+    ]:
+        col.download_button(
+            linkname,
+            data=functools.partial(get_config_download_data, config),
+            file_name=filename,
+            mime="application/toml",
+            on_click="ignore",
+            width="stretch",
+        )
 
 
-def display_plotly_download_link(
+def display_plotly_download_button(
     fig: go.Figure, filename: str, linkname: str, add_blank: bool = False
 ) -> None:
-    """Displays a link to export a plotly graph in html.
+    """Displays a button to export a plotly graph in html, the file being generated only when it is clicked.
 
     Parameters
     ----------
     fig : go.Figure
         Plotly go figure to export.
     filename : str
-        Name of the exported file.
+        Name of the exported file, without extension.
     linkname : str
         Text displayed in the streamlit app.
     add_blank : str
-        Whether or not to add a blank before the link in streamlit app.
+        Whether or not to add a blank before the button in streamlit app.
     """
     if add_blank:
         st.write("")
-    st.markdown(get_plotly_download_link(fig, filename, linkname), unsafe_allow_html=True)
+    st.download_button(
+        linkname,
+        data=functools.partial(get_plotly_download_data, fig),
+        file_name=f"{filename}.html",
+        mime="text/html",
+        on_click="ignore",
+    )
 
 
 def create_report_zip_file(
@@ -222,8 +252,9 @@ def create_report_zip_file(
     date_col: str,
     target_col: str,
     dimensions: Dict[Any, Any],
-) -> str:
-    """Saves locally all report components in a zip file.
+) -> bytes:
+    """Builds in memory a zip file with all report components, or gets it from cache
+    if the same report was already built.
 
     Parameters
     ----------
@@ -254,34 +285,12 @@ def create_report_zip_file(
 
     Returns
     -------
-    str
-        Path of the zip file.
+    bytes
+        Content of the zip file.
     """
-    # Create zip file
-    zip_path = "experiment.zip"
-    zipObj = ZipFile(zip_path, "w")
-    report_name = f"report_{datetime.now().strftime('%Y%m%d_%Hh%Mm%Ss')}"
-    # Save plots and data
-    for x in report:
-        if x["type"] == "plot":
-            file_name = f"{report_name}/plots/{x['name']}.html"
-            file_path = _get_file_path(file_name)
-            x["object"].write_html(file_path)
-        if x["type"] == "dataset":
-            file_name = f"{report_name}/data/{x['name']}.csv"
-            file_path = _get_file_path(file_name)
-            x["object"].to_csv(file_path, index=False)
-        zipObj.write(file_path, arcname=file_name)
-    # Save default config
     default_config = config.copy()
     if "datasets" in default_config.keys():
         del default_config["datasets"]
-    file_name = f"{report_name}/config/default_config.toml"
-    file_path = _get_file_path(file_name)
-    with open(file_path, "w") as toml_file:
-        toml.dump(default_config, toml_file)
-    zipObj.write(file_path, arcname=file_name)
-    # Save user specifications
     all_specs = {
         "model_params": params,
         "dates": dates,
@@ -295,88 +304,108 @@ def create_report_zip_file(
             "make_future_forecast": make_future_forecast,
         },
     }
-    file_name = f"{report_name}/config/user_specifications.toml"
-    file_path = _get_file_path(file_name)
-    with open(file_path, "w") as toml_file:
-        toml.dump(all_specs, toml_file)
-    zipObj.write(file_path, arcname=file_name)
-    # Close zip file
-    zipObj.close()
-    return zip_path
-
-
-def _get_file_path(file_name: str) -> str:
-    """Returns the full path of a file to include in the zip file.
+    configs = {
+        "default_config": toml.dumps(default_config),
+        "user_specifications": toml.dumps(all_specs),
+    }
+    float_precision = config["report"]["float_precision"]
+    plots = [
+        get_derived_figure_data(
+            x["object"],
+            ("compact", x["name"], float_precision),
+            functools.partial(get_compact_figure, x["name"], float_precision=float_precision),
+        )
+        for x in report
+        if x["type"] == "plot"
+    ]
+    key = get_report_key(report, plots, configs)
+    zip_bytes: Optional[bytes] = REPORTS_CACHE.get(key)
+    if zip_bytes is None:
+        zip_bytes = _write_report_zip_file(report, plots, configs, config["report"]["layout"])
+        REPORTS_CACHE.put(key, zip_bytes)
+    return zip_bytes
+
+
+def get_report_key(
+    report: List[Dict[str, Any]], plots: List[CompactFigure], configs: Dict[str, str]
+) -> str:
+    """Computes a fingerprint of report components, to identify reports that were already built.
 
     Parameters
     ----------
-    file_name: str
-        Short file name.
+    report: List[Dict[str, Any]]
+        List of all report components.
+    plots : List[CompactFigure]
+        Serialized plots of the report.
+    configs : Dict
+        Content of each config file of the report, keyed by file name.
 
     Returns
     -------
     str
-        Full path.
+        Hexadecimal fingerprint.
     """
-    return str(Path(get_project_root()) / f"report/{'/'.join(file_name.split('/')[1:])}")
+    digest = hashlib.sha1(repr(sorted(configs.items())).encode())
+    for plot in plots:
+        digest.update(f"plot/{plot.title}/{plot.height}".encode())
+        digest.update(plot.json.encode())
+    for x in report:
+        if x["type"] == "dataset":
+            digest.update(f"dataset/{x['name']}".encode())
+            digest.update(hash_dataframe(x["object"]).encode())
+    return digest.hexdigest()
 
 
-def create_save_experiment_button(zip_path: str) -> None:
-    """Displays a link to export the report as a zip file.
+def _write_report_zip_file(
+    report: List[Dict[str, Any]], plots: List[CompactFigure], configs: Dict[str, str], layout: str
+) -> bytes:
+    """Writes all report components in an in-memory zip file, without any temporary file.
 
     Parameters
     ----------
-    zip_path: str
-        Path of the zip file.
-    """
-
-    button_uuid = str(uuid.uuid4()).replace("-", "")
-    button_id = re.sub(r"\d+", "", button_uuid)
-
-    with open(zip_path, "rb") as f:
-        bytes = f.read()
-        b64 = base64.b64encode(bytes).decode()
-        href = (
-            f"<a download='{zip_path}' id='{button_id}' href=\"data:file/zip;base64,{b64}\" >Save "
-            f"experiment</a><br></br> "
-        )
+    report: List[Dict[str, Any]]
+        List of all report components.
+    plots : List[CompactFigure]
+        Serialized plots of the report.
+    configs : Dict
+        Content of each config file of the report, keyed by file name.
+    layout : str
+        Either "separate", for one html file per plot, all sharing one plotly.js file,
+        or "single", for all plots in one self-contained html file.
 
-    color1 = "rgb(255, 0, 102)"
-    color2 = "rgb(0, 34, 68)"
-    color3 = "rgb(255, 255, 255)"
-    custom_css = f"""
-            <style>
-                #{button_id} {{
-                    background-color: {color1};
-                    color: {color3};
-                    padding: 0.45em 0.58em;
-                    position: relative;
-                    text-decoration: none;
-                    border-radius: 5px;
-                    border-width: 2px;
-                    border-style: solid;
-                    border-color: {color3};
-                    border-image: initial;
-                }}
-                #{button_id}:hover {{
-                    border-color: {color2};
-                    color: {color2};
-                }}
-                #{button_id}:active {{
-                    box-shadow: none;
-                    background-color: {color3};
-                    border-color: {color1};
-                    color: {color1};
-                    }}
-            </style> """
-
-    st.markdown(
-        f"<p style='text-align: center;;'> {custom_css + href} </p>", unsafe_allow_html=True
-    )
+    Returns
+    -------
+    bytes
+        Content of the zip file.
+    """
+    report_name = f"report_{datetime.now().strftime('%Y%m%d_%Hh%Mm%Ss')}"
+    buffer = io.BytesIO()
+    with ZipFile(buffer, "w", compression=ZIP_DEFLATED) as zip_file:
+        # Save plots
+        if layout == "single":
+            zip_file.writestr(f"{report_name}/report.html", get_figures_html(plots))
+        elif len(plots) > 0:
+            zip_file.writestr(f"{report_name}/plots/{PLOTLY_JS_FILENAME}", get_plotly_js())
+            for plot in plots:
+                zip_file.writestr(
+                    f"{report_name}/plots/{plot.title}.html",
+                    get_figures_html([plot._replace(title="")], PLOTLY_JS_FILENAME),
+                )
+        # Save data
+        for x in report:
+            if x["type"] == "dataset":
+                zip_file.writestr(
+                    f"{report_name}/data/{x['name']}.csv", x["object"].to_csv(index=False)
+                )
+        # Save default config and user specifications
+        for file_name, content in configs.items():
+            zip_file.writestr(f"{report_name}/config/{file_name}.toml", content)
+    return buffer.getvalue()
 
 
 def display_save_experiment_button(
     report: List[Dict[str, Any]],
+    panels: Dict[str, List[Dict[str, Any]]],
     config: Dict[Any, Any],
     use_cv: bool,
     make_future_forecast: bool,
@@ -389,12 +418,16 @@ def display_save_experiment_button(
     target_col: str,
     dimensions: Dict[Any, Any],
 ) -> None:
-    """Saves locally all report components in a zip file.
+    """Displays a button to download all report components in a zip file.
+    The zip file is only built when the button is clicked, with the latest components of each
+    result panel.
 
     Parameters
     ----------
     report: List[Dict[str, Any]]
-        List of all report components.
+        List of report components displayed outside result panels.
+    panels : Dict
+        Report components of each result panel.
     config : Dict
         Lib configuration dictionary.
     use_cv : bool
@@ -418,9 +451,10 @@ def display_save_experiment_button(
     dimensions : Dict
         Dictionary containing dimensions information.
     """
-    with st.spinner("Saving config, plots and data..."):
-        zip_path = create_report_zip_file(
-            report,
+
+    def build_zip_file() -> bytes:
+        return create_report_zip_file(
+            get_panels_report(report, panels),
             config,
             use_cv,
             make_future_forecast,
@@ -433,4 +467,14 @@ def display_save_experiment_button(
             target_col,
             dimensions,
         )
-        create_save_experiment_button(zip_path)
\ No newline at end of file
+
+    _, col, _ = st.columns(3)
+    col.download_button(
+        "Save experiment",
+        data=build_zip_file,
+        file_name="experiment.zip",
+        mime="application/zip",
+        on_click="ignore",
+        type="primary",
+        width="stretch",
+    )
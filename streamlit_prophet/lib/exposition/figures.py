@@ -0,0 +1,120 @@
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+import hashlib
+
+import plotly.graph_objects as go
+from prophet import Prophet
+from streamlit_prophet.lib.models.cv import get_model_signature
+from streamlit_prophet.lib.utils.cache import LRUCache, get_fingerprint, hash_object
+
+# Built figures, keyed by plot name and fingerprint of the inputs they were built from
+FIGURES_CACHE = LRUCache(maxsize=32)
+
+# Number of versions derived from a figure kept with it, e.g. one per zoomed range
+DERIVED_MAXSIZE = 4
+
+
+def get_figure(name: str, build: Callable[..., go.Figure], *args: Any, **kwargs: Any) -> go.Figure:
+    """Builds a figure, or returns the one already built from the same inputs.
+
+    Parameters
+    ----------
+    name : str
+        Name of the plot.
+    build : Callable
+        Function building the figure, without displaying it.
+    *args
+        Positional arguments of the build function: forecasts, models, style, display options.
+    **kwargs
+        Keyword arguments of the build function.
+
+    Returns
+    -------
+    go.Figure
+        Built figure, shared between reruns, which must not be modified.
+    """
+    key = get_figure_key(name, args, kwargs)
+    figure = FIGURES_CACHE.get(key)
+    if figure is None:
+        figure = build(*args, **kwargs)
+        # Derived data lives with the figure, so it is dropped along with it
+        figure._derived_data = LRUCache(maxsize=DERIVED_MAXSIZE)
+        FIGURES_CACHE.put(key, figure)
+    cached_figure: go.Figure = figure
+    return cached_figure
+
+
+def get_derived_figure_data(
+    fig: go.Figure, key: Hashable, derive: Callable[[go.Figure], Any]
+) -> Any:
+    """Computes something from a figure, once per figure returned by get_figure.
+
+    Parameters
+    ----------
+    fig : go.Figure
+        Plotly go figure, returned by get_figure or not.
+    key : Hashable
+        Name of the derived data, including the options it depends on.
+    derive : Callable
+        Function computing the data from the figure, which must not return None.
+
+    Returns
+    -------
+    Any
+        Derived data, computed again on each call for figures which are not cached.
+    """
+    derived_data = getattr(fig, "_derived_data", None)
+    if derived_data is None:
+        return derive(fig)
+    data = derived_data.get(key)
+    if data is None:
+        data = derive(fig)
+        derived_data.put(key, data)
+    return data
+
+
+def get_figure_key(name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    """Computes the fingerprint of the inputs of a figure.
+
+    Parameters
+    ----------
+    name : str
+        Name of the plot.
+    args : Tuple
+        Positional arguments of the build function: dataframes, models, dictionaries, lists and
+        other values with a stable representation.
+    kwargs : Dict
+        Keyword arguments of the build function.
+
+    Returns
+    -------
+    str
+        Hexadecimal fingerprint.
+    """
+    digest = hashlib.sha1(name.encode())
+    for value in args:
+        digest.update(_fingerprint(value).encode())
+    for key, value in sorted(kwargs.items()):
+        digest.update(f"{key}={_fingerprint(value)}".encode())
+    return digest.hexdigest()
+
+
+def _fingerprint(value: Any) -> str:
+    """Summarizes a figure input in a string, models being summarized by their signature,
+    history and changepoints.
+
+    Parameters
+    ----------
+    value : Any
+        Figure input.
+
+    Returns
+    -------
+    str
+        Fingerprint of the input.
+    """
+    if isinstance(value, Prophet):
+        history = None if value.history is None else get_fingerprint(value.history)
+        changepoints = None if value.changepoints is None else list(value.changepoints)
+        return f"Prophet({get_model_signature(value)}, {history}, {changepoints})"
+    return hash_object(value)
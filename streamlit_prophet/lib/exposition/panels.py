@@ -0,0 +1,68 @@
+from typing import Any, Callable, Dict, List
+
+import streamlit as st
+
+
+def display_panel(
+    panels: Dict[str, List[Dict[str, Any]]],
+    name: str,
+    plot_function: Callable[..., List[Dict[str, Any]]],
+    **kwargs: Any,
+) -> None:
+    """Displays a result panel in a fragment, so that interacting with its widgets only reruns
+    this panel, with the results of the last full run, instead of the whole app.
+
+    Parameters
+    ----------
+    panels : Dict
+        Report components of each panel, updated each time a panel runs.
+    name : str
+        Name of the panel.
+    plot_function : Callable
+        Function displaying the panel, taking a report argument and returning report components.
+    **kwargs
+        Arguments of the plot function, other than report.
+    """
+    st.fragment(_run_panel)(panels, name, plot_function, **kwargs)
+
+
+def get_panels_report(
+    report: List[Dict[str, Any]], panels: Dict[str, List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Gathers report components displayed outside panels and those of each panel.
+
+    Parameters
+    ----------
+    report : List[Dict[str, Any]]
+        Report components displayed outside panels.
+    panels : Dict
+        Report components of each panel, in display order.
+
+    Returns
+    -------
+    list
+        List of all report components.
+    """
+    return report + [component for components in panels.values() for component in components]
+
+
+def _run_panel(
+    panels: Dict[str, List[Dict[str, Any]]],
+    name: str,
+    plot_function: Callable[..., List[Dict[str, Any]]],
+    **kwargs: Any,
+) -> None:
+    """Displays a panel and replaces its report components by those of this run.
+
+    Parameters
+    ----------
+    panels : Dict
+        Report components of each panel.
+    name : str
+        Name of the panel.
+    plot_function : Callable
+        Function displaying the panel.
+    **kwargs
+        Arguments of the plot function, other than report.
+    """
+    panels[name] = plot_function(**kwargs, report=[])
@@ -4,15 +4,24 @@ import datetime
 from collections import defaultdict
 from datetime import timedelta
 
+import numpy as np
 import pandas as pd
 from prophet import Prophet
+from streamlit_prophet.lib.exposition.windows import get_window_aggregator
+from streamlit_prophet.lib.models.predict import predict_forecast_df
+from streamlit_prophet.lib.utils.cache import LRUCache, get_fingerprint
 from streamlit_prophet.lib.utils.mapping import convert_into_nb_of_days, convert_into_nb_of_seconds
 
+# Grouped components of recently displayed forecasts, shared by all plots and sessions
+COMPONENTS_CACHE = LRUCache(maxsize=16)
+
 
 def get_forecast_components(
     model: Prophet, forecast_df: pd.DataFrame, include_yhat: bool = False
 ) -> pd.DataFrame:
     """Returns a dataframe with only the relevant components to sum to get the prediction.
+    Components are cached by forecast and model components, so that plots of the same
+    forecast share them.
 
     Parameters
     ----------
@@ -28,19 +37,52 @@ def get_forecast_components(
     pd.DataFrame
         Dataframe with only the relevant components to sum to get the prediction.
     """
-    fcst = forecast_df.copy()
-    components_col_names = get_forecast_components_col_names(fcst) + ["ds"]
+    components_col_names = get_forecast_components_col_names(forecast_df)
     if include_yhat:
         components_col_names = components_col_names + ["yhat"]
-    components = fcst[components_col_names]
-    for col in components_col_names:
-        if col in model.component_modes["multiplicative"]:
-            components[col] *= components["trend"]
+    multiplicative_cols = model.component_modes["multiplicative"]
+    key = get_components_key(model, forecast_df, include_yhat)
+    components = COMPONENTS_CACHE.get(key)
+    if components is None:
+        values = forecast_df[components_col_names].to_numpy(dtype=float)
+        multiplicative = [col in multiplicative_cols for col in components_col_names]
+        values[:, multiplicative] *= forecast_df[["trend"]].to_numpy(dtype=float)
+        components = pd.DataFrame(
+            values, index=pd.Index(forecast_df["ds"], name="ds"), columns=components_col_names
+        )
+        components_mapping = get_components_mapping(components, model, cols_to_drop=["holidays"])
+        components = group_components(components, components_mapping)
+        COMPONENTS_CACHE.put(key, components)
+    return components.copy()
+
+
+def get_components_key(model: Prophet, forecast_df: pd.DataFrame, include_yhat: bool) -> str:
+    """Computes the fingerprint of the components of a forecast. The forecast's values are
+    hashed only once per forecast, as forecasts are not modified once produced.
 
-    components = components.set_index("ds")
-    components_mapping = get_components_mapping(components, model, cols_to_drop=["holidays"])
-    components = group_components(components, components_mapping)
-    return components
+    Parameters
+    ----------
+    model : Prophet
+        Fitted model.
+    forecast_df : pd.DataFrame
+        Forecast dataframe returned by Prophet model.
+    include_yhat : bool
+        Whether or not yhat is included in components.
+
+    Returns
+    -------
+    str
+        Cache key of the components.
+    """
+    holiday_names = model.train_holiday_names
+    return repr(
+        (
+            get_fingerprint(forecast_df),
+            include_yhat,
+            sorted(model.component_modes["multiplicative"]),
+            None if holiday_names is None else list(holiday_names),
+        )
+    )
 
 
 def get_forecast_components_col_names(forecast_df: pd.DataFrame) -> List[Any]:
@@ -57,9 +99,10 @@ def get_forecast_components_col_names(forecast_df: pd.DataFrame) -> List[Any]:
         List of columns to keep in forecast dataframe to get all components without upper/lower bounds.
     """
     components_col = [
-        col.replace("_lower", "")
+        col
         for col in forecast_df.columns
-        if "lower" in col
+        if col not in ["ds", "y", "cap", "floor"]
+        and not col.endswith(("_lower", "_upper"))
         and "yhat" not in col
         and "multiplicative" not in col
         and "additive" not in col
@@ -130,11 +173,40 @@ A column not in any of the mapping values will be dropped.
     pd.DataFrame
         Dataframe with components either left as is, summed or dropped, based on provided mapping
     """
-    grouped_components = pd.DataFrame(index=components.index)
-    for new_col_name, grouped_cols in components_mapping.items():
-        if new_col_name != "_to_drop_":
-            grouped_components[new_col_name] = components[grouped_cols].sum(axis=1)
-    return grouped_components
+    names, matrix = get_mapping_matrix(list(components.columns), components_mapping)
+    # Missing values are skipped by pandas sums, they are zeros in the matrix product
+    values = np.nan_to_num(components.to_numpy(dtype=float), nan=0.0)
+    return pd.DataFrame(values @ matrix, index=components.index, columns=names)
+
+
+def get_mapping_matrix(
+    columns: List[Any], components_mapping: Dict[str, List[Any]]
+) -> Tuple[List[str], np.ndarray]:
+    """Converts a components mapping into a matrix that sums each group of columns in one product.
+
+    Parameters
+    ----------
+    columns: List
+        Columns of the components dataframe.
+    components_mapping: Dict[str, list]
+        dict with value: list of columns to sum under key: new column name. \
+Can include a '_to_drop_' item to mark columns to be dropped.
+
+    Returns
+    -------
+    List[str]
+        Names of grouped components.
+    np.ndarray
+        Matrix with one row per column and one column per grouped component,
+        equal to 1 where a column belongs to a group.
+    """
+    positions = {col: i for i, col in enumerate(columns)}
+    names = [name for name in components_mapping.keys() if name != "_to_drop_"]
+    matrix = np.zeros((len(columns), len(names)))
+    for j, name in enumerate(names):
+        for col in components_mapping[name]:
+            matrix[positions[col], j] += 1
+    return names, matrix
 
 
 def get_df_cv_with_hist(
@@ -157,10 +229,13 @@ def get_df_cv_with_hist(
         Dataframe containing CV results and predictions on training data not included in CV validation folds.
     """
     df_cv = forecasts["cv"].drop(["cutoff"], axis=1)
-    df_past = models["eval"].predict(
-        datasets["train"].loc[datasets["train"]["ds"] < df_cv.ds.min()].drop("y", axis=1)
+    df_past = predict_forecast_df(
+        models["eval"],
+        datasets["train"].loc[datasets["train"]["ds"] < df_cv.ds.min()].drop("y", axis=1),
     )
-    common_cols = ["ds", "yhat", "yhat_lower", "yhat_upper"]
+    common_cols = [
+        col for col in ["ds", "yhat", "yhat_lower", "yhat_upper"] if col in df_cv.columns
+    ]
     df_past = df_past[common_cols + list(set(df_past.columns) - set(common_cols))]
     df_cv = pd.concat([df_cv, df_past], axis=0).sort_values("ds").reset_index(drop=True)
     return df_cv
@@ -238,7 +313,10 @@ def get_hover_template_cv(
 
 
 def prepare_waterfall(
-    components: pd.DataFrame, start_date: datetime.date, end_date: datetime.date
+    components: pd.DataFrame,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    fingerprint: Optional[str] = None,
 ) -> pd.DataFrame:
     """Returns a dataframe with only the relevant components to sum to get the prediction.
 
@@ -250,16 +328,15 @@ def prepare_waterfall(
         Start date for components computation.
     end_date : datetime.date
         End date for components computation.
+    fingerprint : str, optional
+        Fingerprint of the components, by default computed from their values.
 
     Returns
     -------
     pd.DataFrame
         Dataframe with only the relevant data to plot the waterfall chart.
     """
-    waterfall = components.loc[
-        (components["ds"] >= pd.to_datetime(start_date))
-        & (components["ds"] < pd.to_datetime(end_date))
-    ]
-    waterfall = waterfall.mean(axis=0, numeric_only=True)
+    aggregator = get_window_aggregator(components, fingerprint=fingerprint)
+    waterfall = aggregator.mean(start_date, end_date)
     waterfall = waterfall[waterfall != 0]
     return waterfall
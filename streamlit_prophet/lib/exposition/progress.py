@@ -0,0 +1,39 @@
+from typing import Any, Dict
+
+import time
+
+import streamlit as st
+from streamlit_prophet.lib.utils.jobs import Job
+
+
+def display_job_progress(job: Job, config: Dict[Any, Any]) -> None:
+    """Displays the progress of a background job, polled in a fragment until the job publishes
+    a new result, which triggers a full rerun of the app to display it.
+
+    Parameters
+    ----------
+    job : Job
+        Job to follow.
+    config : Dict
+        Lib configuration dictionary, containing jobs specifications.
+    """
+    poll = st.fragment(_poll_job, run_every=config["jobs"]["poll_interval"])
+    poll(job, job.get_n_results())
+
+
+def _poll_job(job: Job, n_displayed_results: int) -> None:
+    """Displays the current stage of a job, or reruns the app if it has new results.
+
+    Parameters
+    ----------
+    job : Job
+        Job to follow.
+    n_displayed_results : int
+        Number of results of the job already displayed.
+    """
+    if job.get_n_results() > n_displayed_results:
+        st.rerun()
+    stage, step, n_steps = job.get_progress()
+    elapsed = time.time() - job.submitted_at
+    text = f"{stage} ({step}/{n_steps})" if n_steps > 0 else stage
+    st.progress(step / n_steps if n_steps > 0 else 0.0, text=f"{text}... {elapsed:.0f}s")
@@ -0,0 +1,229 @@
+from typing import Any, List, NamedTuple, Optional
+
+import base64
+import datetime
+import functools
+import html
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+from plotly.utils import PlotlyJSONEncoder
+
+# Type codes of binary arrays understood by plotly.js, for each numpy dtype
+TYPED_ARRAY_CODES = {
+    np.dtype("float32"): "f4",
+    np.dtype("float64"): "f8",
+    np.dtype("int32"): "i4",
+}
+
+# Shorter arrays are left as JSON lists, their binary encoding would not be smaller
+MIN_TYPED_ARRAY_LENGTH = 16
+
+PLOTLY_JS_FILENAME = "plotly.min.js"
+
+
+@functools.lru_cache(maxsize=1)
+def get_plotly_js() -> str:
+    """Returns the plotly.js library bundled with plotly, read once per process.
+
+    Returns
+    -------
+    str
+        Minified plotly.js source.
+    """
+    return str(get_plotlyjs())
+
+
+def get_compact_figure_json(fig: go.Figure, float_precision: str = "float32") -> str:
+    """Serializes a figure to JSON, numeric arrays of traces being stored as base64 typed arrays.
+
+    Parameters
+    ----------
+    fig : go.Figure
+        Plotly go figure to serialize.
+    float_precision : str
+        Either "float32", which halves the size of float arrays and keeps 7 significant digits,
+        or "float64", which keeps exact values.
+
+    Returns
+    -------
+    str
+        JSON of the figure, that can be inserted in a html script.
+    """
+    figure = fig.to_plotly_json()
+    figure["data"] = [_encode_arrays(trace, np.dtype(float_precision)) for trace in figure["data"]]
+    figure_json = json.dumps(figure, cls=PlotlyJSONEncoder, separators=(",", ":"))
+    # Texts of the figure must not close the script they are inserted in
+    return figure_json.replace("</", "<\\/")
+
+
+class CompactFigure(NamedTuple):
+    """Figure serialized by get_compact_figure_json, ready to be inserted in html pages."""
+
+    title: str
+    json: str
+    height: int
+
+
+def get_compact_figure(
+    title: str, fig: go.Figure, float_precision: str = "float32"
+) -> CompactFigure:
+    """Serializes a figure with its title and height.
+
+    Parameters
+    ----------
+    title : str
+        Title displayed above the figure, skipped if it is empty.
+    fig : go.Figure
+        Plotly go figure to serialize.
+    float_precision : str
+        Precision of float arrays, either "float32" or "float64".
+
+    Returns
+    -------
+    CompactFigure
+        Serialized figure.
+    """
+    figure_json = get_compact_figure_json(fig, float_precision)
+    return CompactFigure(title, figure_json, fig.layout.height or 500)
+
+
+def get_figures_html(figures: List[CompactFigure], plotly_js_src: Optional[str] = None) -> str:
+    """Creates a html page displaying figures one below the other.
+
+    Parameters
+    ----------
+    figures : List[CompactFigure]
+        Serialized figures.
+    plotly_js_src : str, optional
+        Path of a shared plotly.js file, relative to the page.
+        By default, plotly.js is included in the page, which is then self-contained.
+
+    Returns
+    -------
+    str
+        Html page.
+    """
+    if plotly_js_src is None:
+        plotly_js = f"<script type='text/javascript'>{get_plotly_js()}</script>"
+    else:
+        plotly_js = f"<script src='{html.escape(plotly_js_src)}'></script>"
+    divs = []
+    for i, figure in enumerate(figures):
+        divs.append(
+            (f"<h2>{html.escape(figure.title)}</h2>" if figure.title else "")
+            + f"<div id='plot_{i}' style='height:{figure.height}px;width:100%;'></div>"
+            + f"<script>var figure = {figure.json};"
+            + f"Plotly.newPlot('plot_{i}', figure.data, figure.layout, {{responsive: true}});"
+            + "</script>"
+        )
+    return (
+        "<html><head><meta charset='utf-8' />"
+        f"{plotly_js}</head><body>{''.join(divs)}</body></html>"
+    )
+
+
+def _encode_arrays(value: Any, float_dtype: np.dtype) -> Any:
+    """Replaces numeric arrays nested in a trace by plotly.js typed arrays.
+
+    Parameters
+    ----------
+    value : Any
+        Trace, or one of its attributes.
+    float_dtype : np.dtype
+        Type of encoded float arrays.
+
+    Returns
+    -------
+    Any
+        Value with numeric arrays encoded.
+    """
+    if isinstance(value, dict):
+        return {key: _encode_arrays(item, float_dtype) for key, item in value.items()}
+    if not isinstance(value, (list, tuple, np.ndarray)):
+        return value
+    if len(value) >= MIN_TYPED_ARRAY_LENGTH:
+        if isinstance(value[0], (datetime.date, np.datetime64)):
+            return _format_dates(value)
+        array = _as_numeric_array(value)
+        if array is not None and array.dtype.kind in "iu" and np.abs(array).max() < 2**31:
+            return _to_typed_array(array.astype(np.int32))
+        if array is not None:
+            return _to_typed_array(array.astype(float_dtype))
+    if isinstance(value, np.ndarray):
+        return value
+    return [_encode_arrays(item, float_dtype) for item in value]
+
+
+def _format_dates(value: Any) -> Any:
+    """Formats dates as ISO strings all at once, instead of one by one by the JSON encoder.
+
+    Parameters
+    ----------
+    value : Any
+        List or array of dates.
+
+    Returns
+    -------
+    Any
+        List of ISO dates, None for missing dates. Dates with a time zone are left unchanged.
+    """
+    try:
+        index = pd.DatetimeIndex(value)
+    except (TypeError, ValueError):
+        return value
+    if index.tz is not None:
+        return value
+    index = index.as_unit("ns")
+    whole_seconds = (index.asi8[~index.isna()] % 10**9 == 0).all()
+    dates = np.datetime_as_string(index.values, unit="s" if whole_seconds else "us")
+    dates = dates.astype(object)
+    dates[index.isna()] = None
+    return dates.tolist()
+
+
+def _as_numeric_array(value: Any) -> Optional[np.ndarray]:
+    """Converts a list or an array to a numeric array of 1 or 2 dimensions, if possible.
+
+    Parameters
+    ----------
+    value : Any
+        List, tuple or array.
+
+    Returns
+    -------
+    np.ndarray, optional
+        Numeric array, None if values are not all numbers or do not form a matrix.
+    """
+    try:
+        array = np.asarray(value)
+    except ValueError:
+        return None
+    if array.dtype.kind not in "iuf" or array.ndim > 2:
+        return None
+    return array
+
+
+def _to_typed_array(array: np.ndarray) -> Any:
+    """Encodes an array in base64, at the format of plotly.js typed arrays.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        Array of 1 or 2 dimensions, with a dtype supported by plotly.js.
+
+    Returns
+    -------
+    dict
+        Type code, shape and base64 content of the array.
+    """
+    typed_array = {
+        "dtype": TYPED_ARRAY_CODES[array.dtype],
+        "bdata": base64.b64encode(np.ascontiguousarray(array).tobytes()).decode(),
+    }
+    if array.ndim == 2:
+        typed_array["shape"] = f"{array.shape[0]},{array.shape[1]}"
+    return typed_array
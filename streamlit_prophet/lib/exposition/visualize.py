@@ -1,7 +1,8 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import datetime
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.figure_factory as ff
@@ -10,14 +11,31 @@ import streamlit as st
 from plotly.subplots import make_subplots
 from prophet import Prophet
 from prophet.plot import plot_plotly
-from streamlit_prophet.lib.evaluation.metrics import get_perf_metrics
+from streamlit_prophet.lib.evaluation.metrics import get_bootstrap_intervals, get_perf_metrics
 from streamlit_prophet.lib.evaluation.preparation import get_evaluation_df
+from streamlit_prophet.lib.exposition.downsampling import (
+    downsample_figure,
+    get_date_bounds,
+    get_max_trace_length,
+)
 from streamlit_prophet.lib.exposition.expanders import (
     display_expander,
     display_expanders_performance,
 )
-from streamlit_prophet.lib.exposition.preparation import get_forecast_components, prepare_waterfall
+from streamlit_prophet.lib.exposition.export import (
+    DATAFRAME_FORMATS,
+    display_dataframe_download_button,
+)
+from streamlit_prophet.lib.exposition.figures import get_derived_figure_data, get_figure
+from streamlit_prophet.lib.exposition.preparation import (
+    get_components_key,
+    get_forecast_components,
+    prepare_waterfall,
+)
+from streamlit_prophet.lib.exposition.windows import get_window_aggregator
 from streamlit_prophet.lib.inputs.dates import input_waterfall_dates
+from streamlit_prophet.lib.models.preview import get_preview_accuracy_report
+from streamlit_prophet.lib.models.scenarios import get_scenarios_summary, predict_scenarios
 from streamlit_prophet.lib.utils.misc import reverse_list
 
 
@@ -28,6 +46,7 @@ def plot_overview(
     forecasts: Dict[Any, Any],
     target_col: str,
     cleaning: Dict[Any, Any],
+    config: Dict[Any, Any],
     readme: Dict[Any, Any],
     report: List[Dict[str, Any]],
 ) -> List[Dict[str, Any]]:
@@ -47,6 +66,8 @@ def plot_overview(
         Name of target column.
     cleaning : Dict
         Cleaning specifications.
+    config : Dict
+        Lib configuration dictionary, containing plots display specifications.
     readme : Dict
         Dictionary containing explanations about the graph.
     report: List[Dict[str, Any]]
@@ -63,7 +84,9 @@ def plot_overview(
     else:
         model = models["eval"]
         forecast = forecasts["eval"]
-    fig = plot_plotly(
+    fig = get_figure(
+        "overview",
+        plot_plotly,
         model,
         forecast,
         ylabel=target_col,
@@ -71,7 +94,7 @@ def plot_overview(
         trend=bool_param,
         uncertainty=bool_param,
     )
-    st.plotly_chart(fig)
+    display_plotly_chart(fig, config, readme, "overview")
     report.append({"object": fig, "name": "overview", "type": "plot"})
     return report
 
@@ -125,12 +148,16 @@ def plot_performance(
     report = display_global_metrics(evaluation_df, eval, dates, resampling, use_cv, config, report)
     st.write("### Deep dive")
     report = plot_detailed_metrics(metrics_df, metrics_dict, eval, use_cv, style, report)
+    if eval["bootstrap"]:
+        report = display_bootstrap_intervals(evaluation_df, eval, use_cv, config, report)
     st.write("## Error analysis")
     display_expander(readme, "helper_errors", "How to troubleshoot forecasting errors?", True)
-    fig1 = plot_forecasts_vs_truth(evaluation_df, target_col, use_cv, style)
+    fig1 = get_figure(
+        "eval_forecast_vs_truth", plot_forecasts_vs_truth, evaluation_df, target_col, use_cv, style
+    )
     # fig2 = plot_truth_vs_actual_scatter(evaluation_df, use_cv, style)
     # fig3 = plot_residuals_distrib(evaluation_df, use_cv, style)
-    st.plotly_chart(fig1)
+    display_plotly_chart(fig1, config, readme, "eval_forecast_vs_truth")
     # st.plotly_chart(fig2)
     # st.plotly_chart(fig3)
     report.append({"object": fig1, "name": "eval_forecast_vs_truth_line", "type": "plot"})
@@ -196,10 +223,17 @@ def plot_components(
     else:
         forecast_df = forecasts["eval"].copy()
         model = models["eval"]
-    fig1 = make_separate_components_plot(
-        model, forecast_df, target_col, cleaning, resampling, style
+    fig1 = get_figure(
+        "global_components",
+        make_separate_components_plot,
+        model,
+        forecast_df,
+        target_col,
+        cleaning,
+        resampling,
+        style,
     )
-    st.plotly_chart(fig1)
+    display_plotly_chart(fig1, config, readme, "global_components")
 
     # st.write("## Local impact")
     # display_expander(readme, "waterfall", "More info on this plot", True)
@@ -222,6 +256,7 @@ def plot_future(
     dates: Dict[Any, Any],
     target_col: str,
     cleaning: Dict[Any, Any],
+    config: Dict[Any, Any],
     readme: Dict[Any, Any],
     report: List[Dict[str, Any]],
     df: pd.DataFrame = None,
@@ -240,6 +275,8 @@ def plot_future(
         Name of target column.
     cleaning : Dict
         Cleaning specifications.
+    config : Dict
+        Lib configuration dictionary, containing plots display specifications.
     readme : Dict
         Dictionary containing explanations about the graph.
     report: List[Dict[str, Any]]
@@ -248,48 +285,50 @@ def plot_future(
         Historical dataframe containing the target variable, by default None.
     """
     display_expander(readme, "future", "More info on this plot")
-    bool_param = False if cleaning["log_transform"] else True
-    fig = plot_plotly(
+    fig = get_figure(
+        "future_forecast",
+        make_future_forecast_plot,
         models["future"],
         forecasts["future"],
-        ylabel=target_col,
-        changepoints=bool_param,
-        trend=bool_param,
-        uncertainty=bool_param,
+        target_col,
+        cleaning,
+        dates["forecast_start_date"],
+        dates["forecast_end_date"],
     )
-    fig.update_layout(xaxis_range=[dates["forecast_start_date"], dates["forecast_end_date"]])
-    st.plotly_chart(fig)
+    display_plotly_chart(fig, config, readme, "future_forecast")
     
     # Calculate and display forecast summary metrics
     future_df = forecasts["future"]
     
-    # Filter to just the forecasted period (excluding historical data in the forecast dataframe)
-    forecast_period = future_df[future_df['ds'] >= dates["forecast_start_date"]]
-    
-    # 1. Total forecasted value
-    total_forecast = forecast_period['yhat'].sum()
+    # 1. Total forecasted value, on the forecasted period only (excluding historical data)
+    forecast = get_window_aggregator(future_df, ["yhat"])
+    total_forecast = forecast.sum(dates["forecast_start_date"])["yhat"]
     
     # 2. Comparison with previous period (if historical data is available)
     prev_period_diff = None
     prev_period_pct = None
-    prev_period_data = pd.DataFrame()
+    prev_period_found = False
     prev_period_total = None
     prev_year_diff = None
     prev_year_pct = None
-    prev_year_data = pd.DataFrame()
+    prev_year_found = False
     prev_year_total = None
 
     # Calculate duration of forecast period in days (used for comparisons and display)
     forecast_duration = (dates["forecast_end_date"] - dates["forecast_start_date"]).days
     
     if df is not None:
+        # Windows of history are summed from cumulative sums, without scanning the dataframe
+        history = get_window_aggregator(df, ["y"])
+
         # Previous period (same duration before forecast start)
         prev_period_start = dates["forecast_start_date"] - pd.Timedelta(days=forecast_duration)
         prev_period_end = dates["forecast_start_date"] - pd.Timedelta(days=1)
         
-        prev_period_data = df[(df['ds'] >= prev_period_start) & (df['ds'] <= prev_period_end)]
-        if not prev_period_data.empty:
-            prev_period_total = prev_period_data['y'].sum()
+        prev_period_rows = history.bounds(prev_period_start, prev_period_end, True)
+        prev_period_found = prev_period_rows[1] > prev_period_rows[0]
+        if prev_period_found:
+            prev_period_total = history.sum(prev_period_start, prev_period_end, True)["y"]
             prev_period_diff = total_forecast - prev_period_total
             prev_period_pct = (prev_period_diff / prev_period_total) * 100 if prev_period_total != 0 else float('inf')
         
@@ -301,9 +340,10 @@ def plot_future(
             prev_year_diff = None
             prev_year_pct = None
         else:
-            prev_year_data = df[(df['ds'] >= prev_year_start) & (df['ds'] <= prev_year_end)]
-            if not prev_year_data.empty:
-                prev_year_total = prev_year_data['y'].sum()
+            prev_year_rows = history.bounds(prev_year_start, prev_year_end, True)
+            prev_year_found = prev_year_rows[1] > prev_year_rows[0]
+            if prev_year_found:
+                prev_year_total = history.sum(prev_year_start, prev_year_end, True)["y"]
                 prev_year_diff = total_forecast - prev_year_total
                 prev_year_pct = (prev_year_diff / prev_year_total) * 100 if prev_year_total != 0 else float('inf')
     
@@ -318,7 +358,7 @@ def plot_future(
         if df is not None:
             st.markdown("### Previous Period Comparison")
             st.markdown(f"**Previous Period:** {prev_period_start.strftime('%Y-%m-%d')} to {prev_period_end.strftime('%Y-%m-%d')}")
-            if not prev_period_data.empty:
+            if prev_period_found:
                 st.markdown(f"**Previous Period Total:** {int(round(prev_period_total))}")
                 st.markdown(f"**Difference:** {int(round(prev_period_diff)):.2f} ({prev_period_pct:.1f}%)")
             else:
@@ -326,7 +366,7 @@ def plot_future(
                 
             st.markdown("### Previous Year Comparison")
             st.markdown(f"**Same Period Last Year:** {prev_year_start.strftime('%Y-%m-%d')} to {prev_year_end.strftime('%Y-%m-%d')}")
-            if not prev_year_data.empty:
+            if prev_year_found:
                 st.markdown(f"**Previous Year Total:** {int(round(prev_year_total))}")
                 st.markdown(f"**Difference:** {int(round(prev_year_diff)):.2f} ({prev_year_pct:.1f}%)")
             else:
@@ -355,6 +395,15 @@ def plot_future(
                 value=f"{int(round(prev_year_diff))}",
                 delta=f"{prev_year_pct:.1f}%"
             )
+
+    # Large forecasts are lighter to download as compressed csv or parquet
+    display_dataframe_download_button(
+        future_df,
+        "future_forecast",
+        "Download forecast",
+        add_blank=True,
+        file_formats=list(DATAFRAME_FORMATS.keys()),
+    )
     
     report.append({"object": fig, "name": "future_forecast", "type": "plot"})
     report.append({"object": forecasts["future"], "name": "future_forecast", "type": "dataset"})
@@ -581,24 +630,14 @@ def plot_detailed_metrics(
     """
     metrics = [metric for metric in perf.keys() if perf[metric][eval["granularity"]].nunique() > 1]
     if len(metrics) > 0:
-        fig = make_subplots(
-            rows=len(metrics) // 2 + len(metrics) % 2, cols=2, subplot_titles=metrics
-        )
-        for i, metric in enumerate(metrics):
-            colors = (
-                style["colors"]
-                if use_cv
-                else [style["colors"][i % len(style["colors"])]]
-                * perf[metric][eval["granularity"]].nunique()
-            )
-            fig_metric = go.Bar(
-                x=perf[metric][eval["granularity"]], y=perf[metric][metric], marker_color=colors
-            )
-            fig.append_trace(fig_metric, row=i // 2 + 1, col=i % 2 + 1)
-        fig.update_layout(
-            height=300 * (len(metrics) // 2 + len(metrics) % 2),
-            width=1000,
-            showlegend=False,
+        perf = {metric: perf[metric] for metric in metrics}
+        fig = get_figure(
+            "eval_detailed_performance",
+            make_detailed_metrics_plot,
+            perf,
+            eval["granularity"],
+            use_cv,
+            style,
         )
         st.plotly_chart(fig)
         report.append({"object": fig, "name": "eval_detailed_performance", "type": "plot"})
@@ -607,6 +646,90 @@ def plot_detailed_metrics(
     return report
 
 
+def make_detailed_metrics_plot(
+    perf: Dict[Any, Any], granularity: str, use_cv: bool, style: Dict[Any, Any]
+) -> go.Figure:
+    """Creates plotly bar charts showing model performance on each metric, one per subplot.
+
+    Parameters
+    ----------
+    perf : Dict
+        Dictionary containing model performance on each plotted metric at the desired granularity.
+    granularity : str
+        Evaluation granularity.
+    use_cv : bool
+        Whether or not cross-validation is used.
+    style : Dict
+        Style specifications for the graph (colors).
+
+    Returns
+    -------
+    go.Figure
+        Plotly bar charts showing model performance on each metric.
+    """
+    metrics = list(perf.keys())
+    fig = make_subplots(rows=len(metrics) // 2 + len(metrics) % 2, cols=2, subplot_titles=metrics)
+    for i, metric in enumerate(metrics):
+        colors = (
+            style["colors"]
+            if use_cv
+            else [style["colors"][i % len(style["colors"])]] * perf[metric][granularity].nunique()
+        )
+        fig_metric = go.Bar(
+            x=perf[metric][granularity], y=perf[metric][metric], marker_color=colors
+        )
+        fig.append_trace(fig_metric, row=i // 2 + 1, col=i % 2 + 1)
+    fig.update_layout(
+        height=300 * (len(metrics) // 2 + len(metrics) % 2),
+        width=1000,
+        showlegend=False,
+    )
+    return fig
+
+
+def make_future_forecast_plot(
+    model: Prophet,
+    forecast_df: pd.DataFrame,
+    target_col: str,
+    cleaning: Dict[Any, Any],
+    start_date: datetime.date,
+    end_date: datetime.date,
+) -> go.Figure:
+    """Creates a plotly plot with predictions for future dates, zoomed on the forecast horizon.
+
+    Parameters
+    ----------
+    model : Prophet
+        Model fitted on the whole dataset.
+    forecast_df : pd.DataFrame
+        Predictions of Prophet model, on history and future dates.
+    target_col : str
+        Name of target column.
+    cleaning : Dict
+        Cleaning specifications.
+    start_date : datetime.date
+        First date of the forecast horizon.
+    end_date : datetime.date
+        Last date of the forecast horizon.
+
+    Returns
+    -------
+    go.Figure
+        Plotly plot with predictions and actual values.
+    """
+    bool_param = False if cleaning["log_transform"] else True
+    fig = plot_plotly(
+        model,
+        forecast_df,
+        ylabel=target_col,
+        changepoints=bool_param,
+        trend=bool_param,
+        uncertainty=bool_param,
+    )
+    fig.update_layout(xaxis_range=[start_date, end_date])
+    return fig
+
+
 def make_separate_components_plot(
     model: Prophet,
     forecast_df: pd.DataFrame,
@@ -737,10 +860,9 @@ def make_waterfall_components_plot(
     """
     N_digits = style["waterfall_digits"]
     components = get_forecast_components(model, forecast_df, True).reset_index()
-    waterfall = prepare_waterfall(components, start_date, end_date)
-    truth = df.loc[
-        (df["ds"] >= pd.to_datetime(start_date)) & (df["ds"] < pd.to_datetime(end_date)), "y"
-    ].mean(axis=0)
+    fingerprint = get_components_key(model, forecast_df, True)
+    waterfall = prepare_waterfall(components, start_date, end_date, fingerprint)
+    truth = get_window_aggregator(df, ["y"]).mean(start_date, end_date)["y"]
     fig = go.Figure(
         go.Waterfall(
             orientation="v",
@@ -845,3 +967,255 @@ def display_global_metrics(
             }
         )
     return report
+
+
+def display_bootstrap_intervals(
+    evaluation_df: pd.DataFrame,
+    eval: Dict[Any, Any],
+    use_cv: bool,
+    config: Dict[Any, Any],
+    report: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Displays bootstrap confidence intervals of selected metrics at the desired granularity.
+
+    Parameters
+    ----------
+    evaluation_df : pd.DataFrame
+        Evaluation dataframe.
+    eval : Dict
+        Evaluation specifications.
+    use_cv : bool
+        Whether or note cross-validation is used.
+    config : Dict
+        Lib configuration dictionary.
+    report: List[Dict[str, Any]]
+        List of all report components.
+
+    Returns
+    -------
+    list
+        List of all report components.
+    """
+    intervals_df = get_bootstrap_intervals(evaluation_df, eval, use_cv, config)
+    confidence_level = config["metrics"]["bootstrap"]["confidence_level"]
+    st.write(f"### Confidence intervals ({confidence_level:.0%})")
+    st.dataframe(intervals_df)
+    report.append(
+        {
+            "object": intervals_df.reset_index(),
+            "name": "eval_confidence_intervals",
+            "type": "dataset",
+        }
+    )
+    return report
+
+
+def plot_preview(
+    model: Prophet,
+    forecast: pd.DataFrame,
+    target_col: str,
+    cleaning: Dict[Any, Any],
+    config: Dict[Any, Any],
+) -> None:
+    """Plots the approximate forecast made by the preview model, while the actual model is trained.
+
+    Parameters
+    ----------
+    model : Prophet
+        Preview model.
+    forecast : pd.DataFrame
+        Forecast made by the preview model.
+    target_col : str
+        Name of target column.
+    cleaning : Dict
+        Cleaning specifications.
+    config : Dict
+        Lib configuration dictionary, containing plots display specifications.
+    """
+    bool_param = False if cleaning["log_transform"] else True
+    st.write("# Preview")
+    st.info("Approximate forecast, it will be replaced by the actual one once training is over.")
+    fig = plot_plotly(
+        model,
+        forecast,
+        ylabel=target_col,
+        changepoints=bool_param,
+        trend=bool_param,
+        uncertainty=False,
+    )
+    display_plotly_chart(fig, config)
+
+
+def display_preview_accuracy(
+    preview_forecast: pd.DataFrame,
+    datasets: Dict[Any, Any],
+    forecasts: Dict[Any, Any],
+    report: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Displays a table comparing the preview forecast with the forecast of the actual model.
+
+    Parameters
+    ----------
+    preview_forecast : pd.DataFrame
+        Forecast made by the preview model.
+    datasets : Dict
+        Dictionary containing all relevant dataframes for training and forecasting.
+    forecasts : Dict
+        Dictionary containing the different forecasts.
+    report: List[Dict[str, Any]]
+        List of all report components.
+
+    Returns
+    -------
+    list
+        List of all report components.
+    """
+    forecast_key = [key for key in ["eval", "cv_with_hist", "future"] if key in forecasts][0]
+    truth = pd.concat(
+        [datasets[key] for key in ["train", "val", "full"] if key in datasets], axis=0
+    ).drop_duplicates("ds")
+    accuracy_df = get_preview_accuracy_report(preview_forecast, forecasts[forecast_key], truth)
+    with st.expander("Accuracy of the preview", expanded=False):
+        st.dataframe(accuracy_df)
+    report.append(
+        {"object": accuracy_df.reset_index(), "name": "preview_accuracy", "type": "dataset"}
+    )
+    return report
+
+
+def display_tuning_leaderboard(
+    leaderboard: pd.DataFrame, report: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Displays the candidates evaluated by the hyperparameter search, the best one first.
+
+    Parameters
+    ----------
+    leaderboard : pd.DataFrame
+        Leaderboard of evaluated candidates.
+    report: List[Dict[str, Any]]
+        List of all report components.
+
+    Returns
+    -------
+    list
+        List of all report components.
+    """
+    with st.expander("Hyperparameter tuning leaderboard", expanded=False):
+        st.write(
+            f"Parameters of candidate '{leaderboard['candidate'].iloc[0]}' have been used "
+            "to train the model. Candidates evaluated on fewer folds have been pruned early."
+        )
+        st.dataframe(leaderboard)
+    report.append({"object": leaderboard, "name": "tuning_leaderboard", "type": "dataset"})
+    return report
+
+
+def plot_scenarios(
+    models: Dict[Any, Any],
+    datasets: Dict[Any, Any],
+    scenarios: Dict[str, List[Dict[str, Any]]],
+    dates: Dict[Any, Any],
+    target_col: str,
+    cleaning: Dict[Any, Any],
+    config: Dict[Any, Any],
+    readme: Dict[Any, Any],
+    report: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Plots the forecasts of what-if scenarios side by side with the baseline forecast.
+
+    Parameters
+    ----------
+    models : Dict
+        Dictionary containing a model fitted on the whole dataset.
+    datasets : Dict
+        Dictionary containing future dataframe.
+    scenarios : Dict
+        Regressors perturbations of each scenario.
+    dates : Dict
+        Dictionary containing future forecast dates.
+    target_col : str
+        Name of target column.
+    cleaning : Dict
+        Cleaning specifications.
+    config : Dict
+        Lib configuration dictionary, containing style specifications.
+    readme : Dict
+        Dictionary containing explanations about the graph.
+    report: List[Dict[str, Any]]
+        List of all report components.
+
+    Returns
+    -------
+    list
+        List of all report components, with the scenarios plot and forecasts added.
+    """
+    display_expander(readme, "scenarios", "More info on this plot")
+    if len(models["future"].extra_regressors) == 0:
+        st.info("Scenarios require the future values of regressors, please provide them.")
+        return report
+    start_date = dates["forecast_start_date"]
+    forecasts = predict_scenarios(models["future"], datasets["future"], scenarios, start_date)
+    if cleaning["log_transform"]:
+        forecasts[forecasts.columns[1:]] = np.exp(forecasts[forecasts.columns[1:]])
+    forecasts = forecasts.loc[forecasts["ds"] >= pd.Timestamp(start_date)]
+    summary = get_scenarios_summary(forecasts, start_date)
+    fig = px.line(
+        forecasts.melt(id_vars="ds", var_name="Scenario", value_name=target_col),
+        x="ds",
+        y=target_col,
+        color="Scenario",
+        color_discrete_sequence=config["style"]["colors"],
+    )
+    st.plotly_chart(fig)
+    st.dataframe(summary)
+    report.append({"object": fig, "name": "scenarios", "type": "plot"})
+    report.append({"object": forecasts, "name": "scenarios_forecasts", "type": "dataset"})
+    return report
+
+
+def display_plotly_chart(
+    fig: go.Figure,
+    config: Dict[Any, Any],
+    readme: Optional[Dict[Any, Any]] = None,
+    key: Optional[str] = None,
+) -> None:
+    """Displays a figure whose long traces are downsampled, so that the browser renders it quickly.
+    The figure itself is left unchanged, so that reports keep all points.
+
+    Parameters
+    ----------
+    fig : go.Figure
+        Plotly go figure to display.
+    config : Dict
+        Lib configuration dictionary, containing plots display specifications.
+    readme : Dict, optional
+        Dictionary containing tooltips, required if a key is given.
+    key : str, optional
+        Unique name of the chart. If given, the user can zoom on a date range at full resolution.
+    """
+    max_points = config["plots"]["max_points"]
+    chart = st.empty()
+    x_range = None
+    bounds = get_date_bounds(fig)
+    is_downsampled = 0 < max_points < get_max_trace_length(fig)
+    if key is not None and readme is not None and bounds is not None and is_downsampled:
+        if st.checkbox(
+            "Zoom at full resolution",
+            value=False,
+            key=f"{key}_zoom",
+            help=readme["tooltips"]["zoom_full_resolution"],
+        ):
+            x_range = st.slider(
+                "Zoomed dates",
+                min_value=bounds[0].to_pydatetime(),
+                max_value=bounds[1].to_pydatetime(),
+                value=(bounds[0].to_pydatetime(), bounds[1].to_pydatetime()),
+                key=f"{key}_zoom_range",
+            )
+    webgl_threshold = config["plots"]["webgl_threshold"]
+    display_fig = get_derived_figure_data(
+        fig,
+        ("display", max_points, webgl_threshold, x_range),
+        lambda fig: downsample_figure(fig, max_points, webgl_threshold, x_range),
+    )
+    chart.plotly_chart(display_fig)
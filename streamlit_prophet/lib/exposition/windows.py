@@ -0,0 +1,215 @@
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from streamlit_prophet.lib.utils.cache import LRUCache, get_fingerprint
+
+
+class WindowAggregator:
+    """Cumulative sums of dataframe columns indexed by date, to aggregate them on any date window
+    with two binary searches instead of a scan of the whole dataframe.
+
+    Missing values are skipped, like pandas does when it computes sums and means. Windows
+    where a column only has zeros, like holidays out of their dates, sum exactly to zero
+    instead of the rounding error of a difference of cumulative sums.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe with a date column and the columns to aggregate.
+    columns : List
+        Numeric columns to aggregate.
+    date_col : str
+        Name of date column.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: List[Any], date_col: str = "ds"):
+        df = df.sort_values(date_col, kind="stable")
+        self.columns = list(columns)
+        self.stamps = pd.DatetimeIndex(df[date_col]).as_unit("ns").asi8
+        values = df[self.columns].to_numpy(dtype=float)
+        observed = ~np.isnan(values)
+        # A leading row of zeros makes the sum of rows i to j-1 equal to cumsum[j] - cumsum[i]
+        self.cumsum = np.zeros((len(df) + 1, len(self.columns)))
+        self.cumcount = np.zeros((len(df) + 1, len(self.columns)), dtype=np.int64)
+        self.cumnonzero = np.zeros((len(df) + 1, len(self.columns)), dtype=np.int64)
+        values = np.where(observed, values, 0.0)
+        np.cumsum(values, axis=0, out=self.cumsum[1:])
+        np.cumsum(observed, axis=0, out=self.cumcount[1:])
+        np.cumsum(values != 0, axis=0, out=self.cumnonzero[1:])
+
+    def bounds(
+        self, start: Optional[Any] = None, end: Optional[Any] = None, inclusive_end: bool = False
+    ) -> Tuple[int, int]:
+        """Returns the positions of the first row of a window and of the row following it.
+
+        Parameters
+        ----------
+        start : Any, optional
+            First date of the window, by default the first date of the dataframe.
+        end : Any, optional
+            End date of the window, by default the last date of the dataframe.
+        inclusive_end : bool
+            Whether or not the end date belongs to the window.
+
+        Returns
+        -------
+        int
+            Position of the first row of the window.
+        int
+            Position of the row following the last row of the window.
+        """
+        i = 0 if start is None else int(np.searchsorted(self.stamps, _to_stamp(start), "left"))
+        if end is None:
+            return i, len(self.stamps)
+        if inclusive_end:
+            j = int(np.searchsorted(self.stamps, _to_stamp(end), "right"))
+        else:
+            j = int(np.searchsorted(self.stamps, _to_stamp(end), "left"))
+        return i, max(i, j)
+
+    def sum(
+        self, start: Optional[Any] = None, end: Optional[Any] = None, inclusive_end: bool = False
+    ) -> pd.Series:
+        """Sums columns on a date window.
+
+        Parameters
+        ----------
+        start : Any, optional
+            First date of the window, by default the first date of the dataframe.
+        end : Any, optional
+            End date of the window, by default the last date of the dataframe.
+        inclusive_end : bool
+            Whether or not the end date belongs to the window.
+
+        Returns
+        -------
+        pd.Series
+            Sum of each column on the window.
+        """
+        i, j = self.bounds(start, end, inclusive_end)
+        return pd.Series(self._sum(i, j), index=self.columns)
+
+    def count(
+        self, start: Optional[Any] = None, end: Optional[Any] = None, inclusive_end: bool = False
+    ) -> pd.Series:
+        """Counts non-missing values of columns on a date window.
+
+        Parameters
+        ----------
+        start : Any, optional
+            First date of the window, by default the first date of the dataframe.
+        end : Any, optional
+            End date of the window, by default the last date of the dataframe.
+        inclusive_end : bool
+            Whether or not the end date belongs to the window.
+
+        Returns
+        -------
+        pd.Series
+            Number of non-missing values of each column on the window.
+        """
+        i, j = self.bounds(start, end, inclusive_end)
+        return pd.Series(self.cumcount[j] - self.cumcount[i], index=self.columns)
+
+    def mean(
+        self, start: Optional[Any] = None, end: Optional[Any] = None, inclusive_end: bool = False
+    ) -> pd.Series:
+        """Averages columns on a date window, NaN for columns without any value on the window.
+
+        Parameters
+        ----------
+        start : Any, optional
+            First date of the window, by default the first date of the dataframe.
+        end : Any, optional
+            End date of the window, by default the last date of the dataframe.
+        inclusive_end : bool
+            Whether or not the end date belongs to the window.
+
+        Returns
+        -------
+        pd.Series
+            Mean of each column on the window.
+        """
+        i, j = self.bounds(start, end, inclusive_end)
+        counts = self.cumcount[j] - self.cumcount[i]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, self._sum(i, j) / counts, np.nan)
+        return pd.Series(means, index=self.columns)
+
+    def _sum(self, i: int, j: int) -> np.ndarray:
+        """Sums columns between two positions.
+
+        Parameters
+        ----------
+        i : int
+            Position of the first row.
+        j : int
+            Position of the row following the last row.
+
+        Returns
+        -------
+        np.ndarray
+            Sum of each column.
+        """
+        nonzero = self.cumnonzero[j] - self.cumnonzero[i]
+        return np.where(nonzero > 0, self.cumsum[j] - self.cumsum[i], 0.0)
+
+
+# Aggregators of recently displayed components and histories, shared by all sessions
+WINDOWS_CACHE = LRUCache(maxsize=16)
+
+
+def get_window_aggregator(
+    df: pd.DataFrame,
+    columns: Optional[List[Any]] = None,
+    date_col: str = "ds",
+    fingerprint: Optional[str] = None,
+) -> WindowAggregator:
+    """Returns the window aggregator of a dataframe, building it only if it is not cached yet.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe with a date column and the columns to aggregate, it must not be modified.
+    columns : List, optional
+        Columns to aggregate, by default all numeric columns.
+    date_col : str
+        Name of date column.
+    fingerprint : str, optional
+        Fingerprint of the dataframe's values computed by the caller, by default computed once
+        per dataframe object.
+
+    Returns
+    -------
+    WindowAggregator
+        Aggregator of the dataframe's columns.
+    """
+    if columns is None:
+        columns = [
+            col for col in df.select_dtypes(include=["number", "bool"]).columns if col != date_col
+        ]
+    if fingerprint is None:
+        fingerprint = get_fingerprint(df)
+    key = (fingerprint, date_col, tuple(columns))
+    aggregator: Optional[WindowAggregator] = WINDOWS_CACHE.get(key)
+    if aggregator is None:
+        aggregator = WindowAggregator(df, columns, date_col)
+        WINDOWS_CACHE.put(key, aggregator)
+    return aggregator
+
+
+def _to_stamp(date: Any) -> int:
+    """Converts a date to nanoseconds since epoch.
+
+    Parameters
+    ----------
+    date : Any
+        Date, datetime or timestamp.
+
+    Returns
+    -------
+    int
+        Nanoseconds since epoch.
+    """
+    return int(pd.Timestamp(date).as_unit("ns").value)
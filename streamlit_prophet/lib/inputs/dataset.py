@@ -2,7 +2,7 @@ from typing import Any, Dict, Tuple
 
 import pandas as pd
 import streamlit as st
-from streamlit_prophet.lib.exposition.export import display_config_download_links
+from streamlit_prophet.lib.exposition.export import display_config_download_buttons
 from streamlit_prophet.lib.utils.load import load_custom_config, load_dataset
 
 
@@ -47,7 +47,7 @@ def input_dataset(
         "Upload my own config file", False, help=readme["tooltips"]["custom_config_choice"]
     ):
         with st.sidebar.expander("Configuration", expanded=True):
-            display_config_download_links(
+            display_config_download_buttons(
                 config,
                 "config.toml",
                 "Template",
@@ -18,13 +18,16 @@ def input_metrics(readme: Dict[Any, Any], config: Dict[Any, Any]) -> Dict[Any, A
     dict
         Dictionary containing evaluation metrics information.
     """
-    eval = dict()
+    eval: Dict[str, Any] = dict()
     eval["metrics"] = st.multiselect(
         "Select evaluation metrics",
         ["MAPE", "SMAPE", "MSE", "RMSE", "MAE"],
         default=config["metrics"]["default"]["selection"],
         help=readme["tooltips"]["metrics"],
     )
+    eval["bootstrap"] = st.checkbox(
+        "Compute confidence intervals", value=False, help=readme["tooltips"]["bootstrap"]
+    )
     return eval
 
 
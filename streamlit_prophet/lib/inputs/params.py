@@ -140,7 +140,7 @@ def input_prior_scale_params(config: Dict[Any, Any], readme: Dict[Any, Any]) ->
 def input_other_params(
     config: Dict[Any, Any], params: Dict[Any, Any], readme: Dict[Any, Any]
 ) -> Dict[Any, Any]:
-    """Lets the user enter other parameters (growth, changepoints_range, n_changepoints).
+    """Lets the user enter other parameters (growth, changepoints_range, n_changepoints, uncertainty).
 
     Parameters
     ----------
@@ -188,6 +188,19 @@ def input_other_params(
             "cap": cap,
             "floor": floor,
         }
+    uncertainty = st.selectbox(
+        "uncertainty intervals", default_params["uncertainty"], help=readme["tooltips"]["uncertainty"]
+    )
+    uncertainty_samples = default_params["uncertainty_samples"]
+    if uncertainty == "samples":
+        uncertainty_samples = st.number_input(
+            "uncertainty_samples",
+            value=default_params["uncertainty_samples"],
+            min_value=10,
+            step=100,
+            help=readme["tooltips"]["uncertainty_samples"],
+        )
+    params["uncertainty"] = {"method": uncertainty, "samples": int(uncertainty_samples)}
     return params
 
 
@@ -324,3 +337,44 @@ def _print_removed_regressors(nan_cols: List[Any]) -> None:
             f'The following column{"s" if L > 1 else ""} cannot be taken as regressor because '
             f'{"they contain" if L > 1 else "it contains"} null values: {", ".join(nan_cols)}'
         )
+
+
+def input_scenarios(
+    params: Dict[Any, Any], readme: Dict[Any, Any]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Lets the user define what-if scenarios on regressors.
+
+    Parameters
+    ----------
+    params : Dict
+        Model parameters, containing the selected regressors.
+    readme : Dict
+        Dictionary containing tooltips to guide user's choices.
+
+    Returns
+    -------
+    dict
+        Perturbations of each scenario, keyed by scenario name.
+    """
+    scenarios: Dict[str, List[Dict[str, Any]]] = dict()
+    n_scenarios = st.number_input(
+        "Number of scenarios",
+        value=0,
+        min_value=0,
+        max_value=5,
+        help=readme["tooltips"]["scenarios"],
+    )
+    for i in range(int(n_scenarios)):
+        name = st.text_input(f"Name of scenario {i + 1}", value=f"Scenario {i + 1}")
+        regressor = st.selectbox(
+            f"Regressor changed in scenario {i + 1}", sorted(params["regressors"].keys())
+        )
+        operation = st.selectbox(f"Change applied in scenario {i + 1}", ["multiply", "add", "set"])
+        value = st.number_input(
+            f"Value for scenario {i + 1}", value=1.2 if operation == "multiply" else 1.0
+        )
+        if name in scenarios or name == "Baseline":
+            st.error(f"Scenario name '{name}' is already used, please choose another one.")
+            st.stop()
+        scenarios[name] = [{"regressor": regressor, "operation": operation, "value": value}]
+    return scenarios
@@ -0,0 +1,332 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import copy
+from contextlib import ExitStack
+
+import pandas as pd
+from prophet import Prophet
+from prophet.diagnostics import single_cutoff_forecast
+from streamlit_prophet.lib.utils.cache import LRUCache, hash_dataframe
+from streamlit_prophet.lib.utils.executors import run_tasks
+from streamlit_prophet.lib.utils.jobs import report_progress
+from streamlit_prophet.lib.utils.shared_memory import (
+    SharedFrameHandle,
+    SharedObject,
+    attach_frame,
+    load_shared_object,
+    publish_frame,
+)
+
+# Forecasts of cross-validation folds, keyed by fold fingerprint
+CV_CACHE = LRUCache(maxsize=256)
+
+
+def cross_validation_cached(
+    model: Prophet, cutoffs: List[pd.Timestamp], horizon: str, config: Dict[Any, Any]
+) -> pd.DataFrame:
+    """Cross-validates a fitted model like prophet.diagnostics.cross_validation, each fold being
+    an independent task whose result is cached. Only folds missing from cache are fitted.
+
+    Parameters
+    ----------
+    model : Prophet
+        Prophet model fitted on training data, used to get training data and fitting options.
+    cutoffs : List[pd.Timestamp]
+        Cutoff dates of the folds.
+    horizon : str
+        Forecast horizon, at a format accepted by pd.Timedelta.
+    config : Dict
+        Lib configuration dictionary, containing the specifications of the executor running folds.
+
+    Returns
+    -------
+    pd.DataFrame
+        Cross-validation results, at the same format as prophet.diagnostics.cross_validation output.
+    """
+    return cross_validation_models([model], cutoffs, horizon, config)[0]
+
+
+def cross_validation_models(
+    models: List[Prophet], cutoffs: List[pd.Timestamp], horizon: str, config: Dict[Any, Any]
+) -> List[pd.DataFrame]:
+    """Cross-validates several models on the same cutoffs, folds of all models missing from cache
+    being run as a single batch of tasks.
+
+    Parameters
+    ----------
+    models : List[Prophet]
+        Prophet models fitted on training data, or at least preprocessed with it.
+    cutoffs : List[pd.Timestamp]
+        Cutoff dates of the folds.
+    horizon : str
+        Forecast horizon, at a format accepted by pd.Timedelta.
+    config : Dict
+        Lib configuration dictionary, containing the specifications of the executor running folds.
+
+    Returns
+    -------
+    list
+        Cross-validation results of each model,
+        at the same format as prophet.diagnostics.cross_validation output.
+    """
+    horizon_delta = pd.Timedelta(horizon)
+    models_keys, folds = [], dict()
+    for model in models:
+        df, predict_columns = _get_cv_inputs(model, cutoffs, horizon_delta)
+        keys = [
+            get_fold_key(df, model, cutoff, horizon_delta, predict_columns) for cutoff in cutoffs
+        ]
+        for key, cutoff in zip(keys, cutoffs):
+            if key not in CV_CACHE:
+                folds[key] = (df, model, cutoff, predict_columns)
+        models_keys.append(keys)
+    # Results are gathered before being cached, as caching many folds may evict some of them
+    results = {key: CV_CACHE.get(key) for keys in models_keys for key in keys if key not in folds}
+    if len(folds) > 0:
+        report_progress("Cross-validating", 0, len(folds))
+        fold_forecasts = _run_folds(
+            list(folds.values()),
+            horizon_delta,
+            config,
+            lambda n_done: report_progress("Cross-validating", n_done, len(folds)),
+        )
+        for key, fold_forecast in zip(folds.keys(), fold_forecasts):
+            CV_CACHE.put(key, fold_forecast)
+            results[key] = fold_forecast
+    return [
+        pd.concat([results[key] for key in keys], axis=0).reset_index(drop=True)
+        for keys in models_keys
+    ]
+
+
+def _get_cv_inputs(
+    model: Prophet, cutoffs: List[pd.Timestamp], horizon: pd.Timedelta
+) -> Tuple[pd.DataFrame, List[str]]:
+    """Checks that a model can be cross-validated on the given cutoffs, like Prophet does,
+    and returns the training dataframe and forecast columns of its folds.
+
+    Parameters
+    ----------
+    model : Prophet
+        Prophet model fitted on training data.
+    cutoffs : List[pd.Timestamp]
+        Cutoff dates of the folds.
+    horizon : pd.Timedelta
+        Forecast horizon.
+
+    Returns
+    -------
+    pd.DataFrame
+        Full training dataframe.
+    list
+        Forecast columns returned for each fold.
+    """
+    if model.history is None:
+        raise Exception(
+            "Model has not been fit. "
+            "Fitting the model provides contextual parameters for cross validation."
+        )
+    df = model.history.copy().reset_index(drop=True)
+    if min(cutoffs) <= df["ds"].min():
+        raise ValueError("Minimum cutoff value is not strictly greater than min date in history")
+    if max(cutoffs) > df["ds"].max() - horizon:
+        raise ValueError(
+            "Maximum cutoff value is greater than end date minus horizon, "
+            "no value for cross-validation remaining"
+        )
+    predict_columns = ["ds", "yhat"]
+    if model.uncertainty_samples:
+        predict_columns.extend(["yhat_lower", "yhat_upper"])
+    return df, predict_columns
+
+
+def get_fold_key(
+    df: pd.DataFrame,
+    model: Prophet,
+    cutoff: pd.Timestamp,
+    horizon: pd.Timedelta,
+    predict_columns: List[str],
+) -> str:
+    """Computes the fingerprint of a cross-validation fold,
+    i.e. of everything its forecast depends on.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Full training dataframe.
+    model : Prophet
+        Prophet model fitted on training data.
+    cutoff : pd.Timestamp
+        Cutoff date of the fold.
+    horizon : pd.Timedelta
+        Forecast horizon.
+    predict_columns : List[str]
+        Forecast columns returned for the fold.
+
+    Returns
+    -------
+    str
+        Fingerprint of the fold.
+    """
+    prefix = df.loc[df["ds"] <= cutoff + horizon]
+    return repr(
+        (
+            hash_dataframe(prefix, get_input_cols(model)),
+            str(cutoff),
+            str(horizon),
+            predict_columns,
+            get_model_signature(model),
+        )
+    )
+
+
+def get_input_cols(model: Prophet) -> List[str]:
+    """Lists the columns of a training dataframe that a model's fit depends on.
+
+    Parameters
+    ----------
+    model : Prophet
+        Prophet model.
+
+    Returns
+    -------
+    list
+        Names of the columns used by the model, some of which may be missing from dataframes.
+    """
+    input_cols = ["ds", "y", "cap", "floor"] + list(model.extra_regressors.keys())
+    input_cols += [
+        props["condition_name"]
+        for props in model.seasonalities.values()
+        if props["condition_name"] is not None
+    ]
+    return input_cols
+
+
+def get_model_signature(model: Prophet) -> str:
+    """Summarizes the specifications and fitting options that are copied
+    when a model is refitted on a fold.
+
+    Parameters
+    ----------
+    model : Prophet
+        Prophet model.
+
+    Returns
+    -------
+    str
+        Signature of the model.
+    """
+    # Regressors standardization statistics are recomputed on each fold
+    regressors = {
+        name: {k: v for k, v in props.items() if k not in ["mu", "std"]}
+        for name, props in model.extra_regressors.items()
+    }
+    holidays = None if model.holidays is None else hash_dataframe(model.holidays)
+    changepoints = list(model.changepoints) if model.specified_changepoints else None
+    return repr(
+        (
+            type(model).__name__,
+            model.growth,
+            model.n_changepoints,
+            model.changepoint_range,
+            changepoints,
+            holidays,
+            model.holidays_mode,
+            model.seasonality_mode,
+            model.seasonality_prior_scale,
+            model.changepoint_prior_scale,
+            model.holidays_prior_scale,
+            model.mcmc_samples,
+            model.interval_width,
+            model.uncertainty_samples,
+            dict(model.seasonalities),
+            regressors,
+            model.country_holidays,
+            sorted(model.fit_kwargs.items()),
+        )
+    )
+
+
+def _run_folds(
+    folds: List[Tuple[pd.DataFrame, Prophet, pd.Timestamp, List[str]]],
+    horizon: pd.Timedelta,
+    config: Dict[Any, Any],
+    on_fold_done: Optional[Callable[[int], None]] = None,
+) -> List[pd.DataFrame]:
+    """Fits and forecasts cross-validation folds with the executor described in config.
+
+    Parameters
+    ----------
+    folds : List[Tuple]
+        Training dataframe, fitted model, cutoff date and forecast columns of each fold.
+    horizon : pd.Timedelta
+        Forecast horizon.
+    config : Dict
+        Lib configuration dictionary, containing executor specifications.
+    on_fold_done : Callable, optional
+        Function called with the number of finished folds each time a fold finishes.
+
+    Returns
+    -------
+    list
+        Forecast of each fold.
+    """
+    if config["executor"]["mode"] != "processes" or len(folds) <= 1:
+        args = [(df, model, cutoff, horizon, columns) for df, model, cutoff, columns in folds]
+        return run_tasks(single_cutoff_forecast, args, config, on_fold_done)
+    # Histories are published once and attached without copy by workers,
+    # models are sent without them
+    with ExitStack() as stack:
+        shared: Dict[int, Tuple[SharedObject, SharedFrameHandle]] = dict()
+        for df, model, _, _ in folds:
+            if id(model) not in shared:
+                light_model = copy.copy(model)
+                light_model.history, light_model.history_dates = None, None
+                shared_model = stack.enter_context(SharedObject(light_model))
+                shared[id(model)] = (shared_model, stack.enter_context(publish_frame(df)))
+        shared_args: List[Tuple[Any, ...]] = []
+        for _, model, cutoff, columns in folds:
+            shared_model, history = shared[id(model)]
+            shared_args.append(
+                (shared_model.name, shared_model.size, history, cutoff, horizon, columns)
+            )
+        # Tasks are all finished when run_tasks returns, so shared blocks can be released after it
+        return run_tasks(_forecast_shared_fold, shared_args, config, on_fold_done)
+
+
+def _forecast_shared_fold(
+    name: str,
+    size: int,
+    history: SharedFrameHandle,
+    cutoff: pd.Timestamp,
+    horizon: pd.Timedelta,
+    predict_columns: List[str],
+) -> pd.DataFrame:
+    """Fits and forecasts a cross-validation fold in a worker process, from history published in
+    shared memory.
+
+    Parameters
+    ----------
+    name : str
+        Name of the shared memory block containing the model, without its history.
+    size : int
+        Size of the published model, in bytes.
+    history : SharedFrameHandle
+        Description of the training dataframe published in shared memory.
+    cutoff : pd.Timestamp
+        Cutoff date of the fold.
+    horizon : pd.Timedelta
+        Forecast horizon.
+    predict_columns : List[str]
+        Forecast columns returned for the fold.
+
+    Returns
+    -------
+    pd.DataFrame
+        Forecast of the fold.
+    """
+    model = load_shared_object(name, size)
+    df = attach_frame(history)
+    if model.history is None:
+        model.history = df
+    return single_cutoff_forecast(df, model, cutoff, horizon, predict_columns)
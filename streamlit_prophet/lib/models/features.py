@@ -0,0 +1,216 @@
+from typing import Any, Optional, Tuple
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from streamlit_prophet.lib.models.preparation import get_holidays_table
+
+
+class FourierCache:
+    """Fourier terms computed on recent date grids, reused for any contiguous range of these grids.
+
+    Histories of cross-validation folds and prediction dates on past periods are ranges
+    of the training dates, so their terms are read from the training grid instead of being
+    recomputed.
+    Safe to share between threads.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of grids kept in the cache, for all periods and orders.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        # Keys are the period, order, first date, last date and number of dates of each grid
+        self.entries: "OrderedDict[Tuple[Any, ...], Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, stamps: np.ndarray, period: float, series_order: int) -> Optional[np.ndarray]:
+        """Returns the Fourier terms of sorted dates if they are a range of a cached grid.
+
+        Parameters
+        ----------
+        stamps : np.ndarray
+            Strictly increasing dates, as nanoseconds since epoch.
+        period : float
+            Number of days of the period.
+        series_order : int
+            Number of components.
+
+        Returns
+        -------
+        np.ndarray, optional
+            Copy of the cached terms of these dates, None if they are not cached.
+        """
+        with self._lock:
+            for key, (grid, features) in reversed(self.entries.items()):
+                if key[:2] != (period, series_order):
+                    continue
+                start = int(np.searchsorted(grid, stamps[0]))
+                end = start + len(stamps)
+                if end <= len(grid) and np.array_equal(grid[start:end], stamps):
+                    self.hits += 1
+                    self.entries.move_to_end(key)
+                    cached: np.ndarray = features[start:end].copy()
+                    return cached
+            self.misses += 1
+            return None
+
+    def put(
+        self, stamps: np.ndarray, period: float, series_order: int, features: np.ndarray
+    ) -> None:
+        """Caches the Fourier terms of a date grid, evicting least recently used grids if the cache
+        is full.
+
+        Parameters
+        ----------
+        stamps : np.ndarray
+            Strictly increasing dates, as nanoseconds since epoch.
+        period : float
+            Number of days of the period.
+        series_order : int
+            Number of components.
+        features : np.ndarray
+            Fourier terms of these dates.
+        """
+        key = (period, series_order, stamps[0], stamps[-1], len(stamps))
+        with self._lock:
+            self.entries[key] = (stamps.copy(), features.copy())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all grids and resets statistics."""
+        with self._lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of requests served from cache."""
+        requests = self.hits + self.misses
+        return self.hits / requests if requests > 0 else 0.0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by cached grids and terms, in bytes."""
+        return sum(grid.nbytes + features.nbytes for grid, features in self.entries.values())
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+# Fourier terms of recent date grids, shared by all models and sessions
+FOURIER_CACHE = FourierCache(maxsize=32)
+
+
+class CachedFeaturesProphet(Prophet):
+    """Prophet model whose seasonality features and country holidays are read from caches shared
+    by all models.
+
+    Models are otherwise identical to Prophet's, features taken from cache being bit-identical
+    to the ones Prophet computes.
+    """
+
+    def construct_holiday_dataframe(self, dates: pd.Series) -> pd.DataFrame:
+        """Constructs the dataframe of holiday dates like Prophet, country holidays of the years
+        of the dates being read from the tables shared by all models instead of being rebuilt.
+
+        Parameters
+        ----------
+        dates : pd.Series
+            Timestamps used for computing seasonality.
+
+        Returns
+        -------
+        pd.DataFrame
+            Holidays dataframe, at the format of Prophet's holidays argument.
+        """
+        years = sorted({x.year for x in dates})
+        # Tables cover year ranges, other year lists are left to Prophet
+        if (
+            self.country_holidays is None
+            or not years
+            or years != list(range(years[0], years[-1] + 1))
+        ):
+            holidays_df: pd.DataFrame = super().construct_holiday_dataframe(dates)
+            return holidays_df
+        table = get_holidays_table(self.country_holidays, years[0], years[-1], True, False)
+        all_holidays = table[["ds", "holiday"]]
+        if self.holidays is not None:
+            all_holidays = pd.concat((self.holidays, all_holidays), sort=False)
+        all_holidays = all_holidays.reset_index(drop=True)
+        # Drop future holidays not previously seen in training data
+        if self.train_holiday_names is not None:
+            all_holidays = all_holidays.loc[all_holidays["holiday"].isin(self.train_holiday_names)]
+            # Add holiday names in fit but not in predict with ds as NA
+            holidays_to_add = pd.DataFrame(
+                {
+                    "holiday": self.train_holiday_names[
+                        ~self.train_holiday_names.isin(all_holidays["holiday"])
+                    ]
+                }
+            )
+            all_holidays = pd.concat((all_holidays, holidays_to_add), sort=False)
+            all_holidays = all_holidays.reset_index(drop=True)
+        return all_holidays
+
+    @staticmethod
+    def fourier_series(dates: pd.Series, period: Any, series_order: int) -> np.ndarray:
+        """Provides Fourier series components with the specified frequency and order.
+
+        Parameters
+        ----------
+        dates : pd.Series
+            Timestamps.
+        period : float
+            Number of days of the period.
+        series_order : int
+            Number of components.
+
+        Returns
+        -------
+        np.ndarray
+            Matrix with seasonality features.
+        """
+        return get_fourier_series(dates, period, series_order)
+
+
+def get_fourier_series(dates: pd.Series, period: Any, series_order: int) -> np.ndarray:
+    """Computes Fourier terms like Prophet.fourier_series, or reads them from cache.
+    Only strictly increasing dates, which is the case of all fits and predictions, are cached.
+
+    Parameters
+    ----------
+    dates : pd.Series
+        Timestamps.
+    period : float
+        Number of days of the period.
+    series_order : int
+        Number of components.
+
+    Returns
+    -------
+    np.ndarray
+        Matrix with seasonality features.
+    """
+    if len(dates) == 0:
+        empty: np.ndarray = Prophet.fourier_series(dates, period, series_order)
+        return empty
+    stamps = pd.DatetimeIndex(dates).as_unit("ns").asi8
+    if not np.all(np.diff(stamps) > 0):
+        unsorted: np.ndarray = Prophet.fourier_series(dates, period, series_order)
+        return unsorted
+    features = FOURIER_CACHE.get(stamps, period, series_order)
+    if features is None:
+        features = Prophet.fourier_series(dates, period, series_order)
+        FOURIER_CACHE.put(stamps, period, series_order, features)
+    return features
@@ -0,0 +1,336 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from streamlit_prophet.lib.models.uncertainty import (
+    AnalyticUncertaintyProphet,
+    get_analytic_intervals,
+)
+from streamlit_prophet.lib.utils.cache import LRUCache, hash_dataframe
+
+# Feature matrices of recent predictions, keyed by model features signature and input dates
+FEATURES_CACHE = LRUCache(maxsize=16)
+
+
+def get_prediction_features(model: Prophet, df: pd.DataFrame) -> Dict[str, Any]:
+    """Builds, or gets from cache, everything a fitted model needs to predict on a dataframe
+    except its parameters: scaled time index, seasonality/holiday/regressor features and
+    the matrix mapping features to components.
+
+    Parameters
+    ----------
+    model : Prophet
+        Fitted Prophet model.
+    df : pd.DataFrame
+        Dataframe with dates for predictions (column ds), and the other columns required by the model.
+
+    Returns
+    -------
+    dict
+        Prediction dataframe, seasonal features (as dataframe and numpy array) and component columns.
+        Cached objects are shared, they must not be modified.
+    """
+    input_cols = ["ds", "cap", "floor"] + list(model.extra_regressors.keys())
+    input_cols += [
+        props["condition_name"]
+        for props in model.seasonalities.values()
+        if props["condition_name"] is not None
+    ]
+    key = (_get_features_signature(model), hash_dataframe(df, input_cols))
+    features: Optional[Dict[str, Any]] = FEATURES_CACHE.get(key)
+    if features is None:
+        df_setup = model.setup_dataframe(df.copy())
+        seasonal_features, _, component_cols, _ = model.make_all_seasonality_features(df_setup)
+        features = {
+            "df": df_setup,
+            "seasonal_features": seasonal_features,
+            "X": seasonal_features.values,
+            "component_cols": component_cols,
+        }
+        FEATURES_CACHE.put(key, features)
+    return features
+
+
+def predict_arrays(model: Prophet, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Makes a point prediction of a fitted model, returning yhat and all components as numpy arrays.
+
+    Results are identical to the point forecasts returned by Prophet.predict, rows being sorted by date.
+
+    Parameters
+    ----------
+    model : Prophet
+        Fitted Prophet model.
+    df : pd.DataFrame
+        Dataframe with dates for predictions (column ds), and the other columns required by the model.
+
+    Returns
+    -------
+    dict
+        Arrays of dates, trend, components and yhat.
+    """
+    return predict_models([model], df)[0]
+
+
+def predict_models(models: List[Prophet], df: pd.DataFrame) -> List[Dict[str, np.ndarray]]:
+    """Makes point predictions of many fitted models on the same dates.
+
+    Models built with the same features (seasonalities, holidays, regressors and scaling) share
+    their feature matrix, which is only built once.
+
+    Parameters
+    ----------
+    models : List[Prophet]
+        Fitted Prophet models.
+    df : pd.DataFrame
+        Dataframe with dates for predictions (column ds), and the other columns required by the models.
+
+    Returns
+    -------
+    list
+        For each model, arrays of dates, trend, components and yhat.
+    """
+    predictions = []
+    for model in models:
+        if model.history is None:
+            raise Exception("Model has not been fit.")
+        features = get_prediction_features(model, df)
+        predictions.append(_predict_point(model, features, _predict_components(model, features)))
+    return predictions
+
+
+def predict_date_ranges(model: Prophet, dfs: List[pd.DataFrame]) -> List[Dict[str, np.ndarray]]:
+    """Makes point predictions of a fitted model on many date ranges at once.
+
+    Parameters
+    ----------
+    model : Prophet
+        Fitted Prophet model.
+    dfs : List[pd.DataFrame]
+        Dataframes with dates for predictions (column ds), and the other columns required by the model.
+
+    Returns
+    -------
+    list
+        For each date range, arrays of dates, trend, components and yhat, rows being sorted by date.
+        Fourier terms being computed once on all dates, results may differ from Prophet.predict
+        by a few units in the last place.
+    """
+    if model.history is None:
+        raise Exception("Model has not been fit.")
+    df = pd.concat(dfs, axis=0, ignore_index=True)
+    features = get_prediction_features(model, df)
+    # Positions of each input row in the prediction features, sorted by date like in Prophet.predict
+    order = np.argsort(pd.to_datetime(df["ds"]).values, kind="mergesort")
+    positions = np.empty(len(order), dtype=int)
+    positions[order] = np.arange(len(order))
+    bounds = np.cumsum([0] + [len(x) for x in dfs])
+    outputs = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        rows = np.sort(positions[start:end])
+        range_features = {
+            "df": features["df"].iloc[rows].reset_index(drop=True),
+            "X": features["X"][rows],
+            "component_cols": features["component_cols"],
+        }
+        components = _predict_components(model, range_features)
+        outputs.append(_predict_point(model, range_features, components))
+    return outputs
+
+
+def predict_forecast_df(model: Prophet, df: pd.DataFrame, vectorized: bool = True) -> pd.DataFrame:
+    """Drop-in replacement for Prophet.predict, relying on cached feature matrices.
+
+    Parameters
+    ----------
+    model : Prophet
+        Fitted Prophet model.
+    df : pd.DataFrame
+        Dataframe with dates for predictions (column ds), and the other columns required by the model.
+    vectorized : bool
+        Whether to use Prophet's vectorized method to simulate uncertainty intervals.
+
+    Returns
+    -------
+    pd.DataFrame
+        Forecast, at the same format as the output of Prophet.predict.
+    """
+    if model.history is None:
+        raise Exception("Model has not been fit.")
+    if df.shape[0] == 0:
+        raise ValueError("Dataframe has no rows.")
+    features = get_prediction_features(model, df)
+    components = _predict_components(model, features)
+    predictions = _predict_point(model, features, components)
+    cols = ["ds", "trend"]
+    if "cap" in features["df"]:
+        cols.append("cap")
+    if model.logistic_floor:
+        cols.append("floor")
+    forecast = features["df"][[col for col in cols if col != "trend"]].copy()
+    forecast.insert(1, "trend", predictions["trend"])
+    if model.uncertainty_samples:
+        intervals = _predict_intervals(model, features, vectorized)
+        for col, values in intervals.items():
+            forecast[col] = values
+    lower_p = 100 * (1.0 - model.interval_width) / 2
+    upper_p = 100 * (1.0 + model.interval_width) / 2
+    for component, comp in components.items():
+        forecast[component] = predictions[component]
+        if model.uncertainty_samples:
+            forecast[f"{component}_lower"] = model.percentile(comp, lower_p, axis=1)
+            forecast[f"{component}_upper"] = model.percentile(comp, upper_p, axis=1)
+    forecast["yhat"] = predictions["yhat"]
+    return forecast
+
+
+def _predict_components(model: Prophet, features: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Computes components of a model for every parameters sample, like Prophet.predict_seasonal_components.
+
+    Parameters
+    ----------
+    model : Prophet
+        Fitted Prophet model.
+    features : Dict
+        Prediction features, as returned by get_prediction_features.
+
+    Returns
+    -------
+    dict
+        Arrays of shape (n_dates, n_samples) for each component.
+    """
+    components = dict()
+    for component in features["component_cols"].columns:
+        beta_c = model.params["beta"] * features["component_cols"][component].values
+        comp = np.matmul(features["X"], beta_c.transpose())
+        if component in model.component_modes["additive"]:
+            comp *= model.y_scale
+        components[component] = comp
+    return components
+
+
+def _predict_point(
+    model: Prophet, features: Dict[str, Any], components: Dict[str, np.ndarray]
+) -> Dict[str, np.ndarray]:
+    """Computes point forecasts of trend, components and yhat, the same way as Prophet.predict.
+
+    Parameters
+    ----------
+    model : Prophet
+        Fitted Prophet model.
+    features : Dict
+        Prediction features, as returned by get_prediction_features.
+    components : Dict
+        Components for every parameters sample, as returned by _predict_components.
+
+    Returns
+    -------
+    dict
+        Arrays of dates, trend, components and yhat.
+    """
+    predictions = {
+        "ds": features["df"]["ds"].values,
+        "trend": np.asarray(model.predict_trend(features["df"]), dtype=float),
+    }
+    for component, comp in components.items():
+        predictions[component] = np.nanmean(comp, axis=1)
+    predictions["yhat"] = (
+        predictions["trend"] * (1 + predictions["multiplicative_terms"])
+        + predictions["additive_terms"]
+    )
+    return predictions
+
+
+def _predict_intervals(
+    model: Prophet, features: Dict[str, Any], vectorized: bool
+) -> Dict[str, np.ndarray]:
+    """Computes uncertainty intervals for yhat and trend, like Prophet.predict_uncertainty,
+    without rebuilding the feature matrix.
+
+    Parameters
+    ----------
+    model : Prophet
+        Fitted Prophet model.
+    features : Dict
+        Prediction features, as returned by get_prediction_features.
+    vectorized : bool
+        Whether to use Prophet's vectorized method to simulate future trends.
+
+    Returns
+    -------
+    dict
+        Lower and upper bounds of yhat and trend.
+    """
+    df, seasonal_features = features["df"], features["seasonal_features"]
+    if isinstance(model, AnalyticUncertaintyProphet) and model.growth != "logistic":
+        return get_analytic_intervals(model, df, seasonal_features, features["component_cols"])
+    s_a = features["component_cols"]["additive_terms"]
+    s_m = features["component_cols"]["multiplicative_terms"]
+    n_iterations = model.params["k"].shape[0]
+    samp_per_iter = max(1, int(np.ceil(model.uncertainty_samples / float(n_iterations))))
+    sim_values: Dict[str, List[np.ndarray]] = {"yhat": [], "trend": []}
+    for i in range(n_iterations):
+        if vectorized:
+            sims = model.sample_model_vectorized(
+                df=df,
+                seasonal_features=seasonal_features,
+                iteration=i,
+                s_a=s_a,
+                s_m=s_m,
+                n_samples=samp_per_iter,
+            )
+        else:
+            sims = [
+                model.sample_model(
+                    df=df, seasonal_features=seasonal_features, iteration=i, s_a=s_a, s_m=s_m
+                )
+                for _ in range(samp_per_iter)
+            ]
+        for key in sim_values:
+            for sim in sims:
+                sim_values[key].append(sim[key])
+    lower_p = 100 * (1.0 - model.interval_width) / 2
+    upper_p = 100 * (1.0 + model.interval_width) / 2
+    intervals = dict()
+    for key, values in sim_values.items():
+        samples = np.column_stack(values)
+        intervals[f"{key}_lower"] = model.percentile(samples, lower_p, axis=1)
+        intervals[f"{key}_upper"] = model.percentile(samples, upper_p, axis=1)
+    return intervals
+
+
+def _get_features_signature(model: Prophet) -> str:
+    """Summarizes everything, apart from fitted parameters, that a model's predictions depend on.
+
+    Parameters
+    ----------
+    model : Prophet
+        Fitted Prophet model.
+
+    Returns
+    -------
+    str
+        Signature of the model's features and scaling.
+    """
+    holidays = None if model.holidays is None else hash_dataframe(model.holidays)
+    train_holiday_names = (
+        None if model.train_holiday_names is None else list(model.train_holiday_names)
+    )
+    return repr(
+        (
+            model.growth,
+            model.scaling,
+            model.logistic_floor,
+            model.start,
+            model.t_scale,
+            model.y_scale,
+            model.y_min,
+            dict(model.seasonalities),
+            dict(model.extra_regressors),
+            holidays,
+            model.country_holidays,
+            model.holidays_mode,
+            train_holiday_names,
+            model.component_modes,
+        )
+    )
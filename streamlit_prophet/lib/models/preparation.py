@@ -2,12 +2,21 @@ from typing import Any, Dict
 
 import pandas as pd
 from prophet import Prophet
+from prophet.make_holidays import make_holidays_df
+from streamlit_prophet.lib.utils.cache import LRUCache
 from streamlit_prophet.lib.utils.mapping import (
     SCHOOL_HOLIDAYS_FUNC_MAPPING,
     convert_into_nb_of_days,
     convert_into_nb_of_seconds,
 )
 
+# Prophet-ready holidays tables, keyed by country, year range and holiday types
+HOLIDAYS_CACHE = LRUCache(maxsize=32)
+
+# Number of years after the data covered by school holidays, which Prophet can't extend
+# to the forecast dates
+SCHOOL_HOLIDAYS_YEARS_MARGIN = 10
+
 
 def get_prophet_cv_horizon(dates: Dict[Any, Any], resampling: Dict[Any, Any]) -> str:
     """Returns cross-validation horizon at the right format for Prophet cross_validation function.
@@ -54,23 +63,63 @@ def add_prophet_holidays(
     """
     country = holidays_params["country"]
     if holidays_params["public_holidays"]:
+        # Prophet lists them for the years of each fit and prediction,
+        # read from shared tables by CachedFeaturesProphet
         model.add_country_holidays(country)
-
-    holidays_df_list = []
     if holidays_params["school_holidays"]:
-        all_dates = {
-            k: v
-            for k, v in dates.items()
-            if k not in ["n_folds", "folds_horizon", "forecast_horizon", "cutoffs", "forecast_freq"]
-        }
-        years = list(range(min(all_dates.values()).year, max(all_dates.values()).year + 1))
-        get_holidays_func = SCHOOL_HOLIDAYS_FUNC_MAPPING[country]
-        holidays_df = get_holidays_func(years)
-        holidays_df[["lower_window", "upper_window"]] = 0
-        holidays_df_list.append(holidays_df)
-
-    if len(holidays_df_list) == 0:
-        return model
-    holidays_df = pd.concat(holidays_df_list, sort=True)
-    model.holidays = holidays_df
+        # Years are those of the data, so that the fit doesn't depend on the forecast horizon
+        data_dates = [
+            v for k, v in dates.items() if k.endswith("_date") and not k.startswith("forecast_")
+        ]
+        holidays_df = get_holidays_table(
+            country,
+            min(data_dates).year,
+            max(data_dates).year + SCHOOL_HOLIDAYS_YEARS_MARGIN,
+            False,
+            True,
+        )
+        if len(holidays_df) > 0:
+            # Each model gets its own copy of the table, as Prophet may convert its columns in place
+            model.holidays = holidays_df.copy()
     return model
+
+
+def get_holidays_table(
+    country: str, start_year: int, end_year: int, public_holidays: bool, school_holidays: bool
+) -> pd.DataFrame:
+    """Returns the table of holidays of a country, at the format of Prophet's holidays argument.
+    Tables are computed once per process and shared by all models and sessions.
+
+    Public holidays are the ones Prophet adds with add_country_holidays.
+
+    Parameters
+    ----------
+    country : str
+        Country code.
+    start_year : int
+        First year of the table.
+    end_year : int
+        Last year of the table.
+    public_holidays : bool
+        Whether or not to include public holidays.
+    school_holidays : bool
+        Whether or not to include school holidays, if available for this country.
+
+    Returns
+    -------
+    pd.DataFrame
+        Holidays dataframe with columns 'ds', 'holiday', 'lower_window' and 'upper_window'.
+    """
+    key = (country, start_year, end_year, public_holidays, school_holidays)
+    holidays_df = HOLIDAYS_CACHE.get(key)
+    if holidays_df is None:
+        years = list(range(start_year, end_year + 1))
+        holidays_df_list = []
+        if public_holidays:
+            holidays_df_list.append(make_holidays_df(year_list=years, country=country))
+        if school_holidays:
+            holidays_df_list.append(SCHOOL_HOLIDAYS_FUNC_MAPPING[country](years))
+        holidays_df = pd.concat(holidays_df_list, sort=True).reset_index(drop=True)
+        holidays_df[["lower_window", "upper_window"]] = 0
+        HOLIDAYS_CACHE.put(key, holidays_df)
+    return holidays_df
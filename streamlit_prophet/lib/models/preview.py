@@ -0,0 +1,332 @@
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from streamlit_prophet.lib.dataprep.clean import exp_transform
+from streamlit_prophet.lib.dataprep.format import check_future_regressors_df
+from streamlit_prophet.lib.dataprep.split import make_future_df
+from streamlit_prophet.lib.evaluation.metrics import MAPE, RMSE
+from streamlit_prophet.lib.models.predict import predict_forecast_df
+from streamlit_prophet.lib.models.prophet import instantiate_prophet_model
+from streamlit_prophet.lib.utils.cache import LRUCache, hash_object
+from streamlit_prophet.lib.utils.logging import capture_fit_logs
+
+# Standard deviations of Prophet's priors on the trend base rate (k) and offset (m)
+TREND_PRIOR_SCALE = 5.0
+
+# Preview models and forecasts, keyed by fingerprint of their inputs, so that reruns reuse them
+PREVIEWS_CACHE = LRUCache(maxsize=8)
+
+
+def fit_preview_model(
+    params: Dict[Any, Any],
+    df: pd.DataFrame,
+    dates: Dict[Any, Any],
+    config: Dict[Any, Any],
+    use_regressors: bool = True,
+) -> Prophet:
+    """Fits an approximate Prophet model with regularized least squares instead of Stan.
+
+    The design matrix is built by Prophet itself (changepoints, Fourier seasonalities, holidays
+    and regressors), and parameters priors are turned into ridge penalties. The returned model
+    can be used like a Prophet model fitted with Stan (predict, plot_plotly, components).
+
+    Parameters
+    ----------
+    params : Dict
+        Model parameters.
+    df : pd.DataFrame
+        Training dataframe.
+    dates : Dict
+        Dictionary containing all relevant dates for training and forecasting.
+    config : Dict
+        Lib configuration dictionary, containing preview specifications.
+    use_regressors : bool
+        Whether or not to add regressors to the model.
+
+    Returns
+    -------
+    Prophet
+        Prophet model whose parameters have been estimated by regularized least squares.
+    """
+    preview_params = {**params, "other": {**params["other"]}}
+    if preview_params["other"]["growth"] == "logistic":
+        # Logistic trend is not linear in its parameters, it is approximated by a linear trend
+        preview_params["other"]["growth"] = "linear"
+    model = instantiate_prophet_model(preview_params, use_regressors=use_regressors, dates=dates)
+    model.uncertainty_samples = 0
+    model_inputs = model.preprocess(df)
+    model.params = _solve_preview_params(model, model_inputs, config["preview"]["n_iterations"])
+    return model
+
+
+def _solve_preview_params(model: Prophet, model_inputs: Any, n_iterations: int) -> Dict[str, Any]:
+    """Estimates Prophet parameters (k, m, delta, beta, sigma_obs) with regularized least squares.
+
+    Parameters
+    ----------
+    model : Prophet
+        Prophet model whose history has been preprocessed.
+    model_inputs : ModelInputData
+        Inputs that would have been sent to Stan.
+    n_iterations : int
+        Number of passes used to refine noise level and multiplicative terms.
+
+    Returns
+    -------
+    dict
+        Parameters, at the same format as the ones returned by Prophet's Stan backend.
+    """
+    t = np.asarray(model_inputs.t, dtype=float)
+    y = np.asarray(model_inputs.y, dtype=float)
+    X = np.asarray(model_inputs.X, dtype=float).reshape(len(t), -1)
+    s_a = np.asarray(model_inputs.s_a, dtype=float)
+    s_m = np.asarray(model_inputs.s_m, dtype=float)
+    sigmas = np.asarray(model_inputs.sigmas, dtype=float)
+    use_changepoints = len(model.changepoints) > 0 and model.growth == "linear"
+    changepoints_t = np.asarray(model.changepoints_t, dtype=float)
+    # Trend columns: base rate, offset and one hinge function per changepoint
+    if model.growth == "flat":
+        trend_cols = np.ones((len(t), 1))
+        trend_scales = np.array([TREND_PRIOR_SCALE])
+    else:
+        trend_cols = np.column_stack([t, np.ones(len(t))])
+        trend_scales = np.array([TREND_PRIOR_SCALE, TREND_PRIOR_SCALE])
+    if use_changepoints:
+        hinges = np.maximum(t[:, None] - changepoints_t[None, :], 0)
+        trend_cols = np.column_stack([trend_cols, hinges])
+        # Laplace prior on deltas is replaced by a gaussian prior with the same variance
+        trend_scales = np.concatenate(
+            [trend_scales, np.full(len(changepoints_t), np.sqrt(2) * model_inputs.tau)]
+        )
+    n_trend = trend_cols.shape[1]
+    prior_scales = np.concatenate([trend_scales, np.maximum(sigmas, 1e-8)])
+    # Multiplicative terms are linearized around the current trend estimate
+    if model.growth == "flat":
+        k, m = model.flat_growth_init(model.history)
+    else:
+        k, m = model.linear_growth_init(model.history)
+    trend = k * t + m
+    sigma_obs = max(np.std(y), 1e-3)
+    for _ in range(max(n_iterations, 1)):
+        design = np.column_stack([trend_cols, X * s_a + X * s_m * trend[:, None]])
+        penalty = (sigma_obs / prior_scales) ** 2
+        coefs = np.linalg.solve(design.T @ design + np.diag(penalty), design.T @ y)
+        trend = trend_cols @ coefs[:n_trend]
+        sigma_obs = max(float(np.std(y - design @ coefs)), 1e-3)
+    if model.growth == "flat":
+        k, m = 0.0, coefs[0]
+    else:
+        k, m = coefs[0], coefs[1]
+    deltas = coefs[2:n_trend] if use_changepoints else np.zeros(len(changepoints_t))
+    if len(model.changepoints) == 0:
+        deltas = np.zeros(1)
+    return {
+        "k": np.array([[k]]),
+        "m": np.array([[m]]),
+        "delta": deltas.reshape((1, -1)),
+        "beta": coefs[n_trend:].reshape((1, -1)),
+        "sigma_obs": np.array([[sigma_obs]]),
+    }
+
+
+def get_preview_forecast(
+    params: Dict[Any, Any],
+    dates: Dict[Any, Any],
+    datasets: Dict[Any, Any],
+    df: pd.DataFrame,
+    evaluate: bool,
+    cleaning: Dict[Any, Any],
+    config: Dict[Any, Any],
+    resampling: Dict[Any, Any],
+    date_col: str,
+    target_col: str,
+    dimensions: Dict[Any, Any],
+    load_options: Dict[Any, Any],
+) -> Tuple[Prophet, pd.DataFrame]:
+    """Fits a preview model and makes an approximate prediction on the data that will be displayed,
+    or gets them from cache if they were already computed on the same inputs.
+
+    With evaluation, the preview is fitted on training data and predicts the evaluation period.
+    Otherwise, it is fitted on the whole dataset and predicts history and future dates.
+
+    Parameters
+    ----------
+    params : Dict
+        Model parameters.
+    dates : Dict
+        Dictionary containing all relevant dates for training and forecasting.
+    datasets : Dict
+        Dictionary containing all relevant dataframes for training and forecasting.
+    df : pd.DataFrame
+        Full input dataframe, after cleaning, filtering and resampling.
+    evaluate : bool
+        Whether or not a model evaluation is done.
+    cleaning : Dict
+        Dataset cleaning specifications.
+    config : Dict
+        Lib configuration dictionary, containing preview specifications.
+    resampling : Dict
+        Dataset resampling specifications.
+    date_col : str
+        Name of date column.
+    target_col : str
+        Name of target column.
+    dimensions : Dict
+        Dictionary containing dimensions information.
+    load_options : Dict
+        Loading options selected by user.
+
+    Returns
+    -------
+    Prophet
+        Preview model, shared between reruns: it must not be modified.
+    pd.DataFrame
+        Approximate forecast, shared between reruns: it must not be modified.
+    """
+    args = (
+        params,
+        dates,
+        datasets,
+        df,
+        evaluate,
+        cleaning,
+        config,
+        resampling,
+        date_col,
+        target_col,
+        dimensions,
+        load_options,
+    )
+    key = hash_object(args)
+    preview: Optional[Tuple[Prophet, pd.DataFrame]] = PREVIEWS_CACHE.get(key)
+    if preview is None:
+        preview = _make_preview_forecast(*args)
+        PREVIEWS_CACHE.put(key, preview)
+    return preview
+
+
+def _make_preview_forecast(
+    params: Dict[Any, Any],
+    dates: Dict[Any, Any],
+    datasets: Dict[Any, Any],
+    df: pd.DataFrame,
+    evaluate: bool,
+    cleaning: Dict[Any, Any],
+    config: Dict[Any, Any],
+    resampling: Dict[Any, Any],
+    date_col: str,
+    target_col: str,
+    dimensions: Dict[Any, Any],
+    load_options: Dict[Any, Any],
+) -> Tuple[Prophet, pd.DataFrame]:
+    """Fits a preview model and makes an approximate prediction on the data that will be displayed.
+
+    Parameters
+    ----------
+    params : Dict
+        Model parameters.
+    dates : Dict
+        Dictionary containing all relevant dates for training and forecasting.
+    datasets : Dict
+        Dictionary containing all relevant dataframes for training and forecasting.
+    df : pd.DataFrame
+        Full input dataframe, after cleaning, filtering and resampling.
+    evaluate : bool
+        Whether or not a model evaluation is done.
+    cleaning : Dict
+        Dataset cleaning specifications.
+    config : Dict
+        Lib configuration dictionary, containing preview specifications.
+    resampling : Dict
+        Dataset resampling specifications.
+    date_col : str
+        Name of date column.
+    target_col : str
+        Name of target column.
+    dimensions : Dict
+        Dictionary containing dimensions information.
+    load_options : Dict
+        Loading options selected by user.
+
+    Returns
+    -------
+    Prophet
+        Preview model.
+    pd.DataFrame
+        Approximate forecast.
+    """
+    use_regressors = True
+    if evaluate:
+        train = datasets["train"]
+        predict_df = pd.concat([train, datasets["val"]]) if "val" in datasets else train
+    else:
+        use_regressors = check_future_regressors_df(
+            datasets, dates, params, resampling, date_col, dimensions
+        )
+        # Future dataframes are built on copies, the session's datasets are left unchanged
+        future_datasets = {key: value.copy() for key, value in datasets.items()}
+        future_datasets = make_future_df(
+            dates,
+            df,
+            future_datasets,
+            cleaning,
+            date_col,
+            target_col,
+            dimensions,
+            load_options,
+            config,
+            resampling,
+            params,
+        )
+        train, predict_df = future_datasets["full"], future_datasets["future"]
+    with capture_fit_logs("preview"):
+        model = fit_preview_model(params, train, dates, config, use_regressors)
+        predict_df = predict_df.drop("y", axis=1, errors="ignore")
+        forecasts = {"preview": predict_forecast_df(model, predict_df)}
+    if cleaning["log_transform"]:
+        _, forecasts = exp_transform(dict(), forecasts)
+    return model, forecasts["preview"]
+
+
+def get_preview_accuracy_report(
+    preview_forecast: pd.DataFrame, forecast: pd.DataFrame, truth: pd.DataFrame
+) -> pd.DataFrame:
+    """Compares the preview forecast with the forecast of the model fitted with Stan.
+
+    Parameters
+    ----------
+    preview_forecast : pd.DataFrame
+        Forecast made by the preview model.
+    forecast : pd.DataFrame
+        Forecast made by the model fitted with Stan.
+    truth : pd.DataFrame
+        Dataframe containing ground truth, with columns ds and y.
+
+    Returns
+    -------
+    pd.DataFrame
+        Accuracy report comparing both forecasts.
+    """
+    df = (
+        preview_forecast[["ds", "yhat"]]
+        .merge(forecast[["ds", "yhat"]], on="ds", suffixes=("_preview", "_stan"))
+        .merge(truth[["ds", "y"]], on="ds", how="left")
+    )
+    report = {
+        "Distance to Stan forecast": {
+            "MAPE": MAPE(df["yhat_stan"], df["yhat_preview"]),
+            "RMSE": RMSE(df["yhat_stan"], df["yhat_preview"]),
+            "Correlation": float(np.corrcoef(df["yhat_stan"], df["yhat_preview"])[0, 1]),
+        },
+        "Preview model vs truth": {
+            "MAPE": MAPE(df["y"], df["yhat_preview"]),
+            "RMSE": RMSE(df["y"], df["yhat_preview"]),
+        },
+        "Stan model vs truth": {
+            "MAPE": MAPE(df["y"], df["yhat_stan"]),
+            "RMSE": RMSE(df["y"], df["yhat_stan"]),
+        },
+    }
+    return pd.DataFrame(report).T
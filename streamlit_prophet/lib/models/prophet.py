@@ -1,14 +1,62 @@
 from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from prophet import Prophet
-from prophet.diagnostics import cross_validation
 from streamlit_prophet.lib.dataprep.clean import exp_transform
 from streamlit_prophet.lib.dataprep.format import check_future_regressors_df
 from streamlit_prophet.lib.dataprep.split import make_eval_df, make_future_df
 from streamlit_prophet.lib.exposition.preparation import get_df_cv_with_hist
+from streamlit_prophet.lib.models.cv import (
+    cross_validation_cached,
+    get_input_cols,
+    get_model_signature,
+)
+from streamlit_prophet.lib.models.features import CachedFeaturesProphet
+from streamlit_prophet.lib.models.predict import predict_forecast_df
 from streamlit_prophet.lib.models.preparation import add_prophet_holidays, get_prophet_cv_horizon
-from streamlit_prophet.lib.utils.logging import suppress_stdout_stderr
+from streamlit_prophet.lib.models.uncertainty import (
+    AnalyticUncertaintyProphet,
+    get_uncertainty_params,
+)
+from streamlit_prophet.lib.utils.cache import SharedCache, hash_dataframe, hash_object
+from streamlit_prophet.lib.utils.jobs import (
+    Job,
+    publish_partial_result,
+    release_with_job,
+    report_progress,
+    submit_job,
+)
+from streamlit_prophet.lib.utils.logging import capture_fit_logs
+from streamlit_prophet.lib.utils.scheduler import run_admitted
+
+
+def get_result_nbytes(value: Any) -> int:
+    """Estimates the memory used by a fitted model or a forecast.
+
+    Parameters
+    ----------
+    value : Any
+        Fitted Prophet model or forecast dataframe.
+
+    Returns
+    -------
+    int
+        Memory used, in bytes.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    nbytes = 0
+    if isinstance(value, Prophet):
+        if value.history is not None:
+            nbytes += int(value.history.memory_usage(deep=True).sum())
+        for param in (value.params or dict()).values():
+            nbytes += np.asarray(param).nbytes
+    return nbytes
+
+
+# Fitted models and forecasts of all sessions, keyed by everything they depend on
+MODELS_CACHE = SharedCache(max_bytes=512 * 2**20, sizeof=get_result_nbytes)
 
 
 def instantiate_prophet_model(
@@ -34,7 +82,14 @@ def instantiate_prophet_model(
         f"{k}_seasonality": params["seasonalities"][k]["prophet_param"]
         for k in {"yearly", "weekly", "daily"}.intersection(set(params["seasonalities"].keys()))
     }
-    model = Prophet(**{**params["prior_scale"], **seasonality_params, **params["other"]})
+    uncertainty = params["uncertainty"]
+    model_class = (
+        AnalyticUncertaintyProphet if uncertainty["method"] == "analytic" else CachedFeaturesProphet
+    )
+    model = model_class(
+        **{**params["prior_scale"], **seasonality_params, **params["other"]},
+        uncertainty_samples=0 if uncertainty["method"] == "off" else uncertainty["samples"],
+    )
     for _, values in params["seasonalities"].items():
         if "custom_param" in values:
             model.add_seasonality(**values["custom_param"])
@@ -109,15 +164,21 @@ def forecast_workflow(
     """
     models: Dict[Any, Any] = dict()
     forecasts: Dict[Any, Any] = dict()
-    with suppress_stdout_stderr():
+    with capture_fit_logs("forecast"):
         if evaluate:
+            # Evaluation forecasts intervals are only displayed when there is no future forecast
+            eval_params = get_uncertainty_params(params, cleaning, not make_future_forecast)
             datasets, models, forecasts = forecast_eval(
-                config, use_cv, resampling, params, dates, datasets, models, forecasts
+                config, use_cv, resampling, eval_params, dates, datasets, models, forecasts
             )
+            if make_future_forecast:
+                # Evaluation results can be displayed while the future model is fitted
+                results = get_workflow_results(cleaning, datasets, models, forecasts)
+                publish_partial_result(results)
         if make_future_forecast:
             datasets, models, forecasts = forecast_future(
                 config,
-                params,
+                get_uncertainty_params(params, cleaning, True),
                 cleaning,
                 dates,
                 datasets,
@@ -130,7 +191,125 @@ def forecast_workflow(
                 dimensions,
                 load_options,
             )
-    if cleaning["log_transform"] & (evaluate | make_future_forecast):
+    return get_workflow_results(cleaning, datasets, models, forecasts)
+
+
+def submit_forecast_workflow(
+    config: Dict[Any, Any],
+    use_cv: bool,
+    make_future_forecast: bool,
+    evaluate: bool,
+    cleaning: Dict[Any, Any],
+    resampling: Dict[Any, Any],
+    params: Dict[Any, Any],
+    dates: Dict[Any, Any],
+    datasets: Dict[Any, Any],
+    df: pd.DataFrame,
+    date_col: str,
+    target_col: str,
+    dimensions: Dict[Any, Any],
+    load_options: Dict[Any, Any],
+    session_id: str = "",
+) -> Job:
+    """Runs forecast_workflow as a background job, or reattaches to the job already running it
+    on the same inputs. Its results are the same as those of forecast_workflow.
+
+    The job waits for the fits scheduler to admit it, single fits being admitted before
+    cross-validations.
+
+    Parameters
+    ----------
+    config : Dict
+        Lib configuration dictionary, containing information about random seed to use for training.
+    use_cv : bool
+        Whether or not cross-validation is used.
+    make_future_forecast : bool
+        Whether or not to make a forecast on future dates.
+    evaluate : bool
+        Whether or not to do a model evaluation.
+    cleaning : Dict
+        Dataset cleaning specifications.
+    resampling : Dict
+        Dataset resampling specifications.
+    params : Dict
+        Model parameters.
+    dates : Dict
+        Dictionary containing all relevant dates for training and forecasting.
+    datasets : Dict
+        Dictionary containing all relevant dataframes for training and forecasting.
+    df : pd.DataFrame
+        Full input dataframe, after cleaning, filtering and resampling.
+    date_col : str
+        Name of date column.
+    target_col : str
+        Name of target column.
+    dimensions : Dict
+        Dictionary containing dimensions information.
+    load_options : Dict
+        Loading options selected by user.
+    session_id : str
+        Session submitting the workflow, whose running fits are limited by the scheduler.
+
+    Returns
+    -------
+    Job
+        Job running the workflow.
+    """
+    args = (
+        config,
+        use_cv,
+        make_future_forecast,
+        evaluate,
+        cleaning,
+        resampling,
+        params,
+        dates,
+        datasets,
+        df,
+        date_col,
+        target_col,
+        dimensions,
+        load_options,
+    )
+    job_id = hash_object(args)
+    # The workflow adds dataframes to the datasets dictionary, the session's one is left unchanged
+    args = args[:8] + (dict(datasets),) + args[9:]
+    parallel = use_cv and evaluate
+    return submit_job(
+        job_id, run_admitted, (config, session_id, parallel, forecast_workflow, args), config
+    )
+
+
+def get_workflow_results(
+    cleaning: Dict[Any, Any],
+    datasets: Dict[Any, Any],
+    models: Dict[Any, Any],
+    forecasts: Dict[Any, Any],
+) -> Tuple[Dict[Any, Any], Dict[Any, Any], Dict[Any, Any]]:
+    """Returns results in the unit of the target, without modifying the ones being computed.
+
+    Parameters
+    ----------
+    cleaning : Dict
+        Dataset cleaning specifications.
+    datasets : Dict
+        Dictionary containing all relevant dataframes for training and forecasting.
+    models : Dict
+        Dictionary containing fitted Prophet models.
+    forecasts : Dict
+        Dictionary containing the different forecasts.
+
+    Returns
+    -------
+    dict
+        Dictionary containing all relevant dataframes for training and forecasting.
+    dict
+        Dictionary containing fitted Prophet models.
+    dict
+        Dictionary containing the different forecasts.
+    """
+    datasets, models, forecasts = dict(datasets), dict(models), dict(forecasts)
+    if cleaning["log_transform"]:
         datasets, forecasts = exp_transform(datasets, forecasts)
     return datasets, models, forecasts
 
@@ -175,19 +354,22 @@ def forecast_eval(
     dict
         Dictionary containing the different forecasts.
     """
-    models["eval"] = instantiate_prophet_model(params, dates=dates)
-    models["eval"].fit(datasets["train"], seed=config["global"]["seed"])
+    report_progress("Fitting model on training data")
+    models["eval"] = fit_shared_model(
+        instantiate_prophet_model(params, dates=dates), datasets["train"], config
+    )
     if use_cv:
-        forecasts["cv"] = cross_validation(
+        forecasts["cv"] = cross_validation_cached(
             models["eval"],
             cutoffs=dates["cutoffs"],
             horizon=get_prophet_cv_horizon(dates, resampling),
-            parallel="processes",
+            config=config,
         )
         forecasts["cv_with_hist"] = get_df_cv_with_hist(forecasts, datasets, models)
     else:
+        report_progress("Forecasting evaluation data")
         datasets = make_eval_df(datasets)
-        forecasts["eval"] = models["eval"].predict(datasets["eval"])
+        forecasts["eval"] = predict_shared_forecast(models["eval"], datasets["eval"], config)
     return datasets, models, forecasts
 
 
@@ -262,7 +444,131 @@ def forecast_future(
         resampling,
         params,
     )
-    models["future"] = instantiate_prophet_model(params, use_regressors=use_regressors, dates=dates)
-    models["future"].fit(datasets["full"], seed=config["global"]["seed"])
-    forecasts["future"] = models["future"].predict(datasets["future"])
+    report_progress("Fitting model on whole dataset")
+    models["future"] = fit_future_model(config, params, use_regressors, dates, datasets)
+    report_progress("Forecasting future dates")
+    forecasts["future"] = predict_shared_forecast(models["future"], datasets["future"], config)
     return datasets, models, forecasts
+
+
+def fit_future_model(
+    config: Dict[Any, Any],
+    params: Dict[Any, Any],
+    use_regressors: bool,
+    dates: Dict[Any, Any],
+    datasets: Dict[Any, Any],
+) -> Prophet:
+    """Fits a Prophet model on the whole dataset, or gets it from cache if the same model has
+    already been fitted on the same data. The fit doesn't depend on the forecast horizon,
+    so changing it only requires a new prediction.
+
+    Parameters
+    ----------
+    config : Dict
+        Lib configuration dictionary, containing information about random seed to use for training.
+    params : Dict
+        Model parameters.
+    use_regressors : bool
+        Whether or not to add regressors to the model.
+    dates : Dict
+        Dictionary containing all relevant dates for training and forecasting.
+    datasets : Dict
+        Dictionary containing all relevant dataframes for training and forecasting.
+
+    Returns
+    -------
+    Prophet
+        Fitted Prophet model, shared with other forecasts: it must not be modified.
+    """
+    model = instantiate_prophet_model(params, use_regressors=use_regressors, dates=dates)
+    return fit_shared_model(model, datasets["full"], config)
+
+
+def fit_shared_model(model: Prophet, df: pd.DataFrame, config: Dict[Any, Any]) -> Prophet:
+    """Fits a Prophet model, or gets it from the cache shared by all sessions if the same model
+    has already been fitted on the same data. If the same fit is running for another session,
+    waits for it instead of fitting the model twice.
+
+    The model is kept in cache at least until the job using it is forgotten.
+
+    Parameters
+    ----------
+    model : Prophet
+        Instantiated Prophet model.
+    df : pd.DataFrame
+        Training dataframe.
+    config : Dict
+        Lib configuration dictionary, containing information about random seed to use for training.
+
+    Returns
+    -------
+    Prophet
+        Fitted Prophet model, shared with other forecasts: it must not be modified.
+    """
+    seed = config["global"]["seed"]
+    key = get_fit_key(model, df, seed)
+    fitted_model, entry = MODELS_CACHE.acquire(key, lambda: model.fit(df, seed=seed))
+    release_with_job(lambda: MODELS_CACHE.release(entry))
+    return fitted_model
+
+
+def predict_shared_forecast(
+    model: Prophet, df: pd.DataFrame, config: Dict[Any, Any]
+) -> pd.DataFrame:
+    """Makes a forecast with a fitted model, or gets it from the cache shared by all sessions.
+
+    Parameters
+    ----------
+    model : Prophet
+        Fitted Prophet model.
+    df : pd.DataFrame
+        Dataframe with dates for predictions, and the other columns required by the model.
+    config : Dict
+        Lib configuration dictionary, containing information about random seed used for training.
+
+    Returns
+    -------
+    pd.DataFrame
+        Forecast, shared with other sessions: it must not be modified.
+    """
+    fit_key = get_fit_key(model, model.history, config["global"]["seed"])
+    key = repr((fit_key, hash_dataframe(df)))
+    forecast, entry = MODELS_CACHE.acquire(key, lambda: predict_forecast_df(model, df))
+    release_with_job(lambda: MODELS_CACHE.release(entry))
+    return forecast
+
+
+def get_fit_key(model: Prophet, df: pd.DataFrame, seed: Any) -> str:
+    """Computes the fingerprint of everything a fit depends on.
+
+    Parameters
+    ----------
+    model : Prophet
+        Prophet model, fitted or not.
+    df : pd.DataFrame
+        Training dataframe.
+    seed : Any
+        Random seed used for training.
+
+    Returns
+    -------
+    str
+        Cache key of the fit.
+    """
+    # Built-in seasonalities are only added to model.seasonalities during fit,
+    # so the instantiation parameters they come from are part of the key
+    init_params = (
+        model.yearly_seasonality,
+        model.weekly_seasonality,
+        model.daily_seasonality,
+        model.scaling,
+        None if model.stan_backend is None else model.stan_backend.get_type(),
+    )
+    return repr(
+        (
+            get_model_signature(model),
+            init_params,
+            hash_dataframe(df, get_input_cols(model)),
+            seed,
+        )
+    )
@@ -0,0 +1,126 @@
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from streamlit_prophet.lib.models.predict import get_prediction_features
+
+SCENARIO_OPERATIONS = {
+    "multiply": lambda values, value: values * value,
+    "add": lambda values, value: values + value,
+    "set": lambda values, value: np.full_like(values, value),
+}
+
+
+def apply_perturbations(
+    df: pd.DataFrame, perturbations: List[Dict[str, Any]], start_date: Any
+) -> pd.DataFrame:
+    """Applies regressor perturbations to a future dataframe, from a given date onwards.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Future dataframe, with a column for each regressor.
+    perturbations : List[Dict]
+        Perturbations to apply, each one with keys 'regressor', 'operation'
+        (among 'multiply', 'add' and 'set') and 'value'.
+    start_date : Any
+        First date on which perturbations are applied.
+
+    Returns
+    -------
+    pd.DataFrame
+        Perturbed future dataframe.
+    """
+    df = df.copy()
+    mask = (df["ds"] >= pd.Timestamp(start_date)).values
+    for perturbation in perturbations:
+        values = df[perturbation["regressor"]].values.astype(float)
+        operation = SCENARIO_OPERATIONS[perturbation["operation"]]
+        values[mask] = operation(values[mask], perturbation["value"])
+        df[perturbation["regressor"]] = values
+    return df
+
+
+def predict_scenarios(
+    model: Prophet,
+    df: pd.DataFrame,
+    scenarios: Dict[str, List[Dict[str, Any]]],
+    start_date: Any,
+) -> pd.DataFrame:
+    """Predicts many regressor scenarios with an already fitted model, without refitting it.
+
+    Features of the future dataframe are built once. Each scenario only replaces the columns of
+    its perturbed regressors, and all scenarios are predicted with a single batched product.
+
+    Parameters
+    ----------
+    model : Prophet
+        Fitted Prophet model, with regressors.
+    df : pd.DataFrame
+        Future dataframe, with a column for each regressor.
+    scenarios : Dict
+        Perturbations of each scenario, at the format expected by apply_perturbations.
+    start_date : Any
+        First date on which perturbations are applied.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dates and forecast of each scenario side by side,
+        the unperturbed forecast being named 'Baseline'.
+    """
+    features = get_prediction_features(model, df)
+    df_setup, X = features["df"], features["X"]
+    mask = (df_setup["ds"] >= pd.Timestamp(start_date)).values
+    columns = list(features["seasonal_features"].columns)
+    X_all = np.repeat(X[np.newaxis, :, :], len(scenarios) + 1, axis=0)
+    for i, perturbations in enumerate(scenarios.values(), start=1):
+        for perturbation in perturbations:
+            regressor = perturbation["regressor"]
+            if regressor not in model.extra_regressors:
+                raise ValueError(f"Regressor '{regressor}' is not used by the model.")
+            mu = model.extra_regressors[regressor]["mu"]
+            std = model.extra_regressors[regressor]["std"]
+            col = columns.index(regressor)
+            # Features hold standardized regressors, perturbations apply to their original values
+            values = X_all[i, mask, col] * std + mu
+            operation = SCENARIO_OPERATIONS[perturbation["operation"]]
+            X_all[i, mask, col] = (operation(values, perturbation["value"]) - mu) / std
+    terms = dict()
+    for component in ["additive_terms", "multiplicative_terms"]:
+        beta_c = model.params["beta"] * features["component_cols"][component].values
+        terms[component] = np.nanmean(np.matmul(X_all, beta_c.transpose()), axis=2)
+    terms["additive_terms"] *= model.y_scale
+    trend = np.asarray(model.predict_trend(df_setup), dtype=float)
+    yhat = trend * (1 + terms["multiplicative_terms"]) + terms["additive_terms"]
+    forecasts = pd.DataFrame({"ds": df_setup["ds"].values})
+    for name, values in zip(["Baseline"] + list(scenarios.keys()), yhat):
+        forecasts[name] = values
+    return forecasts
+
+
+def get_scenarios_summary(forecasts: pd.DataFrame, start_date: Any) -> pd.DataFrame:
+    """Compares the total forecast of each scenario with the baseline, from a given date onwards.
+
+    Parameters
+    ----------
+    forecasts : pd.DataFrame
+        Forecast of each scenario, as returned by predict_scenarios.
+    start_date : Any
+        First date of the compared period.
+
+    Returns
+    -------
+    pd.DataFrame
+        Total forecast of each scenario, and its difference with the baseline.
+    """
+    totals = forecasts.loc[forecasts["ds"] >= pd.Timestamp(start_date)].drop("ds", axis=1).sum()
+    baseline = totals["Baseline"]
+    return pd.DataFrame(
+        {
+            "Total forecast": totals,
+            "Difference": totals - baseline,
+            "Difference (%)": 100 * (totals - baseline) / baseline if baseline != 0 else np.nan,
+        }
+    )
@@ -0,0 +1,341 @@
+from typing import Any, Dict, List, Tuple
+
+import copy
+import math
+import time
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from streamlit_prophet.lib.evaluation.metrics import MAE, MAPE, MSE, RMSE, SMAPE
+from streamlit_prophet.lib.models.cv import cross_validation_models
+from streamlit_prophet.lib.models.preparation import get_prophet_cv_horizon
+from streamlit_prophet.lib.models.prophet import instantiate_prophet_model
+from streamlit_prophet.lib.utils.cache import LRUCache, hash_object
+from streamlit_prophet.lib.utils.executors import get_n_workers
+
+TUNING_METRICS = {"MAPE": MAPE, "SMAPE": SMAPE, "MSE": MSE, "RMSE": RMSE, "MAE": MAE}
+# Best parameters and leaderboards of hyperparameter searches, keyed by fingerprint of their inputs
+TUNING_CACHE = LRUCache(maxsize=16)
+
+
+def tune_params(
+    params: Dict[Any, Any],
+    dates: Dict[Any, Any],
+    datasets: Dict[Any, Any],
+    resampling: Dict[Any, Any],
+    config: Dict[Any, Any],
+) -> Tuple[Dict[Any, Any], pd.DataFrame]:
+    """Searches the model parameters that minimize cross-validation error, with successive halving.
+
+    All candidates are first evaluated on the earliest cutoffs, whose training sets are the
+    smallest. Only the best ones are kept at each round, and evaluated on more folds, until all
+    folds are used. Candidates of a round are run by batches filling the executor described in
+    config, and folds are cached so that each round only fits the folds that were not run before.
+    Once the time budget is spent, the search stops after the current batch, with the best
+    candidate so far.
+
+    Parameters
+    ----------
+    params : Dict
+        Model parameters entered by the user, evaluated as the first candidate.
+    dates : Dict
+        Dictionary containing all relevant dates for training and forecasting, including CV cutoffs.
+    datasets : Dict
+        Dictionary containing all relevant dataframes for training and forecasting.
+    resampling : Dict
+        Dataset resampling specifications.
+    config : Dict
+        Lib configuration dictionary, containing tuning and executor specifications.
+
+    Returns
+    -------
+    dict
+        Model parameters with the values of the best candidate.
+    pd.DataFrame
+        Leaderboard of all evaluated candidates, the best one first.
+    """
+    tuning = config["tuning"]
+    seed = config["global"]["seed"]
+    deadline = time.monotonic() + tuning["time_budget"]
+    candidates = get_candidates(params, tuning["search_space"], tuning["n_candidates"], seed)
+    cutoffs = sorted(dates["cutoffs"])
+    horizon = get_prophet_cv_horizon(dates, resampling)
+    rungs = get_rungs(len(cutoffs), len(candidates), tuning["reduction_factor"])
+    scores: Dict[int, Tuple[int, float]] = dict()
+    alive = list(range(len(candidates)))
+    for n_folds, n_kept in rungs:
+        if len(scores) > 0 and time.monotonic() > deadline:
+            break
+        alive = sorted(alive, key=lambda i: scores.get(i, (0, 0.0))[1])[:n_kept]
+        batch_size = max(1, get_n_workers(config) // n_folds)
+        for start in range(0, len(alive), batch_size):
+            if len(scores) > 0 and time.monotonic() > deadline:
+                break
+            batch = alive[start : start + batch_size]
+            models = [
+                get_candidate_model(params, candidates[i], dates, datasets, seed) for i in batch
+            ]
+            cv_forecasts = cross_validation_models(models, cutoffs[:n_folds], horizon, config)
+            for i, cv_forecast in zip(batch, cv_forecasts):
+                scores[i] = (n_folds, get_cv_score(cv_forecast, tuning["metric"]))
+    leaderboard = get_leaderboard(candidates, scores, tuning["metric"])
+    best_params = apply_candidate(params, candidates[leaderboard.index[0]])
+    return best_params, leaderboard.reset_index(drop=True)
+
+
+def get_tuning_key(
+    params: Dict[Any, Any],
+    dates: Dict[Any, Any],
+    datasets: Dict[Any, Any],
+    resampling: Dict[Any, Any],
+    config: Dict[Any, Any],
+) -> str:
+    """Computes the fingerprint of everything a hyperparameter search depends on.
+
+    Parameters
+    ----------
+    params : Dict
+        Model parameters entered by the user.
+    dates : Dict
+        Dictionary containing all relevant dates for training and forecasting, including CV cutoffs.
+    datasets : Dict
+        Dictionary containing all relevant dataframes for training and forecasting.
+    resampling : Dict
+        Dataset resampling specifications.
+    config : Dict
+        Lib configuration dictionary, containing tuning specifications.
+
+    Returns
+    -------
+    str
+        Cache key of the search.
+    """
+    return hash_object(
+        (params, dates, datasets["train"], resampling, config["tuning"], config["global"]["seed"])
+    )
+
+
+def get_candidate_model(
+    params: Dict[Any, Any],
+    candidate: Dict[str, Any],
+    dates: Dict[Any, Any],
+    datasets: Dict[Any, Any],
+    seed: int,
+) -> Prophet:
+    """Instantiates the model of a candidate, preprocessed with training data to be cross-validated.
+
+    Parameters
+    ----------
+    params : Dict
+        Model parameters entered by the user.
+    candidate : Dict
+        Value of each tuned parameter.
+    dates : Dict
+        Dictionary containing all relevant dates for training and forecasting.
+    datasets : Dict
+        Dictionary containing all relevant dataframes for training and forecasting.
+    seed : int
+        Random seed used for training.
+
+    Returns
+    -------
+    Prophet
+        Preprocessed Prophet model.
+    """
+    candidate_params = apply_candidate(params, candidate)
+    # Intervals are not needed to compute errors
+    candidate_params["uncertainty"] = {**params["uncertainty"], "method": "off"}
+    model = instantiate_prophet_model(candidate_params, dates=dates)
+    model.preprocess(datasets["train"])
+    # Folds are fitted with the same options as the evaluation model, so they can be reused
+    model.fit_kwargs = {"seed": seed}
+    return model
+
+
+def get_candidates(
+    params: Dict[Any, Any], search_space: Dict[str, List[Any]], n_candidates: int, seed: int
+) -> List[Dict[str, Any]]:
+    """Draws distinct combinations of the search space values, the user's parameters being
+    the first one.
+
+    Parameters
+    ----------
+    params : Dict
+        Model parameters entered by the user.
+    search_space : Dict
+        Values to try for each tuned parameter.
+    n_candidates : int
+        Number of candidates, including the user's parameters.
+    seed : int
+        Random seed, so that the same candidates are drawn for the same search space.
+
+    Returns
+    -------
+    list
+        Value of each tuned parameter, for each candidate.
+    """
+    names = list(search_space.keys())
+    shape = tuple(len(search_space[name]) for name in names)
+    n_combinations = int(np.prod(shape))
+    rng = np.random.default_rng(seed)
+    indices = rng.choice(n_combinations, size=min(n_candidates - 1, n_combinations), replace=False)
+    candidates = [get_current_values(params, names)]
+    for index in indices:
+        positions = np.unravel_index(index, shape)
+        candidates.append({name: search_space[name][pos] for name, pos in zip(names, positions)})
+    return candidates
+
+
+def get_current_values(params: Dict[Any, Any], names: List[str]) -> Dict[str, Any]:
+    """Returns the values of tuned parameters entered by the user.
+
+    Parameters
+    ----------
+    params : Dict
+        Model parameters entered by the user.
+    names : List[str]
+        Names of tuned parameters.
+
+    Returns
+    -------
+    dict
+        Value of each tuned parameter, None for Fourier orders left to Prophet's defaults.
+    """
+    values = {
+        **params["prior_scale"],
+        "changepoint_range": params["other"]["changepoint_range"],
+        "seasonality_mode": params["other"].get("seasonality_mode", "additive"),
+        "fourier_order": None,
+    }
+    return {name: values.get(name) for name in names}
+
+
+def apply_candidate(params: Dict[Any, Any], candidate: Dict[str, Any]) -> Dict[Any, Any]:
+    """Sets the values of a candidate in model parameters.
+
+    Seasonality mode is applied to the whole model and to custom seasonalities,
+    Fourier order to all seasonalities that are not turned off.
+
+    Parameters
+    ----------
+    params : Dict
+        Model parameters.
+    candidate : Dict
+        Value of each tuned parameter, None values being left unchanged.
+
+    Returns
+    -------
+    dict
+        Model parameters with candidate values.
+    """
+    candidate_params = copy.deepcopy(params)
+    seasonalities = candidate_params["seasonalities"].values()
+    for name, value in candidate.items():
+        if value is None:
+            continue
+        if name in candidate_params["prior_scale"]:
+            candidate_params["prior_scale"][name] = value
+        elif name == "changepoint_range":
+            candidate_params["other"][name] = value
+        elif name == "seasonality_mode":
+            candidate_params["other"][name] = value
+            for seasonality in seasonalities:
+                if "custom_param" in seasonality:
+                    seasonality["custom_param"]["mode"] = value
+        elif name == "fourier_order":
+            for seasonality in seasonalities:
+                if "custom_param" in seasonality:
+                    seasonality["custom_param"]["fourier_order"] = int(value)
+                elif seasonality["prophet_param"] is not False:
+                    seasonality["prophet_param"] = int(value)
+    return candidate_params
+
+
+def get_rungs(n_folds: int, n_candidates: int, reduction_factor: int) -> List[Tuple[int, int]]:
+    """Computes the successive halving schedule: number of folds used and candidates kept
+    at each round.
+
+    Parameters
+    ----------
+    n_folds : int
+        Number of cross-validation folds.
+    n_candidates : int
+        Number of candidates.
+    reduction_factor : int
+        Factor by which the number of candidates is divided, and the number of folds multiplied,
+        at each round. It must be at least 2.
+
+    Returns
+    -------
+    list
+        Number of folds and number of candidates of each round, the last round using all folds.
+    """
+    if reduction_factor < 2:
+        raise ValueError(
+            f"Tuning reduction_factor is {reduction_factor}, it should be an integer of at least 2."
+        )
+    rungs = []
+    rung = 0
+    while True:
+        folds = min(n_folds, reduction_factor**rung)
+        rungs.append((folds, max(1, math.ceil(n_candidates / reduction_factor**rung))))
+        if folds == n_folds:
+            return rungs
+        rung += 1
+
+
+def get_cv_score(cv_forecast: pd.DataFrame, metric: str) -> float:
+    """Averages a metric over cross-validation folds.
+
+    Parameters
+    ----------
+    cv_forecast : pd.DataFrame
+        Cross-validation results, at the format of prophet.diagnostics.cross_validation output.
+    metric : str
+        Name of the metric, among "MAPE", "SMAPE", "MSE", "RMSE" and "MAE".
+
+    Returns
+    -------
+    float
+        Average metric value.
+    """
+    func = TUNING_METRICS[metric]
+    return float(
+        np.mean([func(fold["y"], fold["yhat"]) for _, fold in cv_forecast.groupby("cutoff")])
+    )
+
+
+def get_leaderboard(
+    candidates: List[Dict[str, Any]], scores: Dict[int, Tuple[int, float]], metric: str
+) -> pd.DataFrame:
+    """Ranks evaluated candidates, those evaluated on more folds first, then by increasing error.
+
+    Parameters
+    ----------
+    candidates : List[Dict]
+        Value of each tuned parameter, for each candidate.
+    scores : Dict
+        Number of folds used and average metric value, for each evaluated candidate.
+    metric : str
+        Name of the metric.
+
+    Returns
+    -------
+    pd.DataFrame
+        Leaderboard indexed by candidate position, the user's parameters being candidate 0.
+    """
+    leaderboard = pd.DataFrame(
+        [
+            {**candidates[i], "n_folds": n_folds, metric: score}
+            for i, (n_folds, score) in scores.items()
+        ],
+        index=list(scores.keys()),
+    )
+    leaderboard["candidate"] = [
+        "sidebar" if i == 0 else f"candidate_{i}" for i in leaderboard.index
+    ]
+    leaderboard = leaderboard.sort_values(
+        ["n_folds", metric], ascending=[False, True], kind="stable"
+    )
+    return leaderboard[["candidate"] + list(candidates[0].keys()) + ["n_folds", metric]]
@@ -0,0 +1,142 @@
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+from prophet import Prophet
+from scipy.stats import norm
+from streamlit_prophet.lib.models.features import CachedFeaturesProphet
+
+
+class AnalyticUncertaintyProphet(CachedFeaturesProphet):
+    """Prophet model whose uncertainty intervals are computed in closed form instead of by simulation.
+
+    Future trend changes are simulated by Prophet as sparse Laplace rate shifts. Their variance
+    has a closed form, which is combined with observation noise under a gaussian approximation.
+    Logistic growth is not covered by this approximation, its intervals are still simulated.
+    """
+
+    def predict_uncertainty(self, df: pd.DataFrame, vectorized: bool) -> pd.DataFrame:
+        """Prediction intervals for yhat and trend.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Prediction dataframe.
+        vectorized : bool
+            Whether to use a vectorized method for generating future draws, for logistic growth.
+
+        Returns
+        -------
+        pd.DataFrame
+            Dataframe with uncertainty intervals.
+        """
+        if self.growth == "logistic":
+            return super().predict_uncertainty(df, vectorized)
+        seasonal_features, _, component_cols, _ = self.make_all_seasonality_features(df)
+        return pd.DataFrame(get_analytic_intervals(self, df, seasonal_features, component_cols))
+
+
+def get_analytic_intervals(
+    model: Prophet,
+    df: pd.DataFrame,
+    seasonal_features: pd.DataFrame,
+    component_cols: pd.DataFrame,
+) -> Dict[str, np.ndarray]:
+    """Computes yhat and trend uncertainty intervals with a gaussian approximation.
+
+    Parameters
+    ----------
+    model : Prophet
+        Fitted Prophet model.
+    df : pd.DataFrame
+        Prediction dataframe, as returned by setup_dataframe.
+    seasonal_features : pd.DataFrame
+        Seasonality, holiday and regressor features of the prediction dataframe.
+    component_cols : pd.DataFrame
+        Matrix mapping features to components.
+
+    Returns
+    -------
+    dict
+        Lower and upper bounds of yhat and trend.
+    """
+    beta = np.nanmean(model.params["beta"], axis=0)
+    X = seasonal_features.values
+    Xb_a = np.matmul(X, beta * component_cols["additive_terms"].values) * model.y_scale
+    Xb_m = np.matmul(X, beta * component_cols["multiplicative_terms"].values)
+    trend = np.asarray(model.predict_trend(df), dtype=float)
+    yhat = trend * (1 + Xb_m) + Xb_a
+    trend_var = get_trend_variance(model, df["t"].values)
+    noise_var = (np.nanmean(model.params["sigma_obs"]) * model.y_scale) ** 2
+    trend_sd = np.sqrt(trend_var)
+    yhat_sd = np.sqrt((1 + Xb_m) ** 2 * trend_var + noise_var)
+    z = norm.ppf((1 + model.interval_width) / 2)
+    return {
+        "yhat_lower": yhat - z * yhat_sd,
+        "yhat_upper": yhat + z * yhat_sd,
+        "trend_lower": trend - z * trend_sd,
+        "trend_upper": trend + z * trend_sd,
+    }
+
+
+def get_trend_variance(model: Prophet, t: np.ndarray) -> np.ndarray:
+    """Computes the variance of the future trend changes simulated by Prophet, on the original scale.
+
+    At each future step, Prophet adds a rate shift drawn from Laplace(0, mean |delta|) with probability
+    n_changepoints * step, averages it with the previous step's shift, then integrates twice.
+    Shifts being independent, the variance after i steps is the shifts variance multiplied by
+    the sum of squared weights, i.e. i * (4 * i ** 2 - 1) / 12.
+
+    Parameters
+    ----------
+    model : Prophet
+        Fitted Prophet model.
+    t : np.ndarray
+        Sorted scaled times of the prediction dataframe.
+
+    Returns
+    -------
+    np.ndarray
+        Trend variance for each date, 0 on historical dates.
+    """
+    variance = np.zeros(len(t))
+    future = t > 1
+    n_future = int(future.sum())
+    if model.growth != "linear" or n_future == 0:
+        return variance
+    if n_future > 1:
+        single_diff = np.diff(t[future]).mean()
+    else:
+        single_diff = np.diff(model.history["t"]).mean()
+    likelihood = min(len(model.changepoints_t) * single_diff, 1.0)
+    mean_delta = np.mean(np.abs(np.nanmean(model.params["delta"], axis=0))) + 1e-8
+    steps = np.arange(1, n_future + 1)
+    shifts_var = likelihood * 2 * mean_delta**2
+    variance[future] = (
+        shifts_var * steps * (4 * steps**2 - 1) / 12 * (single_diff * model.y_scale) ** 2
+    )
+    return variance
+
+
+def get_uncertainty_params(
+    params: Dict[Any, Any], cleaning: Dict[Any, Any], intervals_needed: bool
+) -> Dict[Any, Any]:
+    """Turns uncertainty intervals off when they won't be displayed.
+
+    Parameters
+    ----------
+    params : Dict
+        Model parameters.
+    cleaning : Dict
+        Cleaning specifications, intervals are not displayed when a log transform is applied.
+    intervals_needed : bool
+        Whether or not a visualization displays the intervals of this model's forecasts.
+
+    Returns
+    -------
+    dict
+        Model parameters with updated uncertainty specifications.
+    """
+    if cleaning["log_transform"] or not intervals_needed:
+        return {**params, "uncertainty": {**params["uncertainty"], "method": "off"}}
+    return params
@@ -0,0 +1,423 @@
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import concurrent.futures
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+
+import pandas as pd
+
+
+class LRUCache:
+    """Bounded mapping that evicts least recently used entries once full, safe to share between threads.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries kept in the cache.
+    on_evict : Callable, optional
+        Function called on each value removed from the cache, to free the resources it holds.
+    pinned : Callable, optional
+        Function telling whether a value must be kept even if the cache is full, in which case
+        the cache may exceed its size until the value can be evicted.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        on_evict: Optional[Callable[[Any], None]] = None,
+        pinned: Optional[Callable[[Any], bool]] = None,
+    ):
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.pinned = pinned
+        self.entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the value cached for a key, and marks it as recently used.
+
+        Parameters
+        ----------
+        key : Hashable
+            Cache key.
+        default : Any
+            Value returned if the key is not cached.
+
+        Returns
+        -------
+        Any
+            Cached value, or default value.
+        """
+        with self._lock:
+            if key not in self.entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Caches a value, evicting least recently used entries if the cache is full.
+
+        Parameters
+        ----------
+        key : Hashable
+            Cache key.
+        value : Any
+            Value to cache.
+        """
+        evicted: List[Any] = []
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            n_evicted = len(self.entries) - self.maxsize
+            for old_key in list(self.entries.keys()) if n_evicted > 0 else []:
+                if len(evicted) >= n_evicted:
+                    break
+                if self.pinned is None or not self.pinned(self.entries[old_key]):
+                    evicted.append(self.entries.pop(old_key))
+        self._evict(evicted)
+
+    def clear(self) -> None:
+        """Removes all entries and resets statistics."""
+        with self._lock:
+            evicted = list(self.entries.values())
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+        self._evict(evicted)
+
+    def _evict(self, values: List[Any]) -> None:
+        """Calls the eviction function on removed values, outside of the lock.
+
+        Parameters
+        ----------
+        values : list
+            Values removed from the cache.
+        """
+        if self.on_evict is not None:
+            for value in values:
+                self.on_evict(value)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class CacheEntry:
+    """Value cached by a SharedCache, with the memory it uses and its number of users.
+
+    Parameters
+    ----------
+    value : Any
+        Cached value.
+    size : int
+        Memory used by the value, in bytes.
+    """
+
+    def __init__(self, value: Any, size: int):
+        self.value = value
+        self.size = size
+        self.n_users = 0
+
+
+class SharedCache:
+    """Process-wide cache shared by all sessions, bounded by the memory of its values.
+
+    Each value is computed once: requests for a key being computed wait for it instead of
+    computing it again. Values are acquired and released by their users, and only values which
+    are not in use are evicted, least recently used first, once the memory budget is exceeded.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Memory budget of cached values, which may be exceeded by values in use.
+    sizeof : Callable
+        Function returning the memory used by a value, in bytes.
+    on_evict : Callable, optional
+        Function called on each value removed from the cache, to free the resources it holds.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        sizeof: Callable[[Any], int],
+        on_evict: Optional[Callable[[Any], None]] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+        self.entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self.in_flight: Dict[Hashable, "concurrent.futures.Future[CacheEntry]"] = dict()
+        self.n_waiting: Dict[Hashable, int] = dict()
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, key: Hashable, compute: Callable[[], Any]) -> Tuple[Any, CacheEntry]:
+        """Returns the value cached for a key, computing it if needed, and marks it as in use
+        until it is released.
+
+        Parameters
+        ----------
+        key : Hashable
+            Cache key, fingerprint of everything the value depends on.
+        compute : Callable
+            Function computing the value, called at most once at a time per key.
+
+        Returns
+        -------
+        Any
+            Cached value, shared with other users: it must not be modified.
+        CacheEntry
+            Entry to release once the value is not used anymore.
+        """
+        with self._lock:
+            if key in self.entries:
+                self.hits += 1
+                return self._use(key)
+            future = self.in_flight.get(key)
+            is_computing = future is None
+            if future is None:
+                self.misses += 1
+                future = concurrent.futures.Future()
+                self.in_flight[key] = future
+                self.n_waiting[key] = 0
+            else:
+                # Waiters are counted as users before the value exists, so it can't be evicted
+                self.waits += 1
+                self.n_waiting[key] += 1
+        if not is_computing:
+            entry = future.result()
+            return entry.value, entry
+        try:
+            value = compute()
+        except BaseException as error:
+            with self._lock:
+                del self.in_flight[key]
+                del self.n_waiting[key]
+            future.set_exception(error)
+            raise
+        with self._lock:
+            entry = CacheEntry(value, self.sizeof(value))
+            entry.n_users = 1 + self.n_waiting.pop(key)
+            self.entries[key] = entry
+            del self.in_flight[key]
+            evicted = self._evict()
+        self._call_on_evict(evicted)
+        future.set_result(entry)
+        return value, entry
+
+    def release(self, entry: CacheEntry) -> None:
+        """Marks a value acquired earlier as not in use anymore by one of its users.
+
+        Parameters
+        ----------
+        entry : CacheEntry
+            Entry returned when the value was acquired.
+        """
+        with self._lock:
+            entry.n_users -= 1
+            evicted = self._evict()
+        self._call_on_evict(evicted)
+
+    def get_nbytes(self) -> int:
+        """Returns the memory used by cached values.
+
+        Returns
+        -------
+        int
+            Memory used, in bytes.
+        """
+        with self._lock:
+            return sum(entry.size for entry in self.entries.values())
+
+    def clear(self) -> None:
+        """Removes all entries, even values in use, and resets statistics.
+        Values being computed are kept."""
+        with self._lock:
+            evicted = [entry.value for entry in self.entries.values()]
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.waits = 0
+        self._call_on_evict(evicted)
+
+    def _use(self, key: Hashable) -> Tuple[Any, CacheEntry]:
+        """Marks a cached value as used once more and as recently used, the lock being held.
+
+        Parameters
+        ----------
+        key : Hashable
+            Cache key.
+
+        Returns
+        -------
+        Any
+            Cached value.
+        CacheEntry
+            Entry to release once the value is not used anymore.
+        """
+        entry = self.entries[key]
+        entry.n_users += 1
+        self.entries.move_to_end(key)
+        return entry.value, entry
+
+    def _evict(self) -> List[Any]:
+        """Removes least recently used values which are not in use, until cached values fit in
+        the memory budget, the lock being held.
+
+        Returns
+        -------
+        list
+            Values removed from the cache.
+        """
+        evicted = []
+        nbytes = sum(entry.size for entry in self.entries.values())
+        for key, entry in list(self.entries.items()):
+            if nbytes <= self.max_bytes:
+                break
+            if entry.n_users <= 0:
+                del self.entries[key]
+                nbytes -= entry.size
+                evicted.append(entry.value)
+        return evicted
+
+    def _call_on_evict(self, values: List[Any]) -> None:
+        """Calls the eviction function on removed values, outside of the lock.
+
+        Parameters
+        ----------
+        values : list
+            Values removed from the cache.
+        """
+        if self.on_evict is not None:
+            for value in values:
+                self.on_evict(value)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def hash_dataframe(df: pd.DataFrame, columns: Optional[List[Any]] = None) -> str:
+    """Computes a fingerprint of a dataframe's values, independent of its index.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe to hash.
+    columns : list, optional
+        Columns to take into account, by default all columns.
+
+    Returns
+    -------
+    str
+        Hexadecimal fingerprint.
+    """
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+    digest = hashlib.sha1(str(list(df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# Fingerprints of dataframes, keyed by object id and checked against a weak reference to the
+# dataframe, so that an id reused by another object is never mistaken for it. The lock is
+# reentrant as the garbage collector may run the removal callback while it is held.
+_FINGERPRINTS: Dict[int, Tuple["weakref.ref[pd.DataFrame]", str]] = dict()
+_FINGERPRINTS_LOCK = threading.RLock()
+
+
+def get_fingerprint(df: pd.DataFrame) -> str:
+    """Returns the fingerprint of a dataframe which is not modified anymore, like a forecast or
+    a dataset shared between reruns, hashing its values only the first time it is requested.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe that must not be modified after this call.
+
+    Returns
+    -------
+    str
+        Hexadecimal fingerprint, the same as hash_dataframe's.
+    """
+    key = id(df)
+    with _FINGERPRINTS_LOCK:
+        entry = _FINGERPRINTS.get(key)
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    fingerprint = hash_dataframe(df)
+    # The entry is removed when the dataframe is collected, the callback only runs once it is dead
+    ref = weakref.ref(df, lambda dead: _forget_fingerprint(key, dead))
+    with _FINGERPRINTS_LOCK:
+        _FINGERPRINTS[key] = (ref, fingerprint)
+    return fingerprint
+
+
+def _forget_fingerprint(key: int, ref: "weakref.ref[pd.DataFrame]") -> None:
+    """Removes the fingerprint of a collected dataframe, unless its id has been reused since.
+
+    Parameters
+    ----------
+    key : int
+        Id of the collected dataframe.
+    ref : weakref.ref
+        Dead weak reference to the dataframe.
+    """
+    with _FINGERPRINTS_LOCK:
+        entry = _FINGERPRINTS.get(key)
+        if entry is not None and entry[0] is ref:
+            del _FINGERPRINTS[key]
+
+
+def hash_object(value: Any) -> str:
+    """Computes a fingerprint of nested dictionaries, lists and dataframes, other values being
+    summarized by their representation.
+
+    Parameters
+    ----------
+    value : Any
+        Object to hash.
+
+    Returns
+    -------
+    str
+        Hexadecimal fingerprint.
+    """
+    return hashlib.sha1(_describe(value).encode()).hexdigest()
+
+
+def _describe(value: Any) -> str:
+    """Summarizes an object in a string, dataframes being hashed.
+
+    Parameters
+    ----------
+    value : Any
+        Object to summarize.
+
+    Returns
+    -------
+    str
+        Description of the object.
+    """
+    if isinstance(value, pd.DataFrame):
+        return f"DataFrame({hash_dataframe(value)})"
+    if isinstance(value, pd.Series):
+        return f"Series({value.name!r}, {hash_dataframe(value.to_frame())})"
+    if isinstance(value, dict):
+        items = sorted((repr(k), _describe(v)) for k, v in value.items())
+        return f"dict({items})"
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}({[_describe(v) for v in value]})"
+    return repr(value)
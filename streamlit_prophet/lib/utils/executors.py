@@ -0,0 +1,203 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import atexit
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+# Modules imported once by the forkserver, so that worker processes start with them loaded
+PRELOADED_MODULES = [
+    "pandas",
+    "numpy",
+    "cmdstanpy",
+    "prophet",
+    "streamlit_prophet.lib.models.cv",
+    "streamlit_prophet.lib.models.features",
+]
+
+_EXECUTORS: Dict[Tuple[str, int], concurrent.futures.Executor] = dict()
+_LOCK = threading.Lock()
+
+
+def get_executor(config: Dict[Any, Any]) -> concurrent.futures.Executor:
+    """Returns the persistent executor described in config, creating it on first use.
+
+    Executors live as long as the app's process, so they are shared by all reruns and sessions.
+    Worker processes are started in advance and load Prophet's Stan model when they start.
+
+    Parameters
+    ----------
+    config : Dict
+        Lib configuration dictionary, containing executor specifications.
+
+    Returns
+    -------
+    concurrent.futures.Executor
+        Executor to submit tasks to.
+    """
+    mode = config["executor"]["mode"]
+    n_workers = get_n_workers(config)
+    with _LOCK:
+        executor = _EXECUTORS.get((mode, n_workers))
+        if executor is None:
+            executor = _create_executor(mode, n_workers)
+            _EXECUTORS[(mode, n_workers)] = executor
+    return executor
+
+
+def replace_broken_executor(
+    config: Dict[Any, Any], broken: concurrent.futures.Executor
+) -> concurrent.futures.Executor:
+    """Replaces an executor whose worker processes died, unless another thread already did.
+
+    Parameters
+    ----------
+    config : Dict
+        Lib configuration dictionary, containing executor specifications.
+    broken : concurrent.futures.Executor
+        Executor which refused a task because it is broken.
+
+    Returns
+    -------
+    concurrent.futures.Executor
+        Executor to submit tasks to.
+    """
+    key = (config["executor"]["mode"], get_n_workers(config))
+    with _LOCK:
+        if _EXECUTORS.get(key) is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            _EXECUTORS[key] = _create_executor(*key)
+        return _EXECUTORS[key]
+
+
+def start_executor(config: Dict[Any, Any]) -> None:
+    """Creates the executor described in config in the background, so that it is ready when needed.
+    Only pools of worker processes are started in advance, other executors start instantly.
+
+    Parameters
+    ----------
+    config : Dict
+        Lib configuration dictionary, containing executor specifications.
+    """
+    if config["executor"]["mode"] != "processes":
+        return
+    threading.Thread(target=get_executor, args=(config,), daemon=True).start()
+
+
+def get_n_workers(config: Dict[Any, Any]) -> int:
+    """Returns the number of workers to use, all cores being used if none is specified in config.
+
+    Parameters
+    ----------
+    config : Dict
+        Lib configuration dictionary, containing executor specifications.
+
+    Returns
+    -------
+    int
+        Number of workers.
+    """
+    return config["executor"]["n_workers"] or os.cpu_count() or 1
+
+
+def run_tasks(
+    func: Callable[..., Any],
+    args: List[Tuple[Any, ...]],
+    config: Dict[Any, Any],
+    on_task_done: Optional[Callable[[int], None]] = None,
+) -> List[Any]:
+    """Runs tasks with the executor described in config, and returns their results in order.
+
+    Parameters
+    ----------
+    func : Callable
+        Function to run, it must be defined at module level to be sent to worker processes.
+    args : List[Tuple]
+        Arguments of each task.
+    config : Dict
+        Lib configuration dictionary, containing executor specifications.
+    on_task_done : Callable, optional
+        Function called with the number of finished tasks each time a task finishes.
+
+    Returns
+    -------
+    list
+        Result of each task.
+    """
+    if config["executor"]["mode"] == "serial" or len(args) <= 1:
+        results = []
+        for task_args in args:
+            results.append(func(*task_args))
+            if on_task_done is not None:
+                on_task_done(len(results))
+        return results
+    executor = get_executor(config)
+    try:
+        futures = [executor.submit(func, *task_args) for task_args in args]
+    except BrokenProcessPool:
+        # A worker process died, e.g. killed for lack of memory, the pool is replaced
+        executor = replace_broken_executor(config, executor)
+        futures = [executor.submit(func, *task_args) for task_args in args]
+    if on_task_done is not None:
+        for n_done, _ in enumerate(concurrent.futures.as_completed(futures), start=1):
+            on_task_done(n_done)
+    # All tasks are finished before errors are raised, so that callers can free their inputs
+    concurrent.futures.wait(futures)
+    return [future.result() for future in futures]
+
+
+def shutdown_executors() -> None:
+    """Shuts down all persistent executors."""
+    with _LOCK:
+        for executor in _EXECUTORS.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        _EXECUTORS.clear()
+
+
+def _create_executor(mode: str, n_workers: int) -> concurrent.futures.Executor:
+    """Creates an executor, and starts its workers if they are processes.
+
+    Parameters
+    ----------
+    mode : str
+        Either "serial", "threads" or "processes".
+    n_workers : int
+        Number of workers.
+
+    Returns
+    -------
+    concurrent.futures.Executor
+        New executor.
+    """
+    if mode in ["serial", "threads"]:
+        return concurrent.futures.ThreadPoolExecutor(
+            max_workers=1 if mode == "serial" else n_workers
+        )
+    if mode != "processes":
+        raise ValueError(
+            f"Unknown executor mode '{mode}', it should be serial, threads or processes."
+        )
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(PRELOADED_MODULES)
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=n_workers, mp_context=context, initializer=_initialize_worker
+    )
+    # Workers are started on demand, these no-op tasks start all of them without waiting
+    for _ in range(n_workers):
+        executor.submit(os.getpid)
+    return executor
+
+
+def _initialize_worker() -> None:
+    """Loads Prophet's Stan model once per worker process, instead of once per task,
+    and keeps fit messages of the worker in memory instead of printing them."""
+    from prophet import Prophet
+    from streamlit_prophet.lib.utils.logging import install_fit_logs_capture
+
+    install_fit_logs_capture()
+    Prophet()
+
+
+atexit.register(shutdown_executors)
@@ -1,9 +1,9 @@
 from typing import List
 
-import re
+import functools
 
 import pandas as pd
-from vacances_scolaires_france import SchoolHolidayDates
+from vacances_scolaires_france import SchoolHolidayDates, UnsupportedYearException
 
 
 def lockdown_format_func(lockdown_idx: int) -> str:
@@ -16,26 +16,42 @@ def get_school_holidays_FR(years: List[int]) -> pd.DataFrame:
     Parameters
     ----------
     years: List[int]
-        List of years for which to retrieve holidays.
+        List of years for which to retrieve holidays, years missing from the calendar being skipped.
 
     Returns
     -------
     pd.DataFrame
         Holidays dataframe with columns 'ds' and 'holiday'.
     """
-
-    def _get_school_holidays_FR_for_year(year: int) -> pd.DataFrame:
-        fr_holidays = SchoolHolidayDates()
-        df_vacances = pd.DataFrame.from_dict(fr_holidays.holidays_for_year(year)).T.reset_index(
-            drop=True
-        )
-        df_vacances = df_vacances.rename(columns={"date": "ds", "nom_vacances": "holiday"})
-        df_vacances["holiday"] = df_vacances["holiday"].apply(
-            lambda x: re.sub(r"^Vacances (De|D')? ?(La )?", "School holiday: ", x.title())
-        )
-        df_vacances["ds"] = pd.to_datetime(df_vacances["ds"])
-        return df_vacances
-
-    school_holidays = pd.concat(map(_get_school_holidays_FR_for_year, years))
-    holidays_df = school_holidays[["holiday", "ds"]]
+    fr_holidays = _get_school_holiday_dates_FR()
+    calendar = dict()
+    for year in years:
+        try:
+            calendar.update(fr_holidays.holidays_for_year(year))
+        except UnsupportedYearException:
+            # Calendar is only published a few years ahead
+            continue
+    if len(calendar) == 0:
+        return pd.DataFrame({"holiday": pd.Series(dtype=str), "ds": pd.Series(dtype="M8[ns]")})
+    school_holidays = pd.DataFrame.from_dict(calendar, orient="index").reset_index(drop=True)
+    holidays_df = pd.DataFrame(
+        {
+            "holiday": school_holidays["nom_vacances"]
+            .str.title()
+            .str.replace(r"^Vacances (De|D')? ?(La )?", "School holiday: ", regex=True),
+            "ds": pd.to_datetime(school_holidays["date"]),
+        }
+    )
     return holidays_df
+
+
+@functools.lru_cache(maxsize=None)
+def _get_school_holiday_dates_FR() -> SchoolHolidayDates:
+    """Loads french school holidays calendar once per process.
+
+    Returns
+    -------
+    SchoolHolidayDates
+        French school holidays calendar.
+    """
+    return SchoolHolidayDates()
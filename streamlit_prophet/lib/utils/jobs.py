@@ -0,0 +1,306 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import concurrent.futures
+import contextvars
+import threading
+import time
+
+from streamlit_prophet.lib.utils.cache import LRUCache
+
+
+class Job:
+    """Function run in the background, whose progress and partial results can be polled from any
+    session, even after the session which submitted it was closed.
+
+    Parameters
+    ----------
+    job_id : str
+        Fingerprint of the job's inputs.
+    """
+
+    def __init__(self, job_id: str):
+        self.id = job_id
+        self.future: "concurrent.futures.Future[Any]" = concurrent.futures.Future()
+        self.submitted_at = time.time()
+        self.partial_results: List[Any] = []
+        self._progress: Tuple[str, int, int] = ("Waiting for a worker", 0, 0)
+        self._finalizers: List[Callable[[], None]] = []
+        self._finalized = False
+        self._lock = threading.Lock()
+
+    def report(self, stage: str, step: int = 0, n_steps: int = 0) -> None:
+        """Updates the progress of the job.
+
+        Parameters
+        ----------
+        stage : str
+            Description of the current stage.
+        step : int
+            Number of steps of the stage already done.
+        n_steps : int
+            Total number of steps of the stage, 0 if the stage has no steps.
+        """
+        with self._lock:
+            self._progress = (stage, step, n_steps)
+
+    def publish(self, result: Any) -> None:
+        """Makes a partial result available before the job ends.
+
+        Parameters
+        ----------
+        result : Any
+            Partial result, which must not be modified afterwards.
+        """
+        with self._lock:
+            self.partial_results.append(result)
+
+    def add_finalizer(self, finalizer: Callable[[], None]) -> None:
+        """Registers a function releasing a resource used by the job's results, called when the
+        job is forgotten, or immediately if it already is.
+
+        Parameters
+        ----------
+        finalizer : Callable
+            Function to call.
+        """
+        with self._lock:
+            if not self._finalized:
+                self._finalizers.append(finalizer)
+                return
+        finalizer()
+
+    def finalize(self) -> None:
+        """Calls the functions releasing the resources used by the job's results."""
+        with self._lock:
+            self._finalized = True
+            finalizers, self._finalizers = self._finalizers, []
+        for finalizer in finalizers:
+            finalizer()
+
+    def get_progress(self) -> Tuple[str, int, int]:
+        """Returns the progress of the job.
+
+        Returns
+        -------
+        str
+            Description of the current stage.
+        int
+            Number of steps of the stage already done.
+        int
+            Total number of steps of the stage, 0 if the stage has no steps.
+        """
+        with self._lock:
+            return self._progress
+
+    def get_n_results(self) -> int:
+        """Counts the results published so far, the final result included.
+
+        Returns
+        -------
+        int
+            Number of results.
+        """
+        with self._lock:
+            return len(self.partial_results) + int(self.future.done())
+
+    def get_latest_result(self) -> Any:
+        """Returns the final result if the job is done, or its latest partial result.
+
+        Returns
+        -------
+        Any
+            Latest result, None if no result was published yet.
+            If the job failed, its exception is raised.
+        """
+        if self.future.done():
+            return self.future.result()
+        with self._lock:
+            return self.partial_results[-1] if len(self.partial_results) > 0 else None
+
+    def done(self) -> bool:
+        """Tells whether the job is finished, successfully or not.
+
+        Returns
+        -------
+        bool
+            True if the job is finished.
+        """
+        return self.future.done()
+
+
+def _finalize_job(job: Job) -> None:
+    """Releases the resources used by the results of a job removed from the cache.
+
+    Parameters
+    ----------
+    job : Job
+        Job removed from the cache.
+    """
+    job.finalize()
+
+
+def _is_unfinished(job: Job) -> bool:
+    """Tells whether a job is still waiting or running, and must be kept in the cache.
+
+    Parameters
+    ----------
+    job : Job
+        Cached job.
+
+    Returns
+    -------
+    bool
+        True if the job is not finished.
+    """
+    return not job.done()
+
+
+# Jobs of all sessions, keyed by fingerprint of their inputs, so that sessions can reattach to them.
+# Only finished jobs are evicted.
+JOBS = LRUCache(maxsize=8, on_evict=_finalize_job, pinned=_is_unfinished)
+
+_CURRENT_JOB: "contextvars.ContextVar[Optional[Job]]" = contextvars.ContextVar(
+    "current_job", default=None
+)
+_EXECUTORS: Dict[int, concurrent.futures.ThreadPoolExecutor] = dict()
+_LOCK = threading.Lock()
+
+
+def submit_job(
+    job_id: str, func: Callable[..., Any], args: Tuple[Any, ...], config: Dict[Any, Any]
+) -> Job:
+    """Runs a function in the background, or returns the job already running it on the same inputs.
+
+    Jobs run in threads of the app's process, independently from sessions: closing the page does
+    not cancel them, and sessions submitting the same inputs later reattach to them.
+
+    Parameters
+    ----------
+    job_id : str
+        Fingerprint of the job's inputs.
+    func : Callable
+        Function to run.
+    args : Tuple
+        Arguments of the function, which must not be modified by the session afterwards.
+    config : Dict
+        Lib configuration dictionary, containing jobs specifications.
+
+    Returns
+    -------
+    Job
+        Job running the function.
+    """
+    with _LOCK:
+        job: Optional[Job] = JOBS.get(job_id)
+        if job is None or job.future.cancelled():
+            job = Job(job_id)
+            job.future = _get_executor(config).submit(_run_job, job, func, args)
+            JOBS.put(job_id, job)
+    return job
+
+
+def cancel_job(job_id: str) -> None:
+    """Cancels a job if it is still waiting for a worker. Running jobs are left unchanged.
+
+    Parameters
+    ----------
+    job_id : str
+        Fingerprint of the job's inputs.
+    """
+    job = JOBS.get(job_id)
+    if job is not None:
+        job.future.cancel()
+
+
+def report_progress(stage: str, step: int = 0, n_steps: int = 0) -> None:
+    """Updates the progress of the job running the current function, if any.
+
+    Parameters
+    ----------
+    stage : str
+        Description of the current stage.
+    step : int
+        Number of steps of the stage already done.
+    n_steps : int
+        Total number of steps of the stage, 0 if the stage has no steps.
+    """
+    job = _CURRENT_JOB.get()
+    if job is not None:
+        job.report(stage, step, n_steps)
+
+
+def publish_partial_result(result: Any) -> None:
+    """Makes a partial result of the job running the current function available, if any.
+
+    Parameters
+    ----------
+    result : Any
+        Partial result, which must not be modified afterwards.
+    """
+    job = _CURRENT_JOB.get()
+    if job is not None:
+        job.publish(result)
+
+
+def release_with_job(release: Callable[[], None]) -> None:
+    """Releases a resource used by the results of the current job when the job is forgotten,
+    or immediately outside jobs.
+
+    Parameters
+    ----------
+    release : Callable
+        Function releasing the resource.
+    """
+    job = _CURRENT_JOB.get()
+    if job is None:
+        release()
+    else:
+        job.add_finalizer(release)
+
+
+def _get_executor(config: Dict[Any, Any]) -> concurrent.futures.ThreadPoolExecutor:
+    """Returns the persistent executor running jobs, creating it on first use.
+
+    Parameters
+    ----------
+    config : Dict
+        Lib configuration dictionary, containing jobs specifications.
+
+    Returns
+    -------
+    concurrent.futures.ThreadPoolExecutor
+        Executor to submit jobs to.
+    """
+    n_workers = config["jobs"]["n_workers"]
+    executor = _EXECUTORS.get(n_workers)
+    if executor is None:
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=n_workers, thread_name_prefix="job"
+        )
+        _EXECUTORS[n_workers] = executor
+    return executor
+
+
+def _run_job(job: Job, func: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+    """Runs a job's function, its progress reports being sent to the job.
+
+    Parameters
+    ----------
+    job : Job
+        Job running the function.
+    func : Callable
+        Function to run.
+    args : Tuple
+        Arguments of the function.
+
+    Returns
+    -------
+    Any
+        Result of the function.
+    """
+    token = _CURRENT_JOB.set(job)
+    try:
+        job.report("Starting")
+        return func(*args)
+    finally:
+        _CURRENT_JOB.reset(token)
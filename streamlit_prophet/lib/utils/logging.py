@@ -1,31 +1,108 @@
-import os
+from typing import Iterator, List, Optional
 
+import contextvars
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
 
-class suppress_stdout_stderr:
+# Loggers of Prophet and CmdStanPy, whose messages are kept in memory instead of being printed.
+# CmdStan itself runs in child processes whose output is already redirected to files by CmdStanPy.
+FIT_LOGGERS = ["prophet", "cmdstanpy"]
+
+_CURRENT_FIT: "contextvars.ContextVar[Optional[str]]" = contextvars.ContextVar(
+    "current_fit", default=None
+)
+
+
+class FitLogBuffer(logging.Handler):
+    """Logging handler keeping the latest records in a bounded ring buffer, each record being
+    tagged with the name of the fit that logged it.
+
+    Parameters
+    ----------
+    maxlen : int
+        Maximum number of records kept, older records being dropped.
     """
-    A context manager for doing a "deep suppression" of stdout and stderr in
-    Python, i.e. will suppress all print, even if the print originates in a
-    compiled C/Fortran sub-function.
-       This will not suppress raised exceptions, since exceptions are printed
-    to stderr just before a script exits, and after the context manager has
-    exited (at least, I think that is why it lets exceptions through).
+
+    def __init__(self, maxlen: int):
+        super().__init__(level=logging.DEBUG)
+        self.records: "deque[logging.LogRecord]" = deque(maxlen=maxlen)
+        self.setFormatter(
+            logging.Formatter("%(asctime)s - %(fit)s - %(name)s - %(levelname)s - %(message)s")
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Keeps a record, the handler's lock being held by the logging module.
+
+        Parameters
+        ----------
+        record : logging.LogRecord
+            Logged record.
+        """
+        record.fit = _CURRENT_FIT.get()
+        self.records.append(record)
+
+    def get_logs(self, fit: Optional[str] = None, level: int = logging.DEBUG) -> List[str]:
+        """Returns the kept records as formatted lines, from oldest to latest.
+
+        Parameters
+        ----------
+        fit : str, optional
+            Name of the fit whose records are returned, by default records of all fits.
+        level : int
+            Minimum level of returned records.
+
+        Returns
+        -------
+        list
+            Formatted records.
+        """
+        with self.lock:  # type: ignore
+            records = list(self.records)
+        return [
+            self.format(record)
+            for record in records
+            if record.levelno >= level and (fit is None or getattr(record, "fit", None) == fit)
+        ]
+
+
+# Latest messages of Prophet and CmdStanPy, for diagnostics
+FIT_LOGS = FitLogBuffer(maxlen=1000)
+
+_INSTALL_LOCK = threading.Lock()
+
+
+def install_fit_logs_capture() -> None:
+    """Sends messages of Prophet and CmdStanPy to the fit logs buffer instead of the console.
+    Calling it again has no effect.
     """
+    with _INSTALL_LOCK:
+        for name in FIT_LOGGERS:
+            logger = logging.getLogger(name)
+            if FIT_LOGS not in logger.handlers:
+                # CmdStanPy only adds its console handler to loggers without handlers
+                logger.addHandler(FIT_LOGS)
+                logger.setLevel(logging.DEBUG)
+                logger.propagate = False
 
-    def __init__(self):
-        # Open a pair of null files
-        self.null_fds = [os.open(os.devnull, os.O_RDWR) for x in range(2)]
-        # Save the actual stdout (1) and stderr (2) file descriptors.
-        self.save_fds = [os.dup(1), os.dup(2)]
-
-    def __enter__(self):
-        # Assign the null pointers to stdout and stderr.
-        os.dup2(self.null_fds[0], 1)
-        os.dup2(self.null_fds[1], 2)
-
-    def __exit__(self, *_):
-        # Re-assign the real stdout/stderr back to (1) and (2)
-        os.dup2(self.save_fds[0], 1)
-        os.dup2(self.save_fds[1], 2)
-        # Close the null files
-        for fd in self.null_fds + self.save_fds:
-            os.close(fd)
+
+@contextmanager
+def capture_fit_logs(fit: str) -> Iterator[None]:
+    """Keeps messages logged by Prophet and CmdStanPy in the current thread in the fit logs
+    buffer, tagged with the fit's name, instead of printing them.
+
+    Unlike redirecting stdout and stderr file descriptors, which are shared by all threads of the
+    process, this is safe for fits running at the same time in different sessions.
+
+    Parameters
+    ----------
+    fit : str
+        Name of the fit, to find its messages in the buffer.
+    """
+    install_fit_logs_capture()
+    token = _CURRENT_FIT.set(fit)
+    try:
+        yield
+    finally:
+        _CURRENT_FIT.reset(token)
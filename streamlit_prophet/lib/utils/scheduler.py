@@ -0,0 +1,335 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import itertools
+import os
+import threading
+from contextlib import contextmanager
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from streamlit_prophet.lib.utils.executors import get_n_workers
+from streamlit_prophet.lib.utils.jobs import report_progress
+
+# Priorities of fits, lower values being admitted first
+INTERACTIVE = 0
+BATCH = 1
+
+
+class Ticket:
+    """Request of a fit to run, waiting for its share of the server's resources.
+
+    Parameters
+    ----------
+    session_id : str
+        Session requesting the fit.
+    cores : int
+        Number of cores used by the fit.
+    memory : int
+        Memory used by the fit, in MB.
+    priority : int
+        INTERACTIVE for single fits, BATCH for cross-validation and tuning.
+    seq : int
+        Order of arrival, breaking ties between requests with the same priority.
+    """
+
+    def __init__(self, session_id: str, cores: int, memory: int, priority: int, seq: int):
+        self.session_id = session_id
+        self.cores = cores
+        self.memory = memory
+        self.priority = priority
+        self.seq = seq
+        self.granted = False
+
+
+class FitScheduler:
+    """Admits the fits of all sessions within a global core and memory budget.
+
+    Waiting requests are admitted by priority, then by order of arrival. A request which does
+    not fit in the remaining budget blocks the ones after it, so that large fits are not starved
+    by small ones. Requests of sessions which already run as many fits as their quota allows
+    are skipped until one of these fits ends.
+
+    Parameters
+    ----------
+    n_cores : int
+        Cores shared by all fits.
+    memory : int
+        Memory shared by all fits in MB, 0 for no limit.
+    session_quota : int
+        Number of fits of a session run at the same time.
+    """
+
+    def __init__(self, n_cores: int, memory: int, session_quota: int):
+        self.n_cores = n_cores
+        self.memory = memory
+        self.session_quota = session_quota
+        self.waiting: List[Ticket] = []
+        self.running: List[Ticket] = []
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+
+    def request(self, session_id: str, cores: int, memory: int, priority: int) -> Ticket:
+        """Queues a fit, requests larger than the whole budget being reduced to it.
+
+        Parameters
+        ----------
+        session_id : str
+            Session requesting the fit.
+        cores : int
+            Number of cores used by the fit.
+        memory : int
+            Memory used by the fit, in MB.
+        priority : int
+            INTERACTIVE for single fits, BATCH for cross-validation and tuning.
+
+        Returns
+        -------
+        Ticket
+            Request to wait for, and to release once the fit is done.
+        """
+        cores = max(1, min(cores, self.n_cores))
+        memory = min(memory, self.memory) if self.memory > 0 else 0
+        with self._condition:
+            ticket = Ticket(session_id, cores, memory, priority, next(self._seq))
+            self.waiting.append(ticket)
+            self.waiting.sort(key=lambda t: (t.priority, t.seq))
+            self._admit()
+        return ticket
+
+    def wait(self, ticket: Ticket, timeout: Optional[float] = None) -> bool:
+        """Waits until a request is admitted.
+
+        Parameters
+        ----------
+        ticket : Ticket
+            Queued request.
+        timeout : float, optional
+            Maximum number of seconds to wait, by default no limit.
+
+        Returns
+        -------
+        bool
+            True if the request is admitted, False if the timeout expired before.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: ticket.granted, timeout)
+
+    def release(self, ticket: Ticket) -> None:
+        """Frees the resources of an admitted request, or removes it from the queue.
+
+        Parameters
+        ----------
+        ticket : Ticket
+            Request to release.
+        """
+        with self._condition:
+            if ticket in self.running:
+                self.running.remove(ticket)
+            elif ticket in self.waiting:
+                self.waiting.remove(ticket)
+            self._admit()
+
+    def get_queue_position(self, ticket: Ticket) -> int:
+        """Returns the position of a request in the queue.
+
+        Parameters
+        ----------
+        ticket : Ticket
+            Queued request.
+
+        Returns
+        -------
+        int
+            1 for the next request to be admitted, 0 if the request is already admitted.
+        """
+        with self._condition:
+            if ticket not in self.waiting:
+                return 0
+            return self.waiting.index(ticket) + 1
+
+    def get_usage(self) -> Tuple[int, int]:
+        """Returns the resources used by admitted fits.
+
+        Returns
+        -------
+        int
+            Number of cores used.
+        int
+            Memory used, in MB.
+        """
+        with self._condition:
+            return sum(t.cores for t in self.running), sum(t.memory for t in self.running)
+
+    def _admit(self) -> None:
+        """Admits waiting requests in order while they fit in the budget, the lock being held."""
+        cores, memory = sum(t.cores for t in self.running), sum(t.memory for t in self.running)
+        for ticket in list(self.waiting):
+            n_session_fits = sum(t.session_id == ticket.session_id for t in self.running)
+            if n_session_fits >= self.session_quota:
+                continue
+            fits_cores = cores + ticket.cores <= self.n_cores
+            fits_memory = self.memory <= 0 or memory + ticket.memory <= self.memory
+            if not (fits_cores and fits_memory):
+                break
+            self.waiting.remove(ticket)
+            self.running.append(ticket)
+            ticket.granted = True
+            cores, memory = cores + ticket.cores, memory + ticket.memory
+        self._condition.notify_all()
+
+
+_SCHEDULERS: Dict[Tuple[int, int, int], FitScheduler] = dict()
+_LOCK = threading.Lock()
+
+
+def get_scheduler(config: Dict[Any, Any]) -> FitScheduler:
+    """Returns the persistent scheduler described in config, creating it on first use.
+
+    Parameters
+    ----------
+    config : Dict
+        Lib configuration dictionary, containing scheduler specifications.
+
+    Returns
+    -------
+    FitScheduler
+        Scheduler shared by all sessions.
+    """
+    scheduler_config = config["scheduler"]
+    n_cores = scheduler_config["n_cores"] or os.cpu_count() or 1
+    key = (n_cores, scheduler_config["memory"], scheduler_config["session_quota"])
+    with _LOCK:
+        scheduler = _SCHEDULERS.get(key)
+        if scheduler is None:
+            scheduler = FitScheduler(*key)
+            _SCHEDULERS[key] = scheduler
+    return scheduler
+
+
+def get_fit_demand(config: Dict[Any, Any], parallel: bool) -> Tuple[int, int]:
+    """Estimates the resources used by a fit.
+
+    Parameters
+    ----------
+    config : Dict
+        Lib configuration dictionary, containing executor and scheduler specifications.
+    parallel : bool
+        Whether the fit runs cross-validation folds or tuning candidates with the executor.
+
+    Returns
+    -------
+    int
+        Number of cores used.
+    int
+        Memory used, in MB.
+    """
+    cores = 1
+    if parallel and config["executor"]["mode"] != "serial":
+        cores = get_n_workers(config)
+    return cores, cores * config["scheduler"]["fit_memory"]
+
+
+def get_session_id() -> str:
+    """Returns the id of the session running the current script, empty outside sessions.
+
+    Returns
+    -------
+    str
+        Session id.
+    """
+    ctx = get_script_run_ctx()
+    return "" if ctx is None else ctx.session_id
+
+
+@contextmanager
+def admit_fit(
+    config: Dict[Any, Any],
+    session_id: str,
+    parallel: bool,
+    on_wait: Optional[Callable[[int], None]] = None,
+) -> Iterator[None]:
+    """Waits until a fit can run within the server's budget, and frees its resources when done.
+
+    Parameters
+    ----------
+    config : Dict
+        Lib configuration dictionary, containing executor and scheduler specifications.
+    session_id : str
+        Session requesting the fit.
+    parallel : bool
+        Whether the fit runs cross-validation folds or tuning candidates, which makes it a
+        large batch fit with a lower priority than single fits.
+    on_wait : Callable, optional
+        Function called with the queue position of the fit while it waits.
+    """
+    scheduler = get_scheduler(config)
+    cores, memory = get_fit_demand(config, parallel)
+    ticket = scheduler.request(session_id, cores, memory, BATCH if parallel else INTERACTIVE)
+    try:
+        position = scheduler.get_queue_position(ticket)
+        while position > 0:
+            if on_wait is not None:
+                on_wait(position)
+            scheduler.wait(ticket, timeout=config["jobs"]["poll_interval"])
+            position = scheduler.get_queue_position(ticket)
+        yield
+    finally:
+        scheduler.release(ticket)
+
+
+def run_admitted(
+    config: Dict[Any, Any],
+    session_id: str,
+    parallel: bool,
+    func: Callable[..., Any],
+    args: Tuple[Any, ...],
+) -> Any:
+    """Runs a function once admitted by the scheduler, the queue position being reported as the
+    progress of the current job.
+
+    Parameters
+    ----------
+    config : Dict
+        Lib configuration dictionary, containing executor and scheduler specifications.
+    session_id : str
+        Session requesting the fit.
+    parallel : bool
+        Whether the function runs cross-validation folds or tuning candidates.
+    func : Callable
+        Function to run.
+    args : Tuple
+        Arguments of the function.
+
+    Returns
+    -------
+    Any
+        Result of the function.
+    """
+    with admit_fit(config, session_id, parallel, on_wait=_report_queue_position):
+        return func(*args)
+
+
+def _report_queue_position(position: int) -> None:
+    """Reports the queue position of the current job as its progress.
+
+    Parameters
+    ----------
+    position : int
+        Position of the job in the queue.
+    """
+    report_progress(get_queue_message(position))
+
+
+def get_queue_message(position: int) -> str:
+    """Describes the position of a fit in the queue, for display.
+
+    Parameters
+    ----------
+    position : int
+        Position of the fit in the queue.
+
+    Returns
+    -------
+    str
+        Message to display.
+    """
+    return f"Waiting for other fits to finish, position {position} in queue"
@@ -0,0 +1,263 @@
+from typing import Any, Hashable, Iterator, List, NamedTuple
+
+import atexit
+import pickle
+import threading
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from streamlit_prophet.lib.utils.cache import LRUCache, SharedCache, hash_dataframe
+
+# Objects already loaded by this process, keyed by shared memory block name
+LOADED_OBJECTS = LRUCache(maxsize=8)
+# Dataframes published by this process, keyed by fingerprint, freed once evicted and not in use
+PUBLISHED_FRAMES = SharedCache(
+    max_bytes=256 * 2**20, sizeof=lambda frame: frame.size, on_evict=lambda frame: frame.release()
+)
+# Dataframes attached by this process, with the block backing them, keyed by block name
+ATTACHED_FRAMES = LRUCache(maxsize=8, on_evict=lambda attached: _detach_block(attached[0]))
+
+# Blocks of evicted attached dataframes, closed once no view on them is in use anymore
+_DETACHED_BLOCKS: List[shared_memory.SharedMemory] = []
+_DETACHED_LOCK = threading.Lock()
+
+# Column offsets are aligned on cache lines
+_ALIGNMENT = 64
+
+
+class SharedObject:
+    """Pickled object published once in a shared memory block, that worker processes load by name.
+
+    Parameters
+    ----------
+    obj : Any
+        Object to publish.
+    """
+
+    def __init__(self, obj: Any):
+        payload = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        self.size = len(payload)
+        self.block = shared_memory.SharedMemory(create=True, size=max(self.size, 1))
+        _get_buffer(self.block)[: self.size] = payload
+        self.name = self.block.name
+
+    def release(self) -> None:
+        """Frees the shared memory block, once no task needs the object anymore."""
+        self.block.close()
+        self.block.unlink()
+
+    def __enter__(self) -> "SharedObject":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.release()
+
+
+def load_shared_object(name: str, size: int) -> Any:
+    """Loads an object published in shared memory, each process unpickling it only once.
+
+    Parameters
+    ----------
+    name : str
+        Name of the shared memory block.
+    size : int
+        Size of the pickled object, in bytes.
+
+    Returns
+    -------
+    Any
+        Published object.
+    """
+    obj = LOADED_OBJECTS.get(name)
+    if obj is None:
+        block = _attach_block(name)
+        try:
+            obj = pickle.loads(_get_buffer(block)[:size])
+        finally:
+            block.close()
+        LOADED_OBJECTS.put(name, obj)
+    return obj
+
+
+class SharedFrameHandle(NamedTuple):
+    """Description of a dataframe published in shared memory, small enough to be sent with
+    each task."""
+
+    name: str
+    columns: List[Hashable]
+    dtypes: List[str]
+    offsets: List[int]
+    n_rows: int
+
+
+class SharedFrame:
+    """Dataframe published once in a shared memory block, column by column, that worker processes
+    attach by name without copying it.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe to publish, its columns must have numeric, boolean or datetime types.
+        Its index is not published.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        arrays = [np.ascontiguousarray(df[col].to_numpy()) for col in df.columns]
+        offsets, size = [], 0
+        for col, array in zip(df.columns, arrays):
+            if array.dtype.kind not in "biufcmM":
+                raise TypeError(
+                    f"Column '{col}' of type {array.dtype} can't be published in shared memory."
+                )
+            size = -(-size // _ALIGNMENT) * _ALIGNMENT
+            offsets.append(size)
+            size += array.nbytes
+        self.size = size
+        self.block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for array, offset in zip(arrays, offsets):
+            view = np.ndarray(
+                array.shape, dtype=array.dtype, buffer=_get_buffer(self.block), offset=offset
+            )
+            view[:] = array
+            del view
+        self.handle = SharedFrameHandle(
+            self.block.name,
+            list(df.columns),
+            [array.dtype.str for array in arrays],
+            offsets,
+            len(df),
+        )
+
+    def release(self) -> None:
+        """Frees the shared memory block. Processes that attached it keep their views valid."""
+        self.block.close()
+        self.block.unlink()
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.release()
+
+
+@contextmanager
+def publish_frame(df: pd.DataFrame) -> Iterator[SharedFrameHandle]:
+    """Publishes a dataframe in shared memory, unless the same data has already been published.
+    The dataframe stays published at least until the end of the with block, so the tasks using
+    it must be finished by then.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe to publish, with numeric, boolean or datetime columns.
+
+    Yields
+    ------
+    SharedFrameHandle
+        Description of the published dataframe, to send to worker processes.
+    """
+    key = (hash_dataframe(df), str(list(df.dtypes)))
+    frame, entry = PUBLISHED_FRAMES.acquire(key, lambda: SharedFrame(df))
+    try:
+        yield frame.handle
+    finally:
+        PUBLISHED_FRAMES.release(entry)
+
+
+def attach_frame(handle: SharedFrameHandle) -> pd.DataFrame:
+    """Builds a dataframe from read-only views on a published dataframe, without copying its data.
+    Each process attaches a given block only once.
+
+    Parameters
+    ----------
+    handle : SharedFrameHandle
+        Description of the published dataframe.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataframe backed by shared memory, with a default index.
+    """
+    _close_detached_blocks()
+    attached = ATTACHED_FRAMES.get(handle.name)
+    if attached is None:
+        block = _attach_block(handle.name)
+        columns = dict()
+        for col, dtype, offset in zip(handle.columns, handle.dtypes, handle.offsets):
+            # Views export the block's memory, which prevents closing the block while they exist
+            view = np.frombuffer(
+                _get_buffer(block), dtype=np.dtype(dtype), count=handle.n_rows, offset=offset
+            )
+            view.flags.writeable = False
+            columns[col] = view
+        attached = (block, pd.DataFrame(columns, columns=handle.columns, copy=False))
+        ATTACHED_FRAMES.put(handle.name, attached)
+    df: pd.DataFrame = attached[1]
+    return df
+
+
+def _detach_block(block: shared_memory.SharedMemory) -> None:
+    """Closes the block of an evicted attached dataframe once no view on it is in use anymore.
+
+    Parameters
+    ----------
+    block : shared_memory.SharedMemory
+        Attached block.
+    """
+    with _DETACHED_LOCK:
+        _DETACHED_BLOCKS.append(block)
+    _close_detached_blocks()
+
+
+def _close_detached_blocks() -> None:
+    """Closes the blocks of evicted attached dataframes whose views are not in use anymore."""
+    with _DETACHED_LOCK:
+        for block in list(_DETACHED_BLOCKS):
+            try:
+                block.close()
+            except BufferError:  # Views on the block are still used, e.g. by a running task
+                continue
+            _DETACHED_BLOCKS.remove(block)
+
+
+def _get_buffer(block: shared_memory.SharedMemory) -> memoryview:
+    """Returns the memory of an open shared memory block.
+
+    Parameters
+    ----------
+    block : shared_memory.SharedMemory
+        Shared memory block.
+
+    Returns
+    -------
+    memoryview
+        Memory of the block.
+    """
+    buffer = block.buf
+    if buffer is None:
+        raise ValueError(f"Shared memory block '{block.name}' is closed.")
+    return buffer
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    """Attaches an existing shared memory block, without taking part in its lifetime management.
+
+    Parameters
+    ----------
+    name : str
+        Name of the shared memory block.
+
+    Returns
+    -------
+    shared_memory.SharedMemory
+        Attached block.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore
+    except TypeError:  # Python < 3.13 registers attached blocks in the shared resource tracker
+        return shared_memory.SharedMemory(name=name)
+
+
+atexit.register(PUBLISHED_FRAMES.clear)
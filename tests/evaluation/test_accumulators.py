@@ -0,0 +1,72 @@
+import itertools
+import pickle
+
+import numpy as np
+import pytest
+from streamlit_prophet.lib.evaluation.accumulators import MetricsAccumulator
+from streamlit_prophet.lib.evaluation.metrics import _compute_metrics
+from streamlit_prophet.lib.evaluation.preparation import add_time_groupers
+from tests.samples.df import df_test
+from tests.samples.dict import make_eval_test
+
+
+@pytest.mark.parametrize(
+    "df, eval, n_chunks",
+    list(
+        itertools.product(
+            [df_test[17], df_test[18], df_test[19]],
+            [
+                make_eval_test(granularity="Day of Week"),
+                make_eval_test(granularity="Weekly", get_perf_on_agg_forecast=True),
+                make_eval_test(granularity="Monthly"),
+                make_eval_test(granularity="Global"),
+            ],
+            [1, 7],
+        )
+    ),
+)
+def test_metrics_accumulator(df, eval, n_chunks):
+    df = add_time_groupers(df)
+    expected = _compute_metrics(df, eval)
+    chunks = np.array_split(df.sample(frac=1, random_state=42), n_chunks)
+    workers = [MetricsAccumulator(eval).update(chunk) for chunk in chunks]
+    # Accumulators are sent back from worker processes as pickles
+    workers = [pickle.loads(pickle.dumps(worker)) for worker in workers]
+    accumulator = MetricsAccumulator(eval)
+    for worker in workers:
+        accumulator.merge(worker)
+    output = accumulator.get_metrics_df()
+    # Merged accumulator should have the same columns and groups as _compute_metrics output
+    assert list(output.columns) == list(expected.columns)
+    assert list(output[eval["granularity"]]) == list(expected[eval["granularity"]])
+    # Merged accumulator should give the same metrics as _compute_metrics, up to rounding errors
+    cols = [col for col in expected.columns if col != eval["granularity"]]
+    np.testing.assert_allclose(
+        output[cols].to_numpy(dtype=float),
+        expected[cols].to_numpy(dtype=float),
+        rtol=1e-12,
+        atol=1e-12,
+    )
+    # Chunks and merge order should not change accumulated metrics at all
+    single = MetricsAccumulator(eval).update(df).get_metrics_df()
+    np.testing.assert_array_equal(
+        output[cols].to_numpy(dtype=float), single[cols].to_numpy(dtype=float)
+    )
+
+
+def test_metrics_accumulator_series():
+    eval = make_eval_test(granularity="Monthly")
+    accumulator = MetricsAccumulator(eval)
+    accumulator.update(df_test[17], series="A").update(df_test[19], series="B")
+    output = accumulator.get_all_metrics_df()
+    # Metrics should be partitioned by series
+    assert accumulator.get_series() == ["A", "B"]
+    assert set(output["series"]) == {"A", "B"}
+    # Each series should give the same metrics as if it was evaluated on its own
+    for series, df in [("A", df_test[17]), ("B", df_test[19])]:
+        expected = _compute_metrics(add_time_groupers(df), eval)
+        np.testing.assert_allclose(
+            accumulator.get_metrics_df(series)[eval["metrics"]].to_numpy(dtype=float),
+            expected[eval["metrics"]].to_numpy(dtype=float),
+            rtol=1e-12,
+        )
@@ -3,11 +3,25 @@ import itertools
 import numpy as np
 import pandas as pd
 import pytest
-from streamlit_prophet.lib.evaluation.metrics import MAE, MAPE, MSE, RMSE, SMAPE, _compute_metrics
+from streamlit_prophet.lib.evaluation.metrics import (
+    MAE,
+    MAPE,
+    MSE,
+    RMSE,
+    SMAPE,
+    _compute_bootstrap_intervals,
+    _compute_metrics,
+    _draw_block_bootstrap_indices,
+)
 from streamlit_prophet.lib.evaluation.preparation import add_time_groupers
+from streamlit_prophet.lib.utils.load import load_config
 from tests.samples.df import df_test
 from tests.samples.dict import make_eval_test
 
+config, _, _ = load_config(
+    "config_streamlit.toml", "config_instructions.toml", "config_readme.toml"
+)
+
 
 @pytest.mark.parametrize(
     "y_true, y_pred, expected_min, expected_max",
@@ -128,3 +142,43 @@ def test_compute_metrics(df, eval):
     assert sorted(output.columns) == sorted(
         expected_cols + ["forecast", "truth"] if eval["get_perf_on_agg_forecast"] else expected_cols
     )
+
+
+@pytest.mark.parametrize(
+    "n, n_replicates, block_size",
+    [(100, 50, 0), (100, 50, 7), (10, 20, 20), (1, 5, 0), (0, 5, 0)],
+)
+def test_draw_block_bootstrap_indices(n, n_replicates, block_size):
+    output = _draw_block_bootstrap_indices(n, n_replicates, block_size, np.random.default_rng(42))
+    # Indices array should have one row per replicate and one column per observation
+    assert output.shape == (n_replicates, n)
+    # All indices should be valid positions in the resampled series
+    assert ((output >= 0) & (output < max(n, 1))).all()
+
+
+@pytest.mark.parametrize(
+    "df, eval",
+    list(
+        itertools.product(
+            [df_test[17], df_test[18], df_test[19]],
+            [
+                make_eval_test(granularity="Global"),
+                make_eval_test(granularity="Monthly"),
+                make_eval_test(granularity="Weekly", get_perf_on_agg_forecast=True),
+            ],
+        )
+    ),
+)
+def test_compute_bootstrap_intervals(df, eval):
+    df = add_time_groupers(df)
+    output = _compute_bootstrap_intervals(df, eval, config)
+    lower_cols = [f"{m} lower" for m in eval["metrics"]]
+    upper_cols = [f"{m} upper" for m in eval["metrics"]]
+    # There should be one row per group at the selected granularity
+    assert len(output) == df[eval["granularity"]].nunique()
+    # There shouldn't be any NaN values in intervals dataframe
+    assert output[lower_cols + upper_cols].isnull().sum().sum() == 0
+    # Lower bounds should never be greater than upper bounds
+    assert (output[lower_cols].values <= output[upper_cols].values).all()
+    # Intervals should be reproducible with the seed from config
+    assert output.equals(_compute_bootstrap_intervals(df, eval, config))
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from streamlit_prophet.lib.exposition.downsampling import downsample_figure, lttb_indices
+
+
+@pytest.mark.parametrize(
+    "n, n_out",
+    [(10000, 500), (1000, 999), (1000, 3), (100, 200)],
+)
+def test_lttb_indices(n, n_out):
+    x = np.arange(n, dtype=float)
+    y = np.sin(x / 50) + np.random.default_rng(42).normal(scale=0.1, size=n)
+    y[n // 3] = 10.0
+    indices = lttb_indices(x, y, n_out)
+    # Output should keep the requested number of sorted points, including both ends
+    assert len(indices) == min(n, n_out)
+    assert (np.diff(indices) > 0).all()
+    assert indices[0] == 0 and indices[-1] == n - 1
+    # Peaks should be kept
+    if n_out > 3:
+        assert n // 3 in indices
+
+
+def test_lttb_indices_missing_values():
+    y = np.random.default_rng(42).normal(size=1000)
+    y[100:300] = np.nan
+    indices = lttb_indices(np.arange(1000, dtype=float), y, 100)
+    # Missing values should only be selected in buckets without any value
+    assert np.isnan(y[indices]).sum() <= 200 / (1000 / 98) + 1
+
+
+def make_figure(n):
+    dates = pd.date_range("2015-01-01", periods=n, freq="h")
+    values = np.random.default_rng(42).normal(size=n)
+    fig = go.Figure(go.Scatter(x=dates, y=values, mode="markers", customdata=np.arange(n)))
+    fig.add_trace(go.Scatter(x=dates, y=values, fill="tonexty", mode="lines"))
+    fig.add_trace(go.Scatter(x=["a", "b"], y=[1, 2]))
+    return fig
+
+
+@pytest.mark.parametrize(
+    "n, max_points, webgl_threshold, x_range, expected_points, expected_type",
+    [
+        (50000, 2000, 5000, None, 2000, "scatter"),
+        (50000, 0, 5000, None, 50000, "scattergl"),
+        (3000, 2000, 1000, None, 2000, "scattergl"),
+        (50000, 2000, 5000, ("2016-01-01", "2016-01-10"), 217, "scatter"),
+    ],
+)
+def test_downsample_figure(n, max_points, webgl_threshold, x_range, expected_points, expected_type):
+    fig = make_figure(n)
+    output = downsample_figure(fig, max_points, webgl_threshold, x_range)
+    # Long traces should be downsampled or cropped, and drawn with WebGL above threshold
+    assert [len(trace.x) for trace in output.data] == [expected_points, expected_points, 2]
+    assert [trace.type for trace in output.data[:2]] == [expected_type] * 2
+    # Points should keep their attributes, and input figure should be unchanged
+    first = output.data[0]
+    assert (first.y == fig.data[0].y[first.customdata]).all()
+    assert len(fig.data[0].x) == n
+    if x_range is not None:
+        assert output.layout.xaxis.range == x_range
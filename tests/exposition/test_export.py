@@ -0,0 +1,106 @@
+import gzip
+import io
+from zipfile import ZipFile
+
+import pandas as pd
+import plotly.express as px
+import pytest
+from streamlit_prophet.lib.exposition.export import (
+    REPORTS_CACHE,
+    create_report_zip_file,
+    get_dataframe_download_data,
+)
+from streamlit_prophet.lib.utils.load import load_config
+from tests.samples.df import df_test
+from tests.samples.dict import make_cleaning_test, make_params_test, make_resampling_test
+
+config, _, _ = load_config(
+    "config_streamlit.toml", "config_instructions.toml", "config_readme.toml"
+)
+
+
+def make_report_zip_file(report, layout="separate"):
+    return create_report_zip_file(
+        report,
+        {**config, "report": {**config["report"], "layout": layout}},
+        False,
+        True,
+        True,
+        make_cleaning_test(),
+        make_resampling_test(),
+        make_params_test(),
+        {"forecast_horizon": 30},
+        "date",
+        "target",
+        {},
+    )
+
+
+def test_create_report_zip_file():
+    REPORTS_CACHE.clear()
+    df = df_test[8]
+    report = [
+        {"object": px.line(df, x="ds", y="y"), "name": "overview", "type": "plot"},
+        {"object": df, "name": "forecast", "type": "dataset"},
+    ]
+    zip_bytes = make_report_zip_file(report)
+    with ZipFile(io.BytesIO(zip_bytes)) as zip_file:
+        names = sorted(name.split("/", 1)[1] for name in zip_file.namelist())
+        data = [name for name in zip_file.namelist() if name.endswith("forecast.csv")][0]
+        n_lines = len(zip_file.read(data).decode().splitlines())
+    # Zip file should contain all plots, datasets and configs
+    assert names == [
+        "config/default_config.toml",
+        "config/user_specifications.toml",
+        "data/forecast.csv",
+        "plots/overview.html",
+        "plots/plotly.min.js",
+    ]
+    assert n_lines == len(df) + 1
+    # Unchanged report should be read from cache, a changed one should be built again
+    assert make_report_zip_file(report) is zip_bytes
+    assert make_report_zip_file(report[1:]) is not zip_bytes
+    assert (REPORTS_CACHE.misses, REPORTS_CACHE.hits) == (2, 1)
+
+
+def test_create_report_zip_file_single():
+    df = df_test[8]
+    report = [
+        {"object": px.line(df, x="ds", y="y"), "name": name, "type": "plot"}
+        for name in ["overview", "future"]
+    ]
+    with ZipFile(io.BytesIO(make_report_zip_file(report, "single"))) as zip_file:
+        names = sorted(name.split("/", 1)[1] for name in zip_file.namelist())
+        page = zip_file.read([name for name in zip_file.namelist() if name.endswith(".html")][0])
+    # All plots should be in a single page, including plotly.js once
+    assert names == ["config/default_config.toml", "config/user_specifications.toml", "report.html"]
+    assert page.decode().count("<h2>") == 2
+    assert page.decode().count("<script type='text/javascript'>") == 1
+
+
+@pytest.mark.parametrize(
+    "file_format, read",
+    [
+        ("csv", lambda data: pd.read_csv(io.BytesIO(data), index_col=0, parse_dates=["ds"])),
+        (
+            "compressed csv",
+            lambda data: pd.read_csv(
+                io.BytesIO(gzip.decompress(data)), index_col=0, parse_dates=["ds"]
+            ),
+        ),
+        ("parquet", lambda data: pd.read_parquet(io.BytesIO(data))),
+    ],
+)
+def test_get_dataframe_download_data(file_format, read):
+    df = df_test[20]
+    data = get_dataframe_download_data(df, file_format)
+    # Downloaded file should contain the whole dataframe
+    pd.testing.assert_frame_equal(read(data), df, check_dtype=False, check_freq=False)
+    # Same dataframe should give the same file
+    assert get_dataframe_download_data(df, file_format) == data
+
+
+def test_get_dataframe_download_data_unknown_format():
+    # Unknown formats should be rejected
+    with pytest.raises(ValueError):
+        get_dataframe_download_data(df_test[20], "xlsx")
@@ -0,0 +1,61 @@
+import pandas as pd
+import plotly.express as px
+import pytest
+from streamlit_prophet.lib.exposition.figures import (
+    DERIVED_MAXSIZE,
+    FIGURES_CACHE,
+    get_derived_figure_data,
+    get_figure,
+)
+from streamlit_prophet.lib.exposition.visualize import plot_forecasts_vs_truth
+from tests.samples.df import df_test
+
+STYLE = {"colors": ["#002244", "#ff0066", "#66cccc"], "color_axis": "#000000"}
+
+
+def make_eval_df(df):
+    return pd.DataFrame({"ds": df["ds"], "truth": df["y"], "forecast": df["y"] * 1.1})
+
+
+@pytest.mark.parametrize(
+    "inputs, expected_misses",
+    [
+        ([(df_test[8], STYLE), (df_test[8].copy(), dict(STYLE))], 1),
+        ([(df_test[8], STYLE), (df_test[9], STYLE)], 2),
+        ([(df_test[8], STYLE), (df_test[8], {**STYLE, "colors": ["#000000"] * 3})], 2),
+    ],
+)
+def test_get_figure(inputs, expected_misses):
+    FIGURES_CACHE.clear()
+    figures = [
+        get_figure("vs_truth", plot_forecasts_vs_truth, make_eval_df(df), "y", False, style)
+        for df, style in inputs
+    ]
+    # Figures should only be built again when their data or style change
+    assert (FIGURES_CACHE.misses, FIGURES_CACHE.hits) == (expected_misses, 2 - expected_misses)
+    assert (figures[0] is figures[1]) == (expected_misses == 1)
+
+
+def test_get_derived_figure_data():
+    FIGURES_CACHE.clear()
+    df = make_eval_df(df_test[8])
+    fig = get_figure("vs_truth", plot_forecasts_vs_truth, df, "y", False, STYLE)
+    calls = []
+
+    def derive(fig):
+        calls.append(fig)
+        return fig.to_json()
+
+    data = [get_derived_figure_data(fig, "json", derive) for _ in range(2)]
+    # Data derived from cached figures should be computed once, and reused on reruns
+    assert len(calls) == 1 and data[0] is data[1]
+    # Data derived from figures which are not cached should be computed on each call
+    other_fig = px.line(df, x="ds", y="truth")
+    get_derived_figure_data(other_fig, "json", derive)
+    get_derived_figure_data(other_fig, "json", derive)
+    assert len(calls) == 3
+    # Only the most recently derived versions of a figure should be kept with it
+    for i in range(DERIVED_MAXSIZE):
+        get_derived_figure_data(fig, ("json", i), derive)
+    get_derived_figure_data(fig, "json", derive)
+    assert len(calls) == 3 + DERIVED_MAXSIZE + 1
@@ -0,0 +1,10 @@
+from streamlit_prophet.lib.exposition.panels import get_panels_report
+
+
+def test_get_panels_report():
+    report = [{"object": None, "name": "preview", "type": "metrics"}]
+    panels = {"overview": [{"object": None, "name": "overview", "type": "plot"}], "future": []}
+    # Components outside panels should come first, followed by panels in display order
+    assert [c["name"] for c in get_panels_report(report, panels)] == ["preview", "overview"]
+    # Report components displayed outside panels should be left unchanged
+    assert len(report) == 1
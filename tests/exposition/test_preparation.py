@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit_prophet.lib.exposition.preparation import (
+    COMPONENTS_CACHE,
+    get_forecast_components,
+    group_components,
+)
+from streamlit_prophet.lib.models.predict import predict_forecast_df
+from streamlit_prophet.lib.models.prophet import instantiate_prophet_model
+from tests.samples.df import df_test
+from tests.samples.dict import make_params_test
+
+
+def fit_holidays_model(seasonality_mode):
+    df = df_test[20][["ds", "y"]].copy()
+    df["y"] += 50
+    params = make_params_test()
+    params["holidays"].update({"country": "FR", "school_holidays": True})
+    params["other"]["seasonality_mode"] = seasonality_mode
+    dates = {"train_start_date": df["ds"].min(), "train_end_date": df["ds"].max()}
+    model = instantiate_prophet_model(params, dates=dates)
+    model.uncertainty_samples = 0
+    model.fit(df.iloc[:2000], seed=42)
+    return model, predict_forecast_df(model, df.drop("y", axis=1).iloc[1500:2500])
+
+
+@pytest.mark.parametrize("seasonality_mode", ["additive", "multiplicative"])
+def test_get_forecast_components(seasonality_mode):
+    model, forecast = fit_holidays_model(seasonality_mode)
+    components = get_forecast_components(model, forecast)
+    # Holidays should be grouped, each holiday remaining a separate column in the forecast
+    assert {"Public holidays", "School holidays", "trend", "yearly", "weekly"} == set(
+        components.columns
+    )
+    assert "holidays" not in components.columns
+    # Components should be in the prediction's unit and sum to the prediction
+    assert np.allclose(components.sum(axis=1), forecast["yhat"].values)
+    assert (components.index == forecast["ds"].values).all()
+
+
+def test_get_forecast_components_cache():
+    COMPONENTS_CACHE.clear()
+    model, forecast = fit_holidays_model("additive")
+    components = get_forecast_components(model, forecast, True)
+    components["yhat"] = 0
+    output = get_forecast_components(model, forecast.copy(), True)
+    # Same forecast should be read from cache, and cached components should not be modified
+    assert (COMPONENTS_CACHE.misses, COMPONENTS_CACHE.hits) == (1, 1)
+    assert np.allclose(output["yhat"], forecast["yhat"].values)
+
+
+def test_group_components():
+    components = pd.DataFrame(
+        {"a": [1.0, 2.0], "b": [3.0, np.nan], "c": [5.0, 6.0], "d": [7.0, 8.0]}
+    )
+    mapping = {"a": ["a"], "Group": ["b", "c"], "_to_drop_": ["d"]}
+    output = group_components(components, mapping)
+    # Groups should be summed, missing values skipped, and dropped columns removed
+    expected = pd.DataFrame({"a": [1.0, 2.0], "Group": [8.0, 6.0]})
+    pd.testing.assert_frame_equal(output, expected)
@@ -0,0 +1,38 @@
+import base64
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+from streamlit_prophet.lib.exposition.serialization import get_compact_figure_json
+
+
+def decode(typed_array):
+    return np.frombuffer(base64.b64decode(typed_array["bdata"]), dtype=typed_array["dtype"])
+
+
+@pytest.mark.parametrize("float_precision, dtype", [("float32", "f4"), ("float64", "f8")])
+def test_get_compact_figure_json(float_precision, dtype):
+    dates = pd.date_range("2020-01-01", periods=100, freq="h")
+    y = np.random.default_rng(42).normal(size=100)
+    fig = go.Figure(
+        go.Scatter(x=dates.to_pydatetime(), y=y, customdata=np.arange(100), name="</script>")
+    )
+    trace = json.loads(get_compact_figure_json(fig, float_precision))["data"][0]
+    # Numeric arrays should be typed arrays with the chosen precision, integers kept exact
+    assert trace["y"]["dtype"] == dtype
+    assert np.allclose(decode(trace["y"]), y, rtol=1e-6)
+    assert (decode(trace["customdata"]) == np.arange(100)).all()
+    # Dates should be ISO strings, and texts should not close html scripts
+    assert trace["x"][:2] == ["2020-01-01T00:00:00", "2020-01-01T01:00:00"]
+    assert "</script>" not in get_compact_figure_json(fig, float_precision)
+    assert trace["name"] == "</script>"
+
+
+def test_get_compact_figure_json_short_arrays():
+    fig = go.Figure(go.Bar(x=["a", "b"], y=[1.5, 2.5]))
+    trace = json.loads(get_compact_figure_json(fig))["data"][0]
+    # Short arrays should be left as lists
+    assert trace["x"] == ["a", "b"]
+    assert trace["y"] == [1.5, 2.5]
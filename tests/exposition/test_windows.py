@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit_prophet.lib.exposition.preparation import prepare_waterfall
+from streamlit_prophet.lib.exposition.windows import WINDOWS_CACHE, get_window_aggregator
+from tests.samples.df import df_test
+
+
+@pytest.mark.parametrize(
+    "df, start, end, inclusive_end",
+    [
+        (df_test[11], "2020-01-01", "2020-01-15", False),
+        (df_test[11], "2020-01-01", "2020-01-15", True),
+        (df_test[19], "2015-06-01", "2018-06-01", True),
+        (df_test[19], "1900-01-01", "2100-01-01", False),
+        (df_test[20], "2030-01-01", "2030-02-01", False),
+        (df_test[20], "2021-01-01", "2020-01-01", True),
+    ],
+)
+def test_window_aggregator(df, start, end, inclusive_end):
+    columns = [col for col in df.columns if col != "ds"]
+    aggregator = get_window_aggregator(df.sample(frac=1, random_state=42), columns)
+    after_end = df["ds"] <= end if inclusive_end else df["ds"] < end
+    window = df.loc[(df["ds"] >= start) & after_end, columns]
+    # Window aggregates should match the ones computed on filtered rows, missing values skipped
+    assert np.allclose(aggregator.sum(start, end, inclusive_end), window.sum())
+    assert (aggregator.count(start, end, inclusive_end) == window.count()).all()
+    assert np.allclose(aggregator.mean(start, end, inclusive_end), window.mean(), equal_nan=True)
+
+
+def test_window_aggregator_cache():
+    WINDOWS_CACHE.clear()
+    df = df_test[11]
+    get_window_aggregator(df, ["y"])
+    get_window_aggregator(df.copy(), ["y"])
+    # Dataframes with the same values should share the same aggregator
+    assert (WINDOWS_CACHE.misses, WINDOWS_CACHE.hits) == (1, 1)
+
+
+def test_prepare_waterfall():
+    components = df_test[20].copy()
+    components["holiday"] = np.where(components["ds"] < "2015-01-01", 1e9, 0.0)
+    start_date, end_date = pd.Timestamp("2019-03-01"), pd.Timestamp("2019-04-01")
+    output = prepare_waterfall(components, start_date.date(), end_date.date())
+    window = components.loc[(components["ds"] >= start_date) & (components["ds"] < end_date)]
+    # Waterfall should average components on the window, dropping those which are zero there
+    assert list(output.index) == ["y", "regressor1", "regressor2"]
+    assert np.allclose(output, window[["y", "regressor1", "regressor2"]].mean())
@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+from prophet.diagnostics import cross_validation
+from streamlit_prophet.lib.models import cv
+from streamlit_prophet.lib.models.cv import CV_CACHE, cross_validation_cached
+from streamlit_prophet.lib.models.prophet import instantiate_prophet_model
+from streamlit_prophet.lib.utils.load import load_config
+from tests.samples.df import df_test
+from tests.samples.dict import make_params_test
+
+config, _, _ = load_config(
+    "config_streamlit.toml", "config_instructions.toml", "config_readme.toml"
+)
+config["executor"]["mode"] = "serial"
+CUTOFFS = [pd.Timestamp("2019-06-01"), pd.Timestamp("2019-03-01"), pd.Timestamp("2018-12-01")]
+
+
+def fit_test_model(changepoint_prior_scale=0.05):
+    params = make_params_test(regressors={"regressor1": {"prior_scale": 10}})
+    params["prior_scale"]["changepoint_prior_scale"] = changepoint_prior_scale
+    params["uncertainty"]["method"] = "off"
+    model = instantiate_prophet_model(params, dates=dict())
+    return model.fit(df_test[20].drop("regressor2", axis=1), seed=42)
+
+
+def test_cross_validation_cached():
+    CV_CACHE.clear()
+    model = fit_test_model()
+    expected = cross_validation(model, cutoffs=CUTOFFS, horizon="60 days")
+    output = cross_validation_cached(model, CUTOFFS, "60 days", config)
+    # Output should be identical to Prophet's cross-validation
+    pd.testing.assert_frame_equal(output, expected)
+
+
+@pytest.mark.parametrize(
+    "cutoffs, horizon, changepoint_prior_scale, n_fits",
+    [
+        (CUTOFFS[:2], "60 days", 0.05, 0),
+        (CUTOFFS, "60 days", 0.05, 1),
+        (CUTOFFS[:2], "30 days", 0.05, 2),
+        (CUTOFFS[:2], "60 days", 0.5, 2),
+    ],
+)
+def test_cross_validation_cached_folds(mocker, cutoffs, horizon, changepoint_prior_scale, n_fits):
+    CV_CACHE.clear()
+    cross_validation_cached(fit_test_model(), CUTOFFS[:2], "60 days", config)
+    spy = mocker.spy(cv, "single_cutoff_forecast")
+    output = cross_validation_cached(
+        fit_test_model(changepoint_prior_scale), cutoffs, horizon, config
+    )
+    # Only folds that changed should be fitted
+    assert spy.call_count == n_fits
+    # Output should contain all folds, in the order of cutoffs
+    assert list(output["cutoff"].unique()) == cutoffs
+
+
+def test_cross_validation_cached_processes():
+    CV_CACHE.clear()
+    model = fit_test_model()
+    processes_config = {**config, "executor": {"mode": "processes", "n_workers": 2}}
+    expected = cross_validation(model, cutoffs=CUTOFFS, horizon="60 days")
+    output = cross_validation_cached(model, CUTOFFS, "60 days", processes_config)
+    # Folds run by worker processes from shared history should match Prophet's cross-validation
+    pd.testing.assert_frame_equal(output, expected)
+    # Model should keep its history
+    assert model.history is not None
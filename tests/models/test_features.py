@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from prophet import Prophet
+from streamlit_prophet.lib.models.features import (
+    FOURIER_CACHE,
+    CachedFeaturesProphet,
+    get_fourier_series,
+)
+from tests.samples.df import df_test
+
+DATES = pd.Series(pd.date_range("2015-01-01", periods=1000, freq="D"))
+
+
+@pytest.mark.parametrize(
+    "dates, hit",
+    [
+        (DATES, True),
+        (DATES.iloc[:400], True),
+        (DATES.iloc[250:900].reset_index(drop=True), True),
+        (pd.Series(pd.date_range("2017-06-01", periods=300, freq="D")), False),
+        (DATES.iloc[::2].reset_index(drop=True), False),
+    ],
+)
+def test_get_fourier_series(dates, hit):
+    FOURIER_CACHE.clear()
+    get_fourier_series(DATES, 365.25, 10)
+    output = get_fourier_series(dates, 365.25, 10)
+    # Terms should be bit-identical to Prophet's ones
+    np.testing.assert_array_equal(output, Prophet.fourier_series(dates, 365.25, 10))
+    # Ranges of a cached grid should be read from cache
+    assert FOURIER_CACHE.hits == int(hit)
+    assert FOURIER_CACHE.hit_rate == (0.5 if hit else 0.0)
+
+
+def test_fourier_cache_isolation():
+    FOURIER_CACHE.clear()
+    output = get_fourier_series(DATES, 7, 3)
+    output[:] = 0
+    # Cached terms should not be altered by callers
+    expected = Prophet.fourier_series(DATES, 7, 3)
+    np.testing.assert_array_equal(get_fourier_series(DATES, 7, 3), expected)
+    # Terms of other periods or orders should not be mixed up
+    expected = Prophet.fourier_series(DATES, 7, 4)
+    np.testing.assert_array_equal(get_fourier_series(DATES, 7, 4), expected)
+    assert FOURIER_CACHE.nbytes == DATES.shape[0] * 8 * (1 + 6 + 1 + 8)
+
+
+def test_cached_features_prophet():
+    FOURIER_CACHE.clear()
+    df = df_test[20].drop(["regressor1", "regressor2"], axis=1)
+    model = CachedFeaturesProphet(uncertainty_samples=0).fit(df, seed=42)
+    reference = Prophet(uncertainty_samples=0).fit(df, seed=42)
+    # Forecasts should be identical to Prophet's ones
+    expected = reference.predict(df.iloc[-500:])
+    pd.testing.assert_frame_equal(model.predict(df.iloc[-500:]), expected, check_exact=True)
+    # Predictions on training dates should reuse the terms computed at fit time
+    assert FOURIER_CACHE.hits > 0
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit_prophet.lib.models.predict import (
+    predict_date_ranges,
+    predict_forecast_df,
+    predict_models,
+)
+from streamlit_prophet.lib.models.prophet import instantiate_prophet_model
+from tests.samples.df import df_test
+from tests.samples.dict import make_params_test
+
+
+def fit_test_model(growth, seasonality_mode, uncertainty_samples=1000, seed=42):
+    df = df_test[20].copy()
+    df["y"] += 50
+    if growth == "logistic":
+        df["cap"], df["floor"] = 200.0, 0.0
+    params = make_params_test(
+        regressors={col: {"prior_scale": 10} for col in ["regressor1", "regressor2"]}
+    )
+    params["other"]["growth"] = growth
+    params["other"]["seasonality_mode"] = seasonality_mode
+    model = instantiate_prophet_model(params, dates=dict())
+    model.uncertainty_samples = uncertainty_samples
+    model.fit(df.iloc[:3000], seed=seed)
+    return model, df.drop("y", axis=1).sample(frac=1, random_state=42)
+
+
+@pytest.mark.parametrize(
+    "growth, seasonality_mode, uncertainty_samples",
+    [
+        ("linear", "additive", 1000),
+        ("linear", "multiplicative", 1000),
+        ("flat", "additive", 1000),
+        ("logistic", "multiplicative", 0),
+    ],
+)
+def test_predict_forecast_df(growth, seasonality_mode, uncertainty_samples):
+    model, df = fit_test_model(growth, seasonality_mode, uncertainty_samples)
+    np.random.seed(42)
+    expected = model.predict(df)
+    for _ in range(2):
+        np.random.seed(42)
+        output = predict_forecast_df(model, df)
+        # Output should be identical to Prophet's, whether feature matrices are cached or not
+        pd.testing.assert_frame_equal(output, expected, check_exact=True)
+
+
+def test_predict_models():
+    models = [
+        fit_test_model("linear", "additive", seed=1)[0],
+        fit_test_model("linear", "additive", seed=2)[0],
+        fit_test_model("linear", "multiplicative")[0],
+    ]
+    df = fit_test_model("flat", "additive", 0)[1]
+    outputs = predict_models(models, df)
+    for model, output in zip(models, outputs):
+        expected = model.predict(df)
+        # Point forecasts of each model should be identical to Prophet's
+        for col in output.keys():
+            np.testing.assert_array_equal(output[col], expected[col].values)
+
+
+def test_predict_date_ranges():
+    model, df = fit_test_model("linear", "multiplicative", 0)
+    dfs = [df.iloc[:100], df.iloc[50:400], df.iloc[3000:]]
+    outputs = predict_date_ranges(model, dfs)
+    for df_range, output in zip(dfs, outputs):
+        expected = model.predict(df_range)
+        # Dates should be sorted like in Prophet's output
+        np.testing.assert_array_equal(output["ds"], expected["ds"].values)
+        # Point forecasts should match Prophet's up to floating point rounding
+        for col in set(output.keys()) - {"ds"}:
+            np.testing.assert_allclose(output[col], expected[col].values, rtol=1e-12, atol=1e-12)
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+from prophet import Prophet
+from streamlit_prophet.lib.models.features import CachedFeaturesProphet
+from streamlit_prophet.lib.models.preparation import (
+    HOLIDAYS_CACHE,
+    add_prophet_holidays,
+    get_holidays_table,
+)
+from tests.samples.df import df_test
+from tests.samples.dict import make_dates_test
+
+
+@pytest.mark.parametrize("country", ["US", "FR", "NL"])
+def test_add_prophet_holidays(country):
+    holidays_params = {"country": country, "public_holidays": True, "school_holidays": False}
+    model = add_prophet_holidays(CachedFeaturesProphet(), holidays_params, make_dates_test())
+    reference = Prophet().add_country_holidays(country)
+    df = df_test[20].drop(["regressor1", "regressor2"], axis=1)
+    model.preprocess(df)
+    reference.preprocess(df)
+    features, prior_scales, _, _ = model.make_all_seasonality_features(model.history)
+    expected, expected_prior_scales, _, _ = reference.make_all_seasonality_features(
+        reference.history
+    )
+    # Holiday features should be the same as the ones of Prophet's country holidays
+    assert model.country_holidays == country
+    pd.testing.assert_frame_equal(features, expected)
+    assert prior_scales == expected_prior_scales
+    # Holidays should also be listed for the years of predictions
+    future = model.setup_dataframe(pd.DataFrame({"ds": pd.date_range("2030-01-01", "2031-12-31")}))
+    expected_future = reference.setup_dataframe(future[["ds"]].copy())
+    pd.testing.assert_frame_equal(
+        model.make_all_seasonality_features(future)[0],
+        reference.make_all_seasonality_features(expected_future)[0],
+    )
+
+
+def test_add_prophet_holidays_school():
+    holidays_params = {"country": "FR", "public_holidays": False, "school_holidays": True}
+    model = add_prophet_holidays(Prophet(), holidays_params, make_dates_test())
+    other = add_prophet_holidays(
+        Prophet(), holidays_params, make_dates_test(forecast_end="2022-12-31")
+    )
+    # School holidays should cover the data years, whatever the forecast horizon
+    pd.testing.assert_frame_equal(model.holidays, other.holidays)
+    assert model.holidays["ds"].min() == pd.Timestamp("2010-01-01")
+
+
+def test_get_holidays_table():
+    HOLIDAYS_CACHE.clear()
+    table = get_holidays_table("FR", 2018, 2019, True, True)
+    # Tables should be computed once and shared
+    assert get_holidays_table("FR", 2018, 2019, True, True) is table
+    assert (HOLIDAYS_CACHE.hits, HOLIDAYS_CACHE.misses) == (1, 1)
+    # Table should contain public and school holidays of the year range, without windows
+    assert table["ds"].dt.year.unique().tolist() == [2018, 2019]
+    assert table["holiday"].str.startswith("School holiday: ").any()
+    assert (table[["lower_window", "upper_window"]] == 0).all().all()
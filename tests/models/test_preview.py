@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit_prophet.lib.models.preview import (
+    PREVIEWS_CACHE,
+    fit_preview_model,
+    get_preview_accuracy_report,
+    get_preview_forecast,
+)
+from streamlit_prophet.lib.models.prophet import instantiate_prophet_model
+from streamlit_prophet.lib.utils.load import load_config
+from tests.samples.df import df_test
+from tests.samples.dict import (
+    make_cleaning_test,
+    make_dates_test,
+    make_dimensions_test,
+    make_params_test,
+    make_resampling_test,
+)
+
+config, _, _ = load_config(
+    "config_streamlit.toml", "config_instructions.toml", "config_readme.toml"
+)
+
+
+@pytest.mark.parametrize(
+    "growth, seasonality_mode",
+    [
+        ("linear", "additive"),
+        ("linear", "multiplicative"),
+        ("flat", "additive"),
+        ("logistic", "additive"),
+    ],
+)
+def test_fit_preview_model(growth, seasonality_mode):
+    df = df_test[20].copy()
+    df["y"] += 50 + 0.01 * np.arange(len(df)) + 5 * np.sin(2 * np.pi * np.arange(len(df)) / 7)
+    if growth == "logistic":
+        df["cap"], df["floor"] = 200, 0
+    params = make_params_test(
+        regressors={
+            col: {"prior_scale": 10} for col in set(df.columns) - {"ds", "y", "cap", "floor"}
+        }
+    )
+    params["other"]["growth"] = growth
+    params["other"]["seasonality_mode"] = seasonality_mode
+    preview_model = fit_preview_model(params, df, dict(), config)
+    preview_forecast = preview_model.predict(df.drop("y", axis=1))
+    model = instantiate_prophet_model(params, dates=dict())
+    model.fit(df, seed=config["global"]["seed"])
+    forecast = model.predict(df.drop("y", axis=1))
+    # Preview parameters should have the same shapes as the ones estimated by Stan
+    assert {k: v.shape for k, v in preview_model.params.items()} == {
+        k: model.params[k].shape for k in preview_model.params.keys()
+    }
+    report = get_preview_accuracy_report(preview_forecast, forecast, df)
+    # Preview forecast should be very close to Stan forecast
+    assert report.loc["Distance to Stan forecast", "Correlation"] > 0.99
+    assert report.loc["Distance to Stan forecast", "MAPE"] < 0.02
+    # Preview forecast should be about as accurate as Stan forecast
+    assert (
+        report.loc["Preview model vs truth", "RMSE"]
+        < 1.05 * report.loc["Stan model vs truth", "RMSE"]
+    )
+
+
+def test_get_preview_forecast_future():
+    PREVIEWS_CACHE.clear()
+    df = df_test[20]
+    dates = make_dates_test()
+    args = (
+        make_params_test(),
+        dates,
+        {"uploaded": df},
+        df,
+        False,
+        make_cleaning_test(),
+        config,
+        make_resampling_test(),
+        "ds",
+        "y",
+        make_dimensions_test(df, frac=1),
+        {"date_format": "%Y-%m-%d"},
+    )
+    model, forecast = get_preview_forecast(*args)
+    # Without evaluation, preview should cover history and future dates
+    assert forecast.ds.min() == df.ds.min()
+    assert forecast.ds.max() == pd.Timestamp(dates["forecast_end_date"])
+    # Preview should be reused on reruns with the same inputs
+    assert get_preview_forecast(*args)[1] is forecast
@@ -1,6 +1,13 @@
+import pandas as pd
 import pytest
 from streamlit_prophet.lib.dataprep.split import get_train_set, get_train_val_sets
-from streamlit_prophet.lib.models.prophet import forecast_workflow
+from streamlit_prophet.lib.models.features import CachedFeaturesProphet
+from streamlit_prophet.lib.models.prophet import (
+    forecast_future,
+    forecast_workflow,
+    get_fit_key,
+    submit_forecast_workflow,
+)
 from streamlit_prophet.lib.utils.load import load_config
 from tests.samples.df import df_test
 from tests.samples.dict import (
@@ -86,3 +93,93 @@ def test_forecast_workflow(use_cv, make_future_forecast, evaluate):
         assert datasets["future"].ds.nunique() > 0
         # Number of distinct dates in future dataframe = number of distinct dates in future forecast dataframe
         assert forecasts["future"].ds.nunique() == datasets["future"].ds.nunique()
+
+
+def test_submit_forecast_workflow():
+    df = df_test[20]
+    dates = make_dates_test()
+    datasets = get_train_val_sets(df, dates, config, dict())
+    args = [
+        {**config, "jobs": {"n_workers": 1, "poll_interval": 0.1}},
+        False,
+        True,
+        True,
+        make_cleaning_test(),
+        make_resampling_test(),
+        make_params_test(),
+        dates,
+        datasets,
+        df,
+        "ds",
+        "y",
+        make_dimensions_test(df, frac=1),
+        {"date_format": "%Y-%m-%d"},
+    ]
+    job = submit_forecast_workflow(*args)
+    # Same inputs should reattach to the same job, and session's datasets should be left unchanged
+    assert submit_forecast_workflow(*args) is job
+    datasets_job, models, forecasts = job.future.result()
+    assert set(datasets.keys()) == {"train", "val"}
+    # Evaluation results should be published before the future model is fitted
+    _, partial_models, partial_forecasts = job.partial_results[0]
+    assert set(partial_models.keys()) == {"eval"} and set(partial_forecasts.keys()) == {"eval"}
+    assert set(models.keys()) == {"eval", "future"}
+    assert job.get_progress()[0] == "Forecasting future dates"
+
+
+def make_future_forecast(dates, params=None):
+    df = df_test[20]
+    return forecast_future(
+        config,
+        params or make_params_test(),
+        make_cleaning_test(),
+        dates,
+        dict(),
+        dict(),
+        dict(),
+        df,
+        make_resampling_test(),
+        "ds",
+        "y",
+        make_dimensions_test(df, frac=1),
+        {"date_format": "%Y-%m-%d"},
+    )
+
+
+@pytest.mark.parametrize("forecast_end", ["2020-12-31", "2020-06-30", "2021-03-31"])
+def test_forecast_future_horizon(mocker, forecast_end):
+    make_future_forecast(make_dates_test())
+    spy = mocker.spy(CachedFeaturesProphet, "fit")
+    _, _, forecasts = make_future_forecast(make_dates_test(forecast_end=forecast_end))
+    # Model should not be refitted, even if the forecast covers new years
+    assert spy.call_count == 0
+    # Forecast should cover the new horizon
+    assert forecasts["future"]["ds"].max() == pd.Timestamp(forecast_end)
+
+
+def test_forecast_future_horizon_holidays(mocker):
+    params = make_params_test()
+    params["holidays"].update({"country": "FR", "school_holidays": True})
+    make_future_forecast(make_dates_test(), params)
+    spy = mocker.spy(CachedFeaturesProphet, "fit")
+    _, models, _ = make_future_forecast(make_dates_test(forecast_end="2022-12-31"), params)
+    # Public and school holidays should not make the fit depend on the horizon
+    assert spy.call_count == 0
+    assert models["future"].country_holidays == "FR"
+
+
+@pytest.mark.parametrize(
+    "init_params",
+    [
+        {"yearly_seasonality": False},
+        {"weekly_seasonality": 5},
+        {"daily_seasonality": True},
+        {"scaling": "minmax"},
+    ],
+)
+def test_get_fit_key(init_params):
+    df = df_test[20]
+    key = get_fit_key(CachedFeaturesProphet(), df, 42)
+    # Models instantiated with different built-in seasonalities or scaling should not share fits
+    assert get_fit_key(CachedFeaturesProphet(**init_params), df, 42) != key
+    assert get_fit_key(CachedFeaturesProphet(), df, 42) == key
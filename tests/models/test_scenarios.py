@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from streamlit_prophet.lib.models.predict import predict_forecast_df
+from streamlit_prophet.lib.models.scenarios import (
+    apply_perturbations,
+    get_scenarios_summary,
+    predict_scenarios,
+)
+from tests.models.test_predict import fit_test_model
+
+SCENARIOS = {
+    "Promotion": [{"regressor": "regressor1", "operation": "multiply", "value": 1.5}],
+    "Closed": [
+        {"regressor": "regressor1", "operation": "set", "value": 0.0},
+        {"regressor": "regressor2", "operation": "add", "value": 1.0},
+    ],
+}
+
+
+@pytest.mark.parametrize("seasonality_mode", ["additive", "multiplicative"])
+def test_predict_scenarios(seasonality_mode):
+    model, df = fit_test_model("linear", seasonality_mode, uncertainty_samples=0)
+    start_date = df["ds"].sort_values().iloc[len(df) // 2]
+    forecasts = predict_scenarios(model, df, SCENARIOS, start_date)
+    # Baseline should be the forecast of the unperturbed dataframe
+    expected = predict_forecast_df(model, df)
+    assert list(forecasts.columns) == ["ds", "Baseline", "Promotion", "Closed"]
+    assert np.allclose(forecasts["Baseline"], expected["yhat"])
+    # Each scenario should be the forecast of its perturbed dataframe
+    for name, perturbations in SCENARIOS.items():
+        perturbed = apply_perturbations(df, perturbations, start_date)
+        expected = predict_forecast_df(model, perturbed)
+        assert np.allclose(forecasts[name], expected["yhat"])
+    # Scenarios should not change the forecast before their start date
+    before = forecasts["ds"] < start_date
+    assert np.allclose(forecasts.loc[before, "Promotion"], forecasts.loc[before, "Baseline"])
+
+
+def test_predict_scenarios_unknown_regressor():
+    model, df = fit_test_model("linear", "additive", uncertainty_samples=0)
+    scenarios = {"Unknown": [{"regressor": "y", "operation": "add", "value": 1.0}]}
+    # Regressors that are not used by the model should be rejected
+    with pytest.raises(ValueError):
+        predict_scenarios(model, df, scenarios, df["ds"].min())
+
+
+def test_get_scenarios_summary():
+    model, df = fit_test_model("linear", "additive", uncertainty_samples=0)
+    forecasts = predict_scenarios(model, df, SCENARIOS, df["ds"].min())
+    summary = get_scenarios_summary(forecasts, df["ds"].min())
+    # Baseline should have no difference with itself, and totals should sum whole forecasts
+    assert summary.loc["Baseline", "Difference"] == 0
+    assert np.isclose(summary.loc["Promotion", "Total forecast"], forecasts["Promotion"].sum())
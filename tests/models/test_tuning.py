@@ -0,0 +1,112 @@
+import copy
+
+import pandas as pd
+import pytest
+from streamlit_prophet.lib.models import cv
+from streamlit_prophet.lib.models.cv import CV_CACHE
+from streamlit_prophet.lib.models.tuning import (
+    apply_candidate,
+    get_candidates,
+    get_rungs,
+    tune_params,
+)
+from streamlit_prophet.lib.utils.load import load_config
+from tests.samples.df import df_test
+from tests.samples.dict import make_params_test
+
+config, _, _ = load_config(
+    "config_streamlit.toml", "config_instructions.toml", "config_readme.toml"
+)
+config["executor"]["mode"] = "serial"
+config["tuning"] = {
+    **config["tuning"],
+    "n_candidates": 4,
+    "reduction_factor": 2,
+    "search_space": {"changepoint_prior_scale": [0.001, 0.5], "fourier_order": [3, 10]},
+}
+DATES = {
+    "cutoffs": [pd.Timestamp("2019-06-01"), pd.Timestamp("2019-03-01"), pd.Timestamp("2018-12-01")],
+    "folds_horizon": 60,
+}
+PARAMS = make_params_test()
+PARAMS["holidays"]["public_holidays"] = False
+
+
+@pytest.mark.parametrize(
+    "n_folds, n_candidates, reduction_factor, expected",
+    [
+        (5, 16, 3, [(1, 16), (3, 6), (5, 2)]),
+        (3, 4, 2, [(1, 4), (2, 2), (3, 1)]),
+        (1, 10, 3, [(1, 10)]),
+    ],
+)
+def test_get_rungs(n_folds, n_candidates, reduction_factor, expected):
+    # Rounds should use more folds and fewer candidates, the last one using all folds
+    assert get_rungs(n_folds, n_candidates, reduction_factor) == expected
+
+
+@pytest.mark.parametrize("reduction_factor", [1, 0, -2])
+def test_get_rungs_invalid(reduction_factor):
+    # Reduction factors which do not reduce the number of candidates should be rejected
+    with pytest.raises(ValueError):
+        get_rungs(5, 16, reduction_factor)
+
+
+def test_get_candidates():
+    search_space = config["tuning"]["search_space"]
+    candidates = get_candidates(PARAMS, search_space, 10, seed=42)
+    # User's parameters should be the first candidate
+    assert candidates[0] == {"changepoint_prior_scale": 0.05, "fourier_order": None}
+    # Other candidates should be distinct combinations, at most as many as the search space has
+    assert len(candidates) == 5
+    assert len({tuple(c.values()) for c in candidates[1:]}) == 4
+    # Same seed should draw the same candidates
+    assert candidates == get_candidates(PARAMS, search_space, 10, seed=42)
+
+
+def test_apply_candidate():
+    params = copy.deepcopy(PARAMS)
+    params["seasonalities"]["monthly"] = {
+        "prophet_param": False,
+        "custom_param": {"name": "monthly", "period": 30.5, "mode": "additive", "fourier_order": 5},
+    }
+    params["seasonalities"]["daily"] = {"prophet_param": False}
+    candidate = {"changepoint_range": 0.9, "seasonality_mode": "multiplicative", "fourier_order": 7}
+    output = apply_candidate(params, candidate)
+    # Candidate values should be set in model parameters
+    assert output["other"]["changepoint_range"] == 0.9
+    assert output["other"]["seasonality_mode"] == "multiplicative"
+    assert output["seasonalities"]["monthly"]["custom_param"]["mode"] == "multiplicative"
+    assert output["seasonalities"]["monthly"]["custom_param"]["fourier_order"] == 7
+    assert output["seasonalities"]["yearly"]["prophet_param"] == 7
+    # Seasonalities turned off should stay off, and input parameters should be unchanged
+    assert output["seasonalities"]["daily"]["prophet_param"] is False
+    assert params["seasonalities"]["yearly"]["prophet_param"] == "auto"
+
+
+def test_tune_params(mocker):
+    CV_CACHE.clear()
+    spy = mocker.spy(cv, "single_cutoff_forecast")
+    datasets = {"train": df_test[20].drop(["regressor1", "regressor2"], axis=1)}
+    best_params, leaderboard = tune_params(PARAMS, DATES, datasets, {"freq": "D"}, config)
+    # Pruned candidates should not be evaluated on all folds
+    assert list(leaderboard["n_folds"]) == [3, 2, 1, 1]
+    assert spy.call_count == 4 + 2 + 1
+    # Best candidate's values should be written back into parameters
+    best = leaderboard.iloc[0]
+    assert best_params["prior_scale"]["changepoint_prior_scale"] == best["changepoint_prior_scale"]
+    # Leaderboard should be sorted by error among candidates evaluated on the same folds
+    assert leaderboard["RMSE"].iloc[2] <= leaderboard["RMSE"].iloc[3]
+
+
+def test_tune_params_time_budget():
+    budget_config = copy.deepcopy(config)
+    budget_config["executor"]["n_workers"] = 2
+    budget_config["tuning"]["time_budget"] = 0
+    datasets = {"train": df_test[20].drop(["regressor1", "regressor2"], axis=1)}
+    best_params, leaderboard = tune_params(PARAMS, DATES, datasets, {"freq": "D"}, budget_config)
+    # Search should stop after the first batch of candidates once its time budget is spent
+    assert list(leaderboard["n_folds"]) == [1, 1]
+    assert best_params["prior_scale"]["changepoint_prior_scale"] == (
+        leaderboard["changepoint_prior_scale"].iloc[0]
+    )
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from streamlit_prophet.lib.models.predict import predict_forecast_df
+from streamlit_prophet.lib.models.prophet import instantiate_prophet_model
+from streamlit_prophet.lib.models.uncertainty import (
+    AnalyticUncertaintyProphet,
+    get_trend_variance,
+    get_uncertainty_params,
+)
+from tests.samples.df import df_test
+from tests.samples.dict import make_cleaning_test, make_params_test
+
+
+def fit_test_model(method, seasonality_mode="additive"):
+    df = df_test[20].copy()
+    df["y"] += 50 + 0.02 * np.arange(len(df))
+    params = make_params_test()
+    params["other"]["seasonality_mode"] = seasonality_mode
+    params["uncertainty"]["method"] = method
+    model = instantiate_prophet_model(params, dates=dict())
+    model.fit(df.iloc[:2500], seed=42)
+    return model, df.drop("y", axis=1)
+
+
+def test_get_trend_variance():
+    model, df = fit_test_model("samples")
+    model.params["delta"] = np.full(model.params["delta"].shape, 0.05)
+    df = model.setup_dataframe(df)
+    np.random.seed(42)
+    simulated = (model._sample_uncertainty(df, 20000) * model.y_scale).var(axis=0)
+    variance = get_trend_variance(model, df["t"].values)
+    # Trend variance should be 0 on historical dates
+    assert (variance[df["t"] <= 1] == 0).all()
+    # Trend variance should match the variance of Prophet's simulated trends
+    np.testing.assert_allclose(variance[-1000:], simulated[-1000:], rtol=0.05)
+
+
+@pytest.mark.parametrize("seasonality_mode", ["additive", "multiplicative"])
+def test_analytic_intervals(seasonality_mode):
+    model, df = fit_test_model("samples", seasonality_mode)
+    analytic_model, _ = fit_test_model("analytic", seasonality_mode)
+    np.random.seed(42)
+    expected = predict_forecast_df(model, df)
+    output = predict_forecast_df(analytic_model, df)
+    # Analytic model should be used when analytic method is selected
+    assert isinstance(analytic_model, AnalyticUncertaintyProphet)
+    # Output should have the same format as with simulated intervals
+    assert list(output.columns) == list(expected.columns)
+    # Analytic intervals should be close to simulated ones, up to sampling noise
+    width = expected["yhat_upper"] - expected["yhat_lower"]
+    for col in ["yhat_lower", "yhat_upper", "trend_lower", "trend_upper"]:
+        assert ((output[col] - expected[col]).abs() / width).mean() < 0.02
+    # Prophet's predict should give the same intervals as the cached predict engine
+    np.testing.assert_allclose(analytic_model.predict(df)["yhat_lower"], output["yhat_lower"])
+
+
+@pytest.mark.parametrize(
+    "log_transform, intervals_needed, expected",
+    [(False, True, "samples"), (True, True, "off"), (False, False, "off")],
+)
+def test_get_uncertainty_params(log_transform, intervals_needed, expected):
+    params = make_params_test()
+    cleaning = make_cleaning_test(log_transform=log_transform)
+    output = get_uncertainty_params(params, cleaning, intervals_needed)
+    # Intervals should be turned off when no visualization displays them
+    assert output["uncertainty"]["method"] == expected
+    # Input params should not be modified
+    assert params["uncertainty"]["method"] == "samples"
@@ -155,7 +155,7 @@ def make_dates_test(
 
 # Eval
 def make_eval_test(
-    granularity: str = "Daily", get_perf_on_agg_forecast: bool = False
+    granularity: str = "Daily", get_perf_on_agg_forecast: bool = False, bootstrap: bool = False
 ) -> Dict[Any, Any]:
     """Creates an evaluation dictionary with specifications defined by the arguments, for testing purpose.
 
@@ -165,6 +165,8 @@ def make_eval_test(
         Value for the 'granularity' key of dictionary.
     get_perf_on_agg_forecast : bool
         Value for the 'get_perf_on_agg_forecast' key of dictionary.
+    bootstrap : bool
+        Value for the 'bootstrap' key of dictionary.
 
     Returns
     -------
@@ -175,6 +177,7 @@ def make_eval_test(
         "granularity": granularity,
         "get_perf_on_agg_forecast": get_perf_on_agg_forecast,
         "metrics": ["MAPE", "RMSE", "SMAPE", "MSE", "MAE"],
+        "bootstrap": bootstrap,
     }
 
 
@@ -211,4 +214,8 @@ def make_params_test(regressors: Dict[Any, Any] = dict()) -> Dict[Any, Any]:
             "lockdown_events": [],
         },
         "regressors": regressors,
+        "uncertainty": {
+            "method": default_params["uncertainty"][0],
+            "samples": default_params["uncertainty_samples"],
+        },
     }
@@ -0,0 +1,141 @@
+import gc
+import threading
+
+import pandas as pd
+import pytest
+from streamlit_prophet.lib.utils import cache
+from streamlit_prophet.lib.utils.cache import (
+    LRUCache,
+    SharedCache,
+    get_fingerprint,
+    hash_dataframe,
+    hash_object,
+)
+from tests.samples.df import df_test
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    # Least recently used entry should have been evicted
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    # Hits and misses should be counted
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_lru_cache_on_evict():
+    evicted = []
+    cache = LRUCache(maxsize=1, on_evict=evicted.append)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    # Evicted values should be passed to the eviction function
+    assert evicted == [1]
+    cache.clear()
+    assert evicted == [1, 2]
+
+
+def test_shared_cache_single_flight():
+    cache = SharedCache(max_bytes=100, sizeof=lambda value: 1)
+    started, event, calls, results = threading.Event(), threading.Event(), [], []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        event.wait(10)
+        return "value"
+
+    computing = threading.Thread(target=lambda: results.append(cache.acquire("a", compute)[0]))
+    computing.start()
+    started.wait(10)
+    waiting = threading.Thread(target=lambda: results.append(cache.acquire("a", compute)[0]))
+    waiting.start()
+    while cache.waits == 0:
+        pass
+    event.set()
+    computing.join()
+    waiting.join()
+    # Identical requests should wait for the value being computed instead of computing it again
+    assert len(calls) == 1 and results == ["value", "value"]
+    assert (cache.misses, cache.waits) == (1, 1)
+    # Waiters should be counted as users of the value, so that it is not evicted before they get it
+    assert cache.entries["a"].n_users == 2
+    # Later requests should hit the cache
+    assert cache.acquire("a", compute)[0] == "value" and cache.hits == 1
+
+
+def test_shared_cache_eviction():
+    cache = SharedCache(max_bytes=2, sizeof=lambda value: value)
+    _, entry_a = cache.acquire("a", lambda: 1)
+    _, entry_b = cache.acquire("b", lambda: 1)
+    cache.acquire("c", lambda: 1)
+    # Values in use should not be evicted, even above the memory budget
+    assert len(cache) == 3 and cache.get_nbytes() == 3
+    cache.release(entry_b)
+    # Released values should be evicted once the memory budget is exceeded
+    assert "b" not in cache and cache.get_nbytes() == 2
+    cache.release(entry_a)
+    cache.acquire("d", lambda: 1)
+    assert "a" not in cache and "c" in cache and "d" in cache
+
+
+def test_shared_cache_error():
+    cache = SharedCache(max_bytes=100, sizeof=lambda value: 1)
+
+    def compute():
+        raise ValueError("fit failed")
+
+    # Errors should be raised and not cached
+    with pytest.raises(ValueError):
+        cache.acquire("a", compute)
+    assert "a" not in cache and cache.acquire("a", lambda: "value")[0] == "value"
+
+
+def test_shared_cache_release():
+    cache = SharedCache(max_bytes=0, sizeof=lambda value: 1)
+    _, old_entry = cache.acquire("a", lambda: 1)
+    cache.clear()
+    _, entry = cache.acquire("a", lambda: 2)
+    cache.release(old_entry)
+    # Releasing an entry should not release the entry cached later for the same key
+    assert "a" in cache and entry.n_users == 1
+    cache.release(entry)
+    assert "a" not in cache
+
+
+def test_hash_dataframe():
+    df = df_test[20]
+    # Fingerprint should not depend on the index
+    assert hash_dataframe(df) == hash_dataframe(df.set_index(df.index + 10))
+    # Fingerprint should depend on values and selected columns
+    assert hash_dataframe(df) != hash_dataframe(df.assign(y=df["y"] + 1))
+    assert hash_dataframe(df, ["ds"]) != hash_dataframe(df, ["ds", "y"])
+    assert hash_dataframe(df, ["ds", "missing"]) == hash_dataframe(pd.DataFrame(df["ds"]))
+
+
+def test_get_fingerprint(mocker):
+    df = df_test[20].copy()
+    spy = mocker.spy(cache, "hash_dataframe")
+    # Fingerprint should be the one of hash_dataframe, computed once per dataframe object
+    assert get_fingerprint(df) == get_fingerprint(df) == hash_dataframe(df_test[20])
+    assert spy.call_count == 1
+    # Fingerprint should be forgotten once the dataframe is collected
+    spy.reset_mock()
+    n_fingerprints = len(cache._FINGERPRINTS)
+    del df
+    gc.collect()
+    assert len(cache._FINGERPRINTS) == n_fingerprints - 1
+
+
+def test_hash_object():
+    df = df_test[20]
+    inputs = {"params": {"a": 1, "b": [1, 2]}, "datasets": {"train": df}}
+    # Fingerprint should not depend on dictionaries order nor on dataframes identity
+    assert hash_object(inputs) == hash_object({"datasets": {"train": df.copy()}, **inputs})
+    # Fingerprint should depend on nested values
+    assert hash_object(inputs) != hash_object({**inputs, "params": {"a": 1, "b": [1, 3]}})
+    assert hash_object(inputs) != hash_object({**inputs, "datasets": {"train": df.iloc[1:]}})
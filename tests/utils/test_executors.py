@@ -0,0 +1,138 @@
+import copy
+import operator
+import os
+import signal
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit_prophet.lib.utils.executors import get_executor, run_tasks
+from streamlit_prophet.lib.utils.load import load_config
+from streamlit_prophet.lib.utils.shared_memory import (
+    _DETACHED_BLOCKS,
+    ATTACHED_FRAMES,
+    PUBLISHED_FRAMES,
+    SharedFrame,
+    SharedObject,
+    attach_frame,
+    load_shared_object,
+    publish_frame,
+)
+from tests.samples.df import df_test
+
+config, _, _ = load_config(
+    "config_streamlit.toml", "config_instructions.toml", "config_readme.toml"
+)
+
+
+def make_executor_config(mode):
+    executor_config = copy.deepcopy(config)
+    executor_config["executor"] = {"mode": mode, "n_workers": 2}
+    return executor_config
+
+
+@pytest.mark.parametrize("mode", ["serial", "threads", "processes"])
+def test_run_tasks(mode):
+    executor_config = make_executor_config(mode)
+    output = run_tasks(operator.mul, [(i, 2) for i in range(10)], executor_config)
+    # Results should be returned in the order of tasks
+    assert output == [2 * i for i in range(10)]
+
+
+@pytest.mark.parametrize("mode", ["serial", "threads", "processes"])
+def test_run_tasks_progress(mode):
+    n_done = []
+    args = [(i, 2) for i in range(5)]
+    output = run_tasks(operator.mul, args, make_executor_config(mode), n_done.append)
+    # Progress should be reported once per finished task, results being still in order
+    assert n_done == [1, 2, 3, 4, 5]
+    assert output == [2 * i for i in range(5)]
+
+
+@pytest.mark.parametrize("mode", ["threads", "processes"])
+def test_get_executor(mode):
+    executor_config = make_executor_config(mode)
+    # Executor should persist across calls
+    assert get_executor(executor_config) is get_executor(executor_config)
+
+
+def test_run_tasks_broken_executor():
+    executor_config = make_executor_config("processes")
+    executor = get_executor(executor_config)
+    pid = executor.submit(os.getpid).result()
+    os.kill(pid, signal.SIGKILL)
+    with pytest.raises(BrokenProcessPool):
+        while True:
+            executor.submit(os.getpid).result()
+    output = run_tasks(operator.mul, [(i, 2) for i in range(4)], executor_config)
+    # Broken executor should be replaced by a new one
+    assert output == [2 * i for i in range(4)]
+    assert get_executor(executor_config) is not executor
+
+
+def test_shared_object():
+    df = df_test[20]
+    with SharedObject(df) as shared_df:
+        args = [(shared_df.name, shared_df.size)] * 2
+        outputs = run_tasks(load_shared_object, args, make_executor_config("processes"))
+    # Worker processes should load the published object
+    for output in outputs:
+        pd.testing.assert_frame_equal(output, df)
+
+
+def test_shared_frame():
+    df = df_test[20].assign(flag=True, count=1)
+    with SharedFrame(df) as shared_df:
+        outputs = run_tasks(
+            attach_frame, [(shared_df.handle,)] * 2, make_executor_config("processes")
+        )
+        attached = attach_frame(shared_df.handle)
+        # Worker processes should attach the published dataframe
+        for output in outputs:
+            pd.testing.assert_frame_equal(output, df.reset_index(drop=True))
+        # Attached columns should be read-only views on shared memory
+        assert not attached["y"].to_numpy().flags.writeable
+        assert np.shares_memory(
+            attached["y"].to_numpy(), attach_frame(shared_df.handle)["y"].to_numpy()
+        )
+    # Only numeric, boolean and datetime columns can be published
+    with pytest.raises(TypeError):
+        SharedFrame(df.assign(name="a"))
+
+
+def test_publish_frame(monkeypatch):
+    df = df_test[20]
+    with publish_frame(df) as handle, publish_frame(df.copy()) as same_handle:
+        # Same data should be published only once
+        assert handle == same_handle
+        with publish_frame(df.assign(y=df["y"] + 1)) as other_handle:
+            assert handle.name != other_handle.name
+    monkeypatch.setattr(PUBLISHED_FRAMES, "max_bytes", 0)
+    with publish_frame(df.assign(y=0)) as handle:
+        with publish_frame(df.assign(y=1)):
+            pass
+        # Published dataframes should not be freed while tasks use them, even above the budget
+        output = run_tasks(attach_frame, [(handle,)] * 2, make_executor_config("processes"))
+        pd.testing.assert_frame_equal(output[0], df.assign(y=0).reset_index(drop=True))
+    # They should be freed once evicted
+    assert len(PUBLISHED_FRAMES) == 0
+    with pytest.raises(FileNotFoundError):
+        attach_frame(handle)
+
+
+def test_attach_frame_eviction():
+    dfs = [df_test[20].assign(y=i) for i in range(ATTACHED_FRAMES.maxsize + 1)]
+    with ExitStack() as stack:
+        handles = [stack.enter_context(publish_frame(df)) for df in dfs]
+        first = attach_frame(handles[0])
+        for handle in handles[1:]:
+            attach_frame(handle)
+        # Evicted dataframes should stay valid while they are used
+        assert handles[0].name not in ATTACHED_FRAMES and len(_DETACHED_BLOCKS) == 1
+        pd.testing.assert_frame_equal(first, dfs[0].reset_index(drop=True))
+        del first
+        attach_frame(handles[1])
+    # Their blocks should be closed once they are not used anymore
+    assert len(_DETACHED_BLOCKS) == 0
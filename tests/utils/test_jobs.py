@@ -0,0 +1,92 @@
+import threading
+
+from streamlit_prophet.lib.utils.jobs import (
+    JOBS,
+    cancel_job,
+    publish_partial_result,
+    release_with_job,
+    report_progress,
+    submit_job,
+)
+
+config = {"jobs": {"n_workers": 1, "poll_interval": 0.1}}
+
+
+def staged_job(event, n_steps):
+    report_progress("First stage")
+    publish_partial_result("partial")
+    for step in range(n_steps):
+        report_progress("Second stage", step + 1, n_steps)
+    event.wait(10)
+    return "final"
+
+
+def test_submit_job():
+    JOBS.clear()
+    event = threading.Event()
+    job = submit_job("job", staged_job, (event, 3), config)
+    # Sessions submitting the same inputs should reattach to the running job
+    assert submit_job("job", staged_job, (event, 3), config) is job
+    while job.get_n_results() == 0:
+        pass
+    # Partial results and progress should be available before the job ends
+    assert job.get_latest_result() == "partial"
+    while job.get_progress() != ("Second stage", 3, 3):
+        pass
+    assert not job.done()
+    event.set()
+    job.future.result(10)
+    # Final result should replace partial results once the job is done
+    assert (job.get_latest_result(), job.get_n_results()) == ("final", 2)
+
+
+def test_cancel_job():
+    JOBS.clear()
+    event = threading.Event()
+    running = submit_job("running", staged_job, (event, 1), config)
+    waiting = submit_job("waiting", staged_job, (event, 1), config)
+    while not running.future.running():
+        pass
+    cancel_job("waiting")
+    cancel_job("running")
+    # Only jobs waiting for a worker should be cancelled, and submitted again if needed
+    assert waiting.future.cancelled() and not running.future.cancelled()
+    assert submit_job("waiting", staged_job, (event, 1), config) is not waiting
+    event.set()
+
+
+def test_report_progress_outside_job():
+    # Progress reports outside jobs should be ignored
+    report_progress("Stage", 1, 2)
+    publish_partial_result("partial")
+
+
+def test_release_with_job():
+    JOBS.clear()
+    released = []
+    job = submit_job("releasing", release_with_job, (lambda: released.append("job"),), config)
+    job.future.result(10)
+    # Resources used by a job's results should be released when the job is forgotten
+    assert released == []
+    JOBS.clear()
+    assert released == ["job"]
+    # Resources used outside jobs should be released immediately
+    release_with_job(lambda: released.append("direct"))
+    assert released == ["job", "direct"]
+
+
+def test_jobs_eviction():
+    JOBS.clear()
+    event = threading.Event()
+    jobs = [submit_job(f"job {i}", staged_job, (event, 1), config) for i in range(JOBS.maxsize + 2)]
+    # Unfinished jobs should never be evicted, so that sessions can reattach to them
+    assert len(JOBS) == JOBS.maxsize + 2
+    assert submit_job("job 0", staged_job, (event, 1), config) is jobs[0]
+    event.set()
+    for job in jobs:
+        job.future.result(10)
+    finished = submit_job("finished", staged_job, (event, 1), config)
+    finished.future.result(10)
+    submit_job("other", staged_job, (event, 1), config)
+    # Finished jobs should be evicted once the cache is full
+    assert len(JOBS) == JOBS.maxsize and "job 1" not in JOBS
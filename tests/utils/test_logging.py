@@ -0,0 +1,42 @@
+import logging
+import threading
+
+from prophet import Prophet
+from streamlit_prophet.lib.utils.logging import FIT_LOGS, FitLogBuffer, capture_fit_logs
+from tests.samples.df import df_test
+
+
+def fit_model(name):
+    with capture_fit_logs(name):
+        Prophet(uncertainty_samples=0).fit(df_test[20][["ds", "y"]].iloc[:300])
+
+
+def test_capture_fit_logs(capfd):
+    FIT_LOGS.records.clear()
+    threads = [threading.Thread(target=fit_model, args=(f"fit_{i}",)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    output = capfd.readouterr()
+    # Concurrent fits should not print anything, and their logs should be kept separately
+    assert "cmdstanpy" not in output.out + output.err
+    for name in ["fit_0", "fit_1"]:
+        logs = FIT_LOGS.get_logs(name, logging.INFO)
+        assert any("Chain [1] done processing" in line for line in logs)
+        assert all(f" - {name} - " in line for line in logs)
+    # Logs of other libraries should be left unchanged
+    logging.getLogger("other").warning("visible")
+    assert not any("visible" in line for line in FIT_LOGS.get_logs())
+
+
+def test_fit_log_buffer():
+    buffer = FitLogBuffer(maxlen=3)
+    logger = logging.getLogger("test_fit_log_buffer")
+    logger.addHandler(buffer)
+    logger.propagate = False
+    for i in range(5):
+        logger.warning("message %d", i)
+    # Only the latest records should be kept
+    messages = [line.split(" - ")[-1] for line in buffer.get_logs()]
+    assert messages == [f"message {i}" for i in range(2, 5)]
@@ -0,0 +1,83 @@
+import threading
+
+from streamlit_prophet.lib.utils.jobs import JOBS, submit_job
+from streamlit_prophet.lib.utils.scheduler import (
+    BATCH,
+    INTERACTIVE,
+    FitScheduler,
+    admit_fit,
+    get_fit_demand,
+    get_scheduler,
+    run_admitted,
+)
+
+config = {
+    "executor": {"mode": "processes", "n_workers": 4},
+    "jobs": {"n_workers": 2, "poll_interval": 0.05},
+    "scheduler": {"n_cores": 4, "memory": 0, "fit_memory": 500, "session_quota": 1},
+}
+
+
+def test_fit_scheduler_priority():
+    scheduler = FitScheduler(n_cores=4, memory=0, session_quota=2)
+    running = scheduler.request("a", 4, 0, BATCH)
+    batch = scheduler.request("b", 4, 0, BATCH)
+    interactive = scheduler.request("c", 1, 0, INTERACTIVE)
+    # Requests should wait until resources are available, single fits first
+    assert running.granted and not batch.granted and not interactive.granted
+    assert scheduler.get_queue_position(interactive) == 1
+    assert scheduler.get_queue_position(batch) == 2
+    scheduler.release(running)
+    # A request which does not fit should block the requests after it
+    assert interactive.granted and not batch.granted
+    assert scheduler.request("d", 1, 0, BATCH).granted is False
+    scheduler.release(interactive)
+    assert batch.granted and scheduler.get_usage() == (4, 0)
+
+
+def test_fit_scheduler_budget():
+    scheduler = FitScheduler(n_cores=2, memory=1000, session_quota=2)
+    large = scheduler.request("a", 8, 4000, BATCH)
+    # Requests larger than the budget should be reduced to it
+    assert large.granted and scheduler.get_usage() == (2, 1000)
+    scheduler.release(large)
+    first = scheduler.request("a", 1, 600, INTERACTIVE)
+    second = scheduler.request("b", 1, 600, INTERACTIVE)
+    # Memory budget should be enforced as well as cores
+    assert first.granted and not second.granted
+    scheduler.release(first)
+    assert second.granted
+
+
+def test_fit_scheduler_session_quota():
+    scheduler = FitScheduler(n_cores=4, memory=0, session_quota=1)
+    first = scheduler.request("a", 1, 0, INTERACTIVE)
+    second = scheduler.request("a", 1, 0, INTERACTIVE)
+    other = scheduler.request("b", 1, 0, INTERACTIVE)
+    # Sessions at their quota should not block other sessions
+    assert first.granted and not second.granted and other.granted
+    scheduler.release(first)
+    assert second.granted
+
+
+def test_get_fit_demand():
+    # Cross-validations should use all executor workers, single fits one core
+    assert get_fit_demand(config, True) == (4, 2000)
+    assert get_fit_demand(config, False) == (1, 500)
+    assert get_fit_demand({**config, "executor": {"mode": "serial", "n_workers": 4}}, True)[0] == 1
+
+
+def test_run_admitted():
+    JOBS.clear()
+    scheduler = get_scheduler(config)
+    event = threading.Event()
+    with admit_fit(config, "a", True):
+        job = submit_job("admitted", run_admitted, (config, "b", False, event.set, ()), config)
+        while "queue" not in job.get_progress()[0]:
+            pass
+        # Jobs should report their queue position while they wait
+        assert "position 1 in queue" in job.get_progress()[0]
+        assert not event.is_set()
+    job.future.result(10)
+    # Jobs should run once admitted, and release their resources when done
+    assert event.is_set() and scheduler.get_usage() == (0, 0)